@@ -0,0 +1,443 @@
+"""
+성능 측정 스크립트
+- 센서 업데이트 (Car.update_sensors) 틱당 비용
+- 차량 물리 (Car.update 루프 vs CarFleet.step) 틱당 비용
+- 집단 레이캐스팅 (Car.update_sensors 루프 vs Track.cast_rays) 틱당 비용
+- 신경망 추론 (FeedForwardNetwork.activate 루프 vs PopulationNetwork) 틱당 비용
+- 신경망 컴파일 캐시 (FeedForwardNetwork.create vs 유전체 내용 해시 캐시 적중)
+- 렌더링 (Visualizer.render, 정적 레이어 + 스프라이트 캐시) 프레임당 비용
+- 집단 렌더링 (상위 차량만 스프라이트 + 점 + 밀도 히트맵, 차량 수에 따른 비용)
+- 파일 트랙 격자 색인 (경계 선분 수에 따른 충돌 판정/레이캐스트 비용)
+- 파일 트랙 센서 방식 (레이마칭 / 격자 색인 / 거리장 스피어 트레이싱) 비용과 레이당 단계 수
+- 센서 룩업 테이블 조회 비용과 정확한 레이캐스트 대비 오차
+- 다중 에이전트 공간 해시 (근처 차량 쌍 찾기, 같은 밀도에서 차량 수에 따른 비용)
+
+사용법: python benchmark.py
+"""
+import json
+import os
+import random
+import time
+from typing import List
+
+import neat
+import numpy as np
+import pygame
+
+from config import (
+    CAR_COUNT, SENSOR_ANGLES, SENSOR_MODE, SENSOR_MAX_LENGTH,
+    NEAT_CONFIG_PATH, SCREEN_WIDTH, SCREEN_HEIGHT, RENDER_SPRITE_CARS
+)
+from track import Track
+from polyline_track import PolylineTrack, catmull_rom_loop, load_track
+from car import Car
+from fleet import CarFleet
+from spatial_hash import SpatialHash
+from inference import PopulationNetwork
+from network_cache import NetworkCache
+from visualizer import Visualizer
+
+
+def _random_cars(track: Track, count: int, seed: int = 0) -> List[Car]:
+    """트랙 위 임의의 위치/방향에 차량 배치"""
+    rng = random.Random(seed)
+    cars = []
+    while len(cars) < count:
+        x = rng.uniform(track.center_x - track.outer_a, track.center_x + track.outer_a)
+        y = rng.uniform(track.center_y - track.outer_b, track.center_y + track.outer_b)
+        if track.is_on_track(x, y):
+            cars.append(Car(x, y, rng.uniform(0, 360), car_id=len(cars)))
+    return cars
+
+
+def _random_track_cars(track, count: int, seed: int = 0) -> List[Car]:
+    """임의 형상 트랙 위 임의의 위치/방향에 차량 배치 (경계 상자에서 표본 추출)"""
+    rng = np.random.default_rng(seed)
+    x1, y1, x2, y2 = track._boundary_segments().T
+    cars = []
+    while len(cars) < count:
+        xs = rng.uniform(min(x1.min(), x2.min()), max(x1.max(), x2.max()), count)
+        ys = rng.uniform(min(y1.min(), y2.min()), max(y1.max(), y2.max()), count)
+        for x, y in zip(xs[track.is_on_track_batch(xs, ys)], ys[track.is_on_track_batch(xs, ys)]):
+            if len(cars) < count:
+                cars.append(Car(float(x), float(y), float(rng.uniform(0, 360)), car_id=len(cars)))
+    return cars
+
+
+def _time_per_tick(fn, repeat: int) -> float:
+    """fn 1회 호출(= 1틱)의 평균 소요 시간 (ms)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def bench_sensors(car_count: int = CAR_COUNT, repeat: int = 200):
+    """센서 모드별 update_sensors 틱당 비용과 오차 비교"""
+    track = Track()
+    cars = _random_cars(track, car_count)
+
+    def tick():
+        for car in cars:
+            car.update_sensors(track)
+
+    print(f"[센서] 차량 {car_count}대 x 센서 {len(SENSOR_ANGLES)}개")
+    results = {}
+    for mode in ('raymarch', 'analytic'):
+        track.sensor_mode = mode
+        results[mode] = _time_per_tick(tick, repeat)
+        print(f"  {mode:<9} {results[mode]:8.3f} ms/틱")
+    print(f"  속도 향상  x{results['raymarch'] / results['analytic']:.1f}")
+
+    # 정확도: 레이마칭은 2px 단위이므로 해석해와의 차이가 2px 미만이어야 함
+    max_error = 0.0
+    for car in _random_cars(track, 2000, seed=1):
+        for sensor_angle in SENSOR_ANGLES:
+            angle = car.angle + sensor_angle
+            track.sensor_mode = 'raymarch'
+            marched = track.get_distance_to_edge(car.x, car.y, angle)
+            track.sensor_mode = 'analytic'
+            exact = track.get_distance_to_edge(car.x, car.y, angle)
+            max_error = max(max_error, abs(marched - exact))
+    print(f"  최대 오차  {max_error:.4f} px (허용 범위 < 2px)")
+
+
+def bench_fleet(car_count: int = 1000, repeat: int = 100):
+    """차량별 Car.update 루프와 CarFleet 벡터화 업데이트 비교 (센서 제외)"""
+    track = Track()
+    cars = _random_cars(track, car_count)
+    positions = [(car.x, car.y, car.angle) for car in cars]
+    outputs = np.zeros((car_count, 2))
+    output_list = [0.0, 0.0]
+
+    def tick_objects():
+        for car in cars:
+            car.alive = True
+            car.set_outputs(output_list)
+            car.update(track)
+
+    fleet = CarFleet(positions)
+
+    def tick_fleet():
+        fleet.alive[:] = True
+        fleet.step(track, outputs)
+
+    print(f"[물리] 차량 {car_count}대")
+    per_object = _time_per_tick(tick_objects, repeat)
+    vectorized = _time_per_tick(tick_fleet, repeat)
+    print(f"  Car 루프  {per_object:8.3f} ms/틱")
+    print(f"  CarFleet  {vectorized:8.3f} ms/틱")
+    print(f"  속도 향상  x{per_object / vectorized:.1f}")
+
+
+def bench_raycast(car_count: int = 1000, repeat: int = 20):
+    """차량별 센서 업데이트와 집단 일괄 레이캐스팅 비교 (절반은 사망 차량)"""
+    track = Track()
+    cars = _random_cars(track, car_count)
+    fleet = CarFleet([(car.x, car.y, car.angle) for car in cars])
+    fleet.alive[::2] = False
+    for car in cars[::2]:
+        car.alive = False
+
+    def tick_objects():
+        for car in cars:
+            car.update_sensors(track)
+
+    def tick_fleet():
+        fleet.update_sensors(track)
+
+    print(f"[레이캐스트] 차량 {car_count}대 (생존 {fleet.alive_count}대) x 센서 {len(SENSOR_ANGLES)}개")
+    for mode in ('raymarch', 'analytic'):
+        track.sensor_mode = mode
+        per_object = _time_per_tick(tick_objects, repeat)
+        batched = _time_per_tick(tick_fleet, repeat)
+        print(f"  {mode:<9} 차량별 {per_object:8.3f} ms/틱  일괄 {batched:8.3f} ms/틱  "
+              f"(x{per_object / batched:.1f})")
+
+
+def _load_neat_config(pop_size: int) -> neat.Config:
+    config = neat.Config(
+        neat.DefaultGenome,
+        neat.DefaultReproduction,
+        neat.DefaultSpeciesSet,
+        neat.DefaultStagnation,
+        os.path.join(os.path.dirname(__file__), NEAT_CONFIG_PATH)
+    )
+    config.pop_size = pop_size
+    return config
+
+
+def bench_inference(genome_count: int = 1000, mutations: int = 20, repeat: int = 50):
+    """개별 activate 루프와 집단 일괄 추론 비교 (구조 변이를 거친 유전체)"""
+    random.seed(0)
+    config = _load_neat_config(genome_count)
+    genomes = list(neat.Population(config).population.values())
+    for genome in genomes:
+        for _ in range(random.randint(0, mutations)):
+            genome.mutate(config.genome_config)
+
+    nets = [neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes]
+    population_net = PopulationNetwork(nets)
+    inputs = np.random.default_rng(0).random((genome_count, config.genome_config.num_inputs))
+
+    def tick_loop():
+        return [net.activate(row) for net, row in zip(nets, inputs)]
+
+    def tick_batch():
+        return population_net.activate(inputs)
+
+    print(f"[추론] 신경망 {genome_count}개 (층 {len(population_net.weights)}개, 슬롯 {population_net.num_slots}개)")
+    per_net = _time_per_tick(tick_loop, repeat)
+    batched = _time_per_tick(tick_batch, repeat)
+    print(f"  activate 루프  {per_net:8.3f} ms/틱")
+    print(f"  일괄 추론      {batched:8.3f} ms/틱")
+    print(f"  속도 향상  x{per_net / batched:.1f}")
+    print(f"  최대 오차  {np.abs(np.array(tick_loop()) - tick_batch()).max():.2e}")
+
+
+def bench_network_cache(genome_count: int = 1000, mutations: int = 40, repeat: int = 5):
+    """매 세대 전체 컴파일과 캐시 적중 (바뀌지 않은 유전체) 비교"""
+    random.seed(0)
+    config = _load_neat_config(genome_count)
+    genomes = list(neat.Population(config).population.values())
+    for genome in genomes:
+        for _ in range(random.randint(0, mutations)):
+            genome.mutate(config.genome_config)
+
+    cache = NetworkCache(capacity=genome_count)
+    cache.create_all(genomes, config)
+
+    def compile_all():
+        return [neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes]
+
+    def compile_cached():
+        return cache.create_all(genomes, config)
+
+    print(f"[신경망 컴파일] 유전체 {genome_count}개 (변이 최대 {mutations}회)")
+    full = _time_per_tick(compile_all, repeat)
+    cached = _time_per_tick(compile_cached, repeat)
+    print(f"  매번 컴파일  {full:8.3f} ms/세대")
+    print(f"  캐시 적중    {cached:8.3f} ms/세대  (적중률 {cache.hit_rate:.0%})")
+    print(f"  속도 향상  x{full / cached:.1f}")
+
+
+def _offscreen_visualizer() -> Visualizer:
+    """화면 없이 렌더링 측정용 Visualizer 생성"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return Visualizer(screen)
+
+
+def bench_render(car_count: int = 500, repeat: int = 100):
+    """트랙/차량을 매 프레임 다시 그리는 경우와 정적 레이어 + 스프라이트 캐시 비교"""
+    visualizer = _offscreen_visualizer()
+    track = Track()
+    cars = _random_cars(track, car_count)
+    for car in cars[::3]:
+        car.alive = False
+
+    def frame_redraw():
+        visualizer.draw_background()
+        visualizer.draw_track(track)
+        for car in cars:
+            car.draw(visualizer.screen)
+
+    def frame_cached():
+        visualizer.render(track, cars, 1, 0)
+
+    print(f"[렌더링] 차량 {car_count}대 (탈락 {len(cars[::3])}대)")
+    redraw = _time_per_tick(frame_redraw, repeat)
+    cached = _time_per_tick(frame_cached, repeat)
+    print(f"  매 프레임 그리기     {redraw:8.3f} ms/프레임")
+    print(f"  레이어/스프라이트 캐시 {cached:8.3f} ms/프레임  "
+          f"(스프라이트 {len(visualizer.sprites)}개)")
+
+
+def bench_render_population(counts=(100, 1000, 5000), repeat: int = 50):
+    """차량 수별 렌더링 비용 (상위 RENDER_SPRITE_CARS 대만 스프라이트, 나머지는 점, 히트맵 포함)"""
+    visualizer = _offscreen_visualizer()
+    visualizer.show_heatmap = True
+    track = Track()
+    print(f"[집단 렌더링] 스프라이트 상한 {RENDER_SPRITE_CARS}대 + 밀도 히트맵")
+    for count in counts:
+        fleet = CarFleet(track.get_start_positions(count))
+        cars = _random_cars(track, count)
+        fleet.x[:] = [car.x for car in cars]
+        fleet.y[:] = [car.y for car in cars]
+        fleet.angle[:] = [car.angle for car in cars]
+        fleet.fitness[:] = np.random.default_rng(0).random(count) * 1000
+        fleet.alive[::3] = False
+
+        def frame():
+            visualizer.render(track, fleet.cars, 1, 0, 1, fleet=fleet)
+
+        elapsed = _time_per_tick(frame, repeat)
+        print(f"  차량 {count:5d}대  {elapsed:8.3f} ms/프레임")
+
+
+def bench_track_index(point_count: int = 5000, repeat: int = 20):
+    """스플라인 분할 수 (경계 선분 수) 별 격자 색인과 전체 선분 검사 비교"""
+    path = os.path.join(os.path.dirname(__file__), 'tracks', 'circuit.json')
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    outer = np.asarray(data['outer'], dtype=float)
+    inner = np.asarray(data['inner'], dtype=float)
+
+    print(f"[트랙 색인] 점 {point_count}개 충돌 판정 + 레이 {point_count}개")
+    rng = np.random.default_rng(0)
+    for samples in (4, 12, 48):
+        track = PolylineTrack(catmull_rom_loop(outer, samples), catmull_rom_loop(inner, samples))
+        grid = track.grid
+        xs = rng.uniform(grid.origin_x, grid.origin_x + grid.cols * grid.cell_size, point_count)
+        ys = rng.uniform(grid.origin_y, grid.origin_y + grid.rows * grid.cell_size, point_count)
+        angles = rng.uniform(0, 2 * np.pi, point_count)
+        dx, dy = np.cos(angles), np.sin(angles)
+
+        def tick_grid():
+            grid.inside(xs, ys)
+            grid.raycast(xs, ys, dx, dy, track.max_ray_distance)
+
+        def tick_brute():
+            # 모든 선분과 교차 검사 (점 묶음 단위)
+            x1, y1, x2, y2 = (c[None, :] for c in grid.segments.T)
+            for i in range(0, point_count, 500):
+                px = xs[i:i + 500, None]
+                py = ys[i:i + 500, None]
+                spans = (y1 <= py) != (y2 <= py)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    cross_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+                    denom = dx[i:i + 500, None] * (y2 - y1) - dy[i:i + 500, None] * (x2 - x1)
+                    t = ((x1 - px) * (y2 - y1) - (y1 - py) * (x2 - x1)) / denom
+                    u = ((x1 - px) * dy[i:i + 500, None] - (y1 - py) * dx[i:i + 500, None]) / denom
+                np.sum(spans & (cross_x > px), axis=1)
+                np.min(np.where((t >= 0) & (u >= 0) & (u <= 1), t, np.inf), axis=1)
+
+        indexed = _time_per_tick(tick_grid, repeat)
+        brute = _time_per_tick(tick_brute, max(1, repeat // 4))
+        print(f"  선분 {len(grid.segments):5d}개  격자 {indexed:8.3f} ms  전체 검사 {brute:8.3f} ms  "
+              f"(x{brute / indexed:.1f})")
+
+
+def bench_sdf_sensors(car_count: int = 1000, repeat: int = 20):
+    """파일 트랙에서 센서 방식별 집단 레이캐스팅 비교 (격자 색인 결과 기준 오차)"""
+    track = load_track(os.path.join(os.path.dirname(__file__), 'tracks', 'circuit.json'))
+    field = track.distance_field
+    rng = np.random.default_rng(0)
+    grid = track.grid
+    xs = rng.uniform(grid.origin_x, grid.origin_x + grid.cols * grid.cell_size, car_count * 4)
+    ys = rng.uniform(grid.origin_y, grid.origin_y + grid.rows * grid.cell_size, car_count * 4)
+    on_track = np.flatnonzero(track.is_on_track_batch(xs, ys))[:car_count]
+    fleet = CarFleet([(xs[i], ys[i], rng.uniform(0, 360)) for i in on_track])
+
+    def tick():
+        fleet.update_sensors(track)
+
+    print(f"[거리장 센서] 파일 트랙, 차량 {len(fleet)}대 x 센서 {len(SENSOR_ANGLES)}개 "
+          f"(거리장 {field.cols}x{field.rows}, 간격 {field.spacing:g}px)")
+    results = {}
+    for mode in ('raymarch', 'analytic', 'sdf'):
+        track.sensor_mode = mode
+        field.traced_rays = field.trace_steps = 0
+        elapsed = _time_per_tick(tick, repeat)
+        results[mode] = fleet.sensor_data.copy()
+        if mode == 'raymarch':
+            steps = track.max_ray_distance / 2
+        elif mode == 'sdf':
+            steps = field.steps_per_ray()
+        else:
+            steps = None
+        detail = f"  레이당 샘플 {steps:6.1f}회" if steps is not None else ""
+        print(f"  {mode:<9} {elapsed:8.3f} ms/틱{detail}")
+
+    for mode in ('raymarch', 'sdf'):
+        error = np.abs(results[mode] - results['analytic'])
+        print(f"  {mode:<9} 오차 평균 {error.mean():.3f}px  99% {np.percentile(error, 99):.3f}px")
+
+    # 차량별 센서 업데이트 (get_distance_to_edge 단일 레이 경로)
+    cars = [Car(xs[i], ys[i], rng.uniform(0, 360), car_id=n) for n, i in enumerate(on_track[:CAR_COUNT])]
+
+    def tick_cars():
+        for car in cars:
+            car.update_sensors(track)
+
+    for mode in ('raymarch', 'sdf'):
+        track.sensor_mode = mode
+        print(f"  Car 루프 {CAR_COUNT}대 {mode:<9} {_time_per_tick(tick_cars, repeat):8.3f} ms/틱")
+    track.sensor_mode = SENSOR_MODE
+
+
+def bench_sensor_lut(car_count: int = 1000, repeat: int = 50):
+    """타원/파일 트랙에서 정확한 센서 계산과 룩업 테이블 조회 비교"""
+    tracks = [Track(), load_track(os.path.join(os.path.dirname(__file__), 'tracks', 'circuit.json'))]
+    for track in tracks:
+        lut = track.get_sensor_lut()
+        exact_mode = 'analytic'
+        cars = _random_track_cars(track, car_count)
+        fleet = CarFleet([(car.x, car.y, car.angle) for car in cars])
+        few = cars[:CAR_COUNT]
+
+        def tick_fleet():
+            fleet.update_sensors(track)
+
+        def tick_cars():
+            for car in few:
+                car.update_sensors(track)
+
+        name = getattr(track, 'name', '') or type(track).__name__
+        print(f"[룩업 테이블] {name}: {lut.rows}x{lut.cols}x{lut.angles} ({lut.table.dtype}), "
+              f"{lut.nbytes / 1e6:.1f}MB")
+        for mode in (exact_mode, 'lut'):
+            track.sensor_mode = mode
+            print(f"  {mode:<9} 집단 {car_count}대 {_time_per_tick(tick_fleet, repeat):8.3f} ms/틱  "
+                  f"Car 루프 {len(few)}대 {_time_per_tick(tick_cars, repeat):8.3f} ms/틱")
+        track.sensor_mode = SENSOR_MODE
+
+        report = lut.validate(track, 100000)
+        print(f"  오차 최대 {report['max']:.1f}px  평균 {report['mean']:.3f}px  99% {report['p99']:.2f}px")
+
+
+def bench_spatial_hash(density: int = 200, repeat: int = 10):
+    """화면 넓이당 차량 density 대를 유지하며 차량 수를 늘릴 때 센서 범위 안 쌍 찾기 비용"""
+    radius = SENSOR_MAX_LENGTH
+    rng = np.random.default_rng(0)
+    print(f"[공간 해시] 화면 1장 ({SCREEN_WIDTH}x{SCREEN_HEIGHT}) 당 차량 {density}대, 반경 {radius}px")
+    for screens in (1, 4, 16):
+        count = density * screens
+        side = np.sqrt(screens)
+        xs = rng.uniform(0, SCREEN_WIDTH * side, count)
+        ys = rng.uniform(0, SCREEN_HEIGHT * side, count)
+
+        def tick_hash():
+            return SpatialHash(xs, ys, radius).pairs()
+
+        def tick_brute():
+            near = np.hypot(xs[:, None] - xs[None, :], ys[:, None] - ys[None, :]) <= radius
+            return np.nonzero(np.triu(near, 1))
+
+        pairs = len(tick_hash()[0])
+        hashed = _time_per_tick(tick_hash, repeat)
+        brute = _time_per_tick(tick_brute, repeat) if count <= 3200 else float('nan')
+        print(f"  {count:5d}대  쌍 {pairs:6d}개  해시 {hashed:8.3f} ms ({hashed / count * 1000:5.2f} us/대)  "
+              f"전체 비교 {brute:8.3f} ms")
+
+
+def main():
+    print("=" * 50)
+    print("  Self-Driving AI Benchmark")
+    print("=" * 50)
+    bench_sensors()
+    bench_fleet()
+    bench_raycast()
+    bench_inference()
+    bench_network_cache()
+    bench_render()
+    bench_render_population()
+    bench_track_index()
+    bench_sdf_sensors()
+    bench_sensor_lut()
+    bench_spatial_hash()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,8 @@ from config import (
     CAR_MAX_SPEED, CAR_MIN_SPEED,
     CAR_ACCELERATION, CAR_FRICTION, CAR_TURN_SPEED,
     SENSOR_COUNT, SENSOR_MAX_LENGTH, SENSOR_ANGLES,
-    COLORS
+    FITNESS_MODE, SIM_DT, SIM_SUBSTEPS, COLLISION_BODY,
+    STALL_TICKS, LOOP_SAMPLE_TICKS, LOOP_SAMPLES, LOOP_RADIUS, COLORS
 )
 
 
@@ -27,6 +28,7 @@ class Car:
         # 속도
         self.speed = 0
         self.acceleration = 0
+        self.turn_rate = 0  # 도/틱 (set_outputs 에서 설정, update 에서 적분)
         
         # 상태
         self.alive = True
@@ -39,6 +41,18 @@ class Car:
         self.checkpoints_passed = 0
         self.time_alive = 0
         
+        # 트랙 진행도 (중심선 호 길이, 첫 업데이트에서 설정)
+        self.track_progress: Optional[float] = None
+        self.progress = 0  # 누적 전진 거리 (역주행은 차감)
+        self.laps = 0
+        
+        # 정체/제자리 돌기 감지
+        self.best_progress = 0  # 지금까지 최고 진행도
+        self.best_time = 0  # 최고 진행도가 마지막으로 늘어난 time_alive
+        self.retired = False  # 진행이 없어 탈락
+        self.loop_samples: List[Tuple[float, float, float, float]] = []  # 최근 (x, y, 최고 진행도, time_alive)
+        self.loop_slot = -1  # 마지막으로 기록한 구간 (time_alive // LOOP_SAMPLE_TICKS)
+        
         # 센서 데이터
         self.sensor_data: List[float] = [0] * SENSOR_COUNT
         
@@ -56,12 +70,21 @@ class Car:
         self.angle = angle
         self.speed = 0
         self.acceleration = 0
+        self.turn_rate = 0
         self.alive = True
         self.fitness = 0
         self.distance_traveled = 0
         self.last_checkpoint = 0
         self.checkpoints_passed = 0
         self.time_alive = 0
+        self.track_progress = None
+        self.progress = 0
+        self.laps = 0
+        self.best_progress = 0
+        self.best_time = 0
+        self.retired = False
+        self.loop_samples = []
+        self.loop_slot = -1
         self.sensor_data = [0] * SENSOR_COUNT
     
     def get_inputs(self) -> List[float]:
@@ -84,29 +107,70 @@ class Car:
             turn = 0
         else:
             turn = steering * CAR_TURN_SPEED
-        self.angle += turn
+        self.turn_rate = turn
         
         # 가속 - 전진 전용 모드 (-1~1 → 0~1 변환)
         # 항상 전진, 출력값이 클수록 빠르게
         accel = (outputs[1] + 1) / 2  # -1~1 → 0~1
         self.acceleration = accel * CAR_ACCELERATION
     
-    def update(self, track) -> bool:
+    def update(self, track, dt: int = SIM_DT, substeps: int = SIM_SUBSTEPS) -> bool:
         """
-        차량 상태 업데이트
+        차량 상태를 dt 틱만큼 업데이트 (substeps 번으로 나눠 적분)
         Returns: 생존 여부
         """
-        if not self.alive:
-            return False
+        h = dt / substeps
+        for _ in range(substeps):
+            if not self.alive:
+                return False
+            self._substep(track, h)
+        if self.alive:
+            self._retire_if_stalled()
+        return self.alive
+    
+    def _retire_if_stalled(self):
+        """
+        진행 없는 차량 탈락 (제어 스텝마다)
+        - STALL_TICKS 동안 최고 진행도가 늘지 않음
+        - 기록해 둔 위치로 돌아왔는데 그 사이 최고 진행도가 그대로 (제자리 돌기)
+        """
+        if self.progress > self.best_progress:
+            self.best_progress = self.progress
+            self.best_time = self.time_alive
+        
+        stalled = bool(STALL_TICKS) and self.time_alive - self.best_time >= STALL_TICKS
+        
+        if LOOP_SAMPLE_TICKS:
+            for x, y, best, time in self.loop_samples:
+                if (math.hypot(x - self.x, y - self.y) < LOOP_RADIUS
+                        and self.time_alive - time >= LOOP_SAMPLE_TICKS
+                        and best >= self.best_progress):
+                    stalled = True
+            
+            # LOOP_SAMPLE_TICKS 구간이 바뀔 때마다 현재 위치 기록
+            slot = int(self.time_alive // LOOP_SAMPLE_TICKS)
+            if slot > self.loop_slot:
+                self.loop_samples.append((self.x, self.y, self.best_progress, self.time_alive))
+                self.loop_samples = self.loop_samples[-LOOP_SAMPLES:]
+                self.loop_slot = slot
+        
+        if stalled:
+            self.alive = False
+            self.retired = True
+    
+    def _substep(self, track, h: float):
+        """부분 스텝 1회 (h 틱)"""
+        # 조향
+        self.angle += self.turn_rate * h
         
         # 마찰력 적용
         if self.speed > 0:
-            self.speed -= CAR_FRICTION
+            self.speed -= CAR_FRICTION * h
         elif self.speed < 0:
-            self.speed += CAR_FRICTION
+            self.speed += CAR_FRICTION * h
         
         # 가속도 적용
-        self.speed += self.acceleration
+        self.speed += self.acceleration * h
         
         # 속도 제한
         self.speed = max(CAR_MIN_SPEED, min(CAR_MAX_SPEED, self.speed))
@@ -114,31 +178,40 @@ class Car:
         # 위치 업데이트
         rad = math.radians(self.angle)
         old_x, old_y = self.x, self.y
+        if self.track_progress is None:
+            self.track_progress = float(track.progress_at(old_x, old_y))
         
-        self.x += math.cos(rad) * self.speed
-        self.y -= math.sin(rad) * self.speed  # pygame 좌표계
+        self.x += math.cos(rad) * self.speed * h
+        self.y -= math.sin(rad) * self.speed * h  # pygame 좌표계
         
         # 이동 거리 업데이트
         self.distance_traveled += math.sqrt((self.x - old_x)**2 + (self.y - old_y)**2)
         
-        # 충돌 감지
-        if not track.is_on_track(self.x, self.y):
+        # 충돌 감지 (이동 선분 전체 - 빠른 차량이 경계를 건너뛰지 않도록)
+        if not track.is_motion_on_track(old_x, old_y, self.x, self.y):
+            self.alive = False
+            return
+        if COLLISION_BODY == 'hull' and not track.is_hull_on_track(self.x, self.y, self.angle):
             self.alive = False
-            return False
+            return
         
-        # 체크포인트 확인
-        new_checkpoint = track.get_checkpoint_index(self.x, self.y, self.last_checkpoint)
+        # 체크포인트 확인 (근접 또는 선분 통과)
+        new_checkpoint = track.get_checkpoint_index(self.x, self.y, self.last_checkpoint, old_x, old_y)
         if new_checkpoint != self.last_checkpoint:
             self.last_checkpoint = new_checkpoint
             self.checkpoints_passed += 1
         
+        # 트랙 진행도 누적 (시작선을 지나면 감아서 계산)
+        progress = float(track.progress_at(self.x, self.y))
+        self.progress += float(track.progress_map.delta(self.track_progress, progress))
+        self.track_progress = progress
+        self.laps = max(0, int(self.progress // track.track_length))
+        
         # 시간 업데이트
-        self.time_alive += 1
+        self.time_alive += h
         
         # 적합도 계산
         self._calculate_fitness()
-        
-        return True
     
     def update_sensors(self, track):
         """센서 데이터 업데이트"""
@@ -155,8 +228,12 @@ class Car:
     
     def _calculate_fitness(self):
         """적합도 계산"""
-        # 체크포인트 통과 보상 + 이동 거리 보상
-        self.fitness = (self.checkpoints_passed * 1000) + self.distance_traveled
+        if FITNESS_MODE == 'progress':
+            # 트랙을 따라 실제로 전진한 거리 (제자리 회전/지그재그는 보상 없음)
+            self.fitness = self.progress
+        else:
+            # 체크포인트 통과 보상 + 이동 거리 보상
+            self.fitness = (self.checkpoints_passed * 1000) + self.distance_traveled
     
     def get_corners(self) -> List[Tuple[float, float]]:
         """차량의 4개 모서리 좌표 반환 (회전 적용)"""
@@ -176,11 +253,11 @@ class Car:
             (-hw, hh),   # 좌하
         ]
         
-        # 회전 적용
+        # 회전 적용 (진행 방향과 같은 반시계 방향, pygame 좌표계)
         corners = []
         for lx, ly in corners_local:
-            rx = lx * cos_a - ly * sin_a
-            ry = lx * sin_a + ly * cos_a
+            rx = lx * cos_a + ly * sin_a
+            ry = -lx * sin_a + ly * cos_a
             corners.append((self.x + rx, self.y + ry))
         
         return corners
@@ -0,0 +1,166 @@
+"""
+학습 체크포인트 모듈
+- CHECKPOINT_INTERVAL 세대마다 진화 상태 스냅샷
+  (세대 번호, 집단/종, 유전체/노드/혁신 번호, 최고 유전체 기록, 점수 기록, 난수 상태, 시뮬레이션 상태)
+- 스냅샷은 세대가 끝난 시점에 학습 스레드에서 pickle 바이트로 만들고 (일관된 상태),
+  압축과 디스크 쓰기는 백그라운드 스레드에서 처리 (학습 루프는 디스크를 기다리지 않음)
+- 임시 파일에 쓴 뒤 os.replace 로 교체 (쓰는 도중 종료돼도 이전 체크포인트 유지)
+"""
+import gzip
+import os
+import pickle
+import random
+import threading
+from itertools import count
+from typing import Optional
+
+import neat
+from neat.reporting import BaseReporter
+
+from config import CHECKPOINT_INTERVAL
+
+# 파일 형식 버전 (상태 구성이 바뀌면 올림)
+_FORMAT_VERSION = 2
+
+
+def _next_value(counter) -> Optional[int]:
+    """itertools.count 의 다음 값 (값을 소비하므로 호출자가 같은 값부터 다시 시작하는 count 로 교체)"""
+    return next(counter) if counter is not None else None
+
+
+class CheckpointWriter:
+    """
+    백그라운드 체크포인트 기록 스레드
+    쓰기가 밀리면 아직 쓰지 않은 이전 스냅샷은 버리고 최신 것만 기록
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending: Optional[tuple] = None  # (경로, pickle 바이트)
+        self._closed = False
+        self.written = 0
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name='checkpoint-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, data: bytes):
+        with self._condition:
+            self._pending = (path, data)
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                path, data = self._pending
+                self._pending = None
+            try:
+                self._write(path, data)
+                self.written += 1
+            except OSError as e:
+                self.error = e
+                print(f"체크포인트 저장 실패: {e}")
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        """임시 파일에 압축 기록 후 원자적으로 교체"""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=5))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        """남은 스냅샷을 모두 기록하고 스레드 종료"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+
+class CheckpointReporter(BaseReporter):
+    """세대가 끝날 때마다 (interval 세대마다) 체크포인트를 남기는 NEAT 리포터"""
+
+    def __init__(self, population: neat.Population, simulation, path: str,
+                 interval: int = CHECKPOINT_INTERVAL, writer: Optional[CheckpointWriter] = None):
+        self.population = population
+        self.simulation = simulation
+        self.path = path
+        self.interval = interval
+        self.writer = writer if writer is not None else CheckpointWriter()
+
+    def end_generation(self, config, population, species_set):
+        # 이 시점의 population/species_set 은 다음에 평가할 세대
+        next_generation = self.population.generation + 1
+        if self.interval > 0 and next_generation % self.interval == 0:
+            self.writer.submit(self.path, self.snapshot(next_generation))
+
+    def snapshot(self, generation: int) -> bytes:
+        """현재 진화 상태를 pickle 바이트로 (학습 스레드에서 호출)"""
+        population = self.population
+        reproduction = population.reproduction
+        genome_config = population.config.genome_config
+
+        genome_next = _next_value(reproduction.genome_indexer)
+        reproduction.genome_indexer = count(genome_next)
+        node_next = _next_value(genome_config.node_indexer)
+        if node_next is not None:
+            genome_config.node_indexer = count(node_next)
+
+        state = {
+            'version': _FORMAT_VERSION,
+            'generation': generation,
+            'population': population.population,
+            'species': population.species,
+            'genome_next': genome_next,
+            'node_next': node_next,
+            # 현재 집단의 부모 정보만 (전체 기록은 세대마다 늘어남)
+            'ancestors': {key: reproduction.ancestors[key] for key in population.population
+                          if key in reproduction.ancestors},
+            'innovation_tracker': reproduction.innovation_tracker,
+            'best_genome': population.best_genome,
+            'random': random.getstate(),
+            'simulation': self.simulation.checkpoint_state(),
+        }
+
+        # 종 집합이 참조하는 리포터 (창/트랙 등) 는 저장하지 않음
+        species = population.species
+        reporters = species.reporters
+        species.reporters = None
+        try:
+            return pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            species.reporters = reporters
+
+    def close(self):
+        self.writer.close()
+
+
+def load_checkpoint(path: str, config: neat.Config, simulation) -> neat.Population:
+    """체크포인트에서 NEAT 집단과 시뮬레이션 상태 복원"""
+    with open(path, 'rb') as f:
+        state = pickle.loads(gzip.decompress(f.read()))
+    if state.get('version') != _FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 체크포인트 형식입니다: {path} (버전 {state.get('version')})")
+
+    population = neat.Population(config, (state['population'], state['species'], state['generation']))
+
+    reproduction = population.reproduction
+    reproduction.genome_indexer = count(state['genome_next'])
+    reproduction.ancestors = state['ancestors']
+    reproduction.innovation_tracker = state['innovation_tracker']
+    config.genome_config.innovation_tracker = state['innovation_tracker']
+    if state['node_next'] is not None:
+        config.genome_config.node_indexer = count(state['node_next'])
+    population.best_genome = state['best_genome']
+
+    random.setstate(state['random'])
+    simulation.restore_checkpoint_state(state['simulation'])
+    return population
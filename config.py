@@ -14,6 +14,10 @@ TRACK_CENTER_Y = 450
 TRACK_WIDTH = 120  # 도로 폭
 TRACK_OUTER_A = 400  # 타원 장축 (가로)
 TRACK_OUTER_B = 320  # 타원 단축 (세로)
+TRACK_GRID_CELL = 40  # 파일 트랙 선분 색인 격자 크기 (px)
+TRACK_SDF_SPACING = 4  # 부호 거리장 격자 간격 (px, 작을수록 정확하지만 메모리/계산 증가)
+PROGRESS_GRID_CELL = 8  # 진행도 조회 격자 크기 (px)
+TRACK_CACHE_DIR = '.track_cache'  # 거리장 디스크 캐시 폴더 (None 이면 캐시 안 함)
 
 # === 차량 설정 ===
 CAR_COUNT = 20
@@ -24,17 +28,64 @@ CAR_MIN_SPEED = 2  # 최소 속도 유지 (항상 전진)
 CAR_ACCELERATION = 0.3
 CAR_FRICTION = 0.05
 CAR_TURN_SPEED = 3  # 회전 속도 (도/프레임)
+COLLISION_BODY = 'point'  # 충돌 판정 ('point' 차량 중심 / 'hull' 회전된 차체 사각형 네 모서리)
+
+# === 시뮬레이션 설정 ===
+SIM_DT = 1  # 제어 스텝당 진행 틱 수 (센서/신경망은 스텝마다 1회, 클수록 빠르고 거친 시뮬레이션)
+SIM_SUBSTEPS = 1  # 제어 스텝당 물리 부분 스텝 수 (충돌/체크포인트는 부분 스텝마다 이동 선분으로 판정)
+
+# === 렌더링 설정 ===
+SPRITE_ANGLE_STEP = 3  # 차량 스프라이트 회전 각도 양자화 단위 (도)
+SPRITE_CACHE_SIZE = 512  # 캐시할 최대 스프라이트 수 (상태 x 각도)
+RENDER_SPRITE_CARS = 50  # 스프라이트로 그리는 최대 차량 수 (더 많으면 적합도 상위만, 나머지는 점)
+RENDER_DOT_SIZE = 3  # 점으로 그리는 차량 크기 (px)
+HEATMAP_CELL = 8  # 밀도 히트맵 격자 크기 (px)
+HEATMAP_DECAY = 0.99  # 프레임마다 히트맵 누적값 감쇠율
 
 # === 센서 설정 ===
 SENSOR_COUNT = 5
 SENSOR_MAX_LENGTH = 200
 SENSOR_ANGLES = [-90, -45, 0, 45, 90]  # 도 단위
+SENSOR_MODE = 'analytic'  # 'analytic' (해석적/선분 색인 교차) | 'sdf' (거리장 스피어 트레이싱) | 'lut' (센서 룩업 테이블) | 'raymarch' (2px 단위 레이마칭)
+SENSOR_LUT_SPACING = 4  # 센서 룩업 테이블 위치 격자 간격 (px)
+SENSOR_LUT_ANGLES = 120  # 센서 룩업 테이블 방향 격자 수 (360도 분할, 120 = 3도)
+SENSOR_LUT_DTYPE = 'uint8'  # 거리 양자화 ('uint8' = 0.8px 단위 | 'uint16' = 메모리 2배, 양자화 오차 무시 가능)
+SENSOR_WALL_DISTANCE = False  # 가장 가까운 벽까지의 거리를 신경망 입력으로 추가 (거리장 샘플 1회)
+SENSOR_INPUTS = SENSOR_COUNT + (1 if SENSOR_WALL_DISTANCE else 0)  # 신경망 입력 수
+
+# === 다중 에이전트 설정 ===
+MULTI_AGENT = False  # 차량끼리 충돌 + 센서가 다른 차량도 감지 (병렬 평가 비활성화)
+MULTI_AGENT_GRACE_TICKS = 60  # 출발 후 차량 간 충돌을 무시하는 틱 수 (출발 위치가 서로 겹침)
 
 # === 진화 설정 ===
-GENERATION_TIME = 30  # 초
+GENERATION_TIME = 30  # 초 (시뮬레이션 시간)
+GENERATION_TICKS = GENERATION_TIME * FPS  # 세대당 시뮬레이션 틱 수 (벽시계 시간과 무관)
+FITNESS_MODE = 'progress'  # 'progress' (중심선 호 길이 기준 전진 거리, px) | 'checkpoint' (체크포인트 x 1000 + 이동 거리)
+TERMINATION_LAP_CAP = 0  # 최고 차량이 이 바퀴 수를 돌면 세대 종료 (0 이면 사용 안 함, 직렬 평가만)
+TERMINATION_PLATEAU_TICKS = 0  # 최고 적합도가 이 틱 동안 늘지 않으면 세대 종료 (0 이면 사용 안 함, 직렬 평가만)
+TERMINATION_ADAPTIVE = False  # 최근 세대 최고 차량 생존 틱에 맞춰 틱 예산 조정
+TERMINATION_MARGIN = 2.0  # 적응형 예산 = 최근 최고 차량 생존 틱 x 이 값
+TERMINATION_MIN_TICKS = 600  # 적응형 예산 최솟값
+TERMINATION_HISTORY = 5  # 적응형 예산에 반영할 최근 세대 수
+STALL_TICKS = 240  # 최고 진행도가 이 틱 동안 늘지 않으면 탈락 (0 이면 사용 안 함)
+LOOP_SAMPLE_TICKS = 30  # 제자리 돌기 감지용 위치 기록 간격 (틱, 0 이면 사용 안 함)
+LOOP_SAMPLES = 8  # 차량별로 보관하는 최근 위치 수 (LOOP_SAMPLE_TICKS x LOOP_SAMPLES 틱 동안)
+LOOP_RADIUS = 20  # 기록한 위치에 이 거리 안으로 다시 오고 그동안 최고 진행도가 늘지 않았으면 탈락 (px)
+NETWORK_CACHE_SIZE = 256  # 컴파일된 신경망 캐시 크기 (유전체 내용 기준 LRU, 0 이면 사용 안 함)
+FITNESS_MEMO = False  # 바뀌지 않은 유전체가 같은 출발 위치면 이전 적합도 재사용 (헤드리스/병렬 평가, 켜면 바퀴 수 상한/정체 종료는 꺼짐)
+FITNESS_MEMO_SIZE = 1024  # 적합도 메모에 보관할 최대 기록 수
 CHECKPOINT_REWARD = 100
 DISTANCE_REWARD = 1
 
+# === 통계 설정 ===
+STATS_HISTORY_POINTS = 100  # 점수 그래프/요약 레벨당 칸 수 (전체 기록을 이 점 수 이하로 표시)
+STATS_DECIMATION = 2  # 요약 레벨 간 배율 (레벨 k 의 한 칸 = 세대 2**k 개)
+STATS_LEVELS = 16  # 요약 레벨 수 (STATS_HISTORY_POINTS x 2**15 세대까지 전체 기록 표시)
+STATS_RECENT_GENOMES = 10  # 메모리에 보관할 최근 세대 최고 유전체 수
+STATS_LOG_PATH = 'logs/stats.jsonl'  # 세대별 상세 통계 파일 (JSON Lines, None 이면 기록 안 함)
+METRICS_PATH = 'logs/metrics.csv'  # 세대별 지표 파일 (CSV, 세대당 1행, None 이면 기록 안 함)
+METRICS_FLUSH_ROWS = 10  # 지표를 이 행 수만큼 모아서 백그라운드 스레드로 기록
+
 # === 배속 옵션 ===
 SPEED_OPTIONS = [1, 5, 10]
 
@@ -116,3 +167,5 @@ FONT_CAPTION = 12
 
 # === 파일 경로 ===
 NEAT_CONFIG_PATH = 'neat_config.txt'
+CHECKPOINT_PATH = 'checkpoints/drive_ai.ckpt'  # 학습 체크포인트 파일 (--resume 으로 이어서 학습)
+CHECKPOINT_INTERVAL = 1  # 체크포인트 저장 간격 (세대, 0 이면 저장 안 함)
@@ -0,0 +1,103 @@
+"""
+적합도 메모 모듈
+- 시뮬레이션은 결정론적이므로 같은 신경망이 같은 출발 위치에서 달리면 결과도 같음
+- (유전체 내용, 출발 위치) → (적합도, 종료 시 생존 여부, 생존 틱, 기록 당시 틱 예산) LRU
+- 트랙 형상과 물리/센서/적합도 설정의 해시를 함께 보관해, 설정이 바뀌면 기록을 버림
+차량 적합도가 다른 차량과 무관할 때만 정확 (다중 에이전트는 사용 불가, 바퀴 수 상한/정체 종료는 메모를 쓰면 꺼짐)
+"""
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import neat
+import numpy as np
+
+import config
+from config import FITNESS_MEMO_SIZE, SIM_DT, MULTI_AGENT
+from network_cache import genome_key
+
+# 차량 궤적과 적합도에 영향을 주는 설정 (바뀌면 기록 무효)
+_SIGNATURE_SETTINGS = (
+    'CAR_WIDTH', 'CAR_HEIGHT', 'CAR_MAX_SPEED', 'CAR_MIN_SPEED', 'CAR_ACCELERATION',
+    'CAR_FRICTION', 'CAR_TURN_SPEED', 'COLLISION_BODY', 'SIM_DT', 'SIM_SUBSTEPS',
+    'SENSOR_MAX_LENGTH', 'SENSOR_ANGLES', 'SENSOR_MODE', 'SENSOR_LUT_SPACING',
+    'SENSOR_LUT_ANGLES', 'SENSOR_LUT_DTYPE', 'SENSOR_WALL_DISTANCE', 'TRACK_SDF_SPACING',
+    'PROGRESS_GRID_CELL', 'GENERATION_TICKS', 'FITNESS_MODE', 'CHECKPOINT_REWARD',
+    'DISTANCE_REWARD', 'STALL_TICKS', 'LOOP_SAMPLE_TICKS', 'LOOP_SAMPLES', 'LOOP_RADIUS',
+)
+
+# 기록 1개: (적합도, 종료 시 생존 여부, 생존 틱, 기록 당시 틱 예산)
+MemoEntry = Tuple[float, bool, float, int]
+
+
+def context_signature(track) -> str:
+    """트랙 형상 (경계/체크포인트/중심선) + 설정값 해시"""
+    digest = hashlib.sha1()
+    for array in (track._boundary_segments(), track.checkpoint_lines, track.centerline):
+        digest.update(np.ascontiguousarray(array, dtype=np.float64).tobytes())
+    digest.update(repr([(name, getattr(config, name)) for name in _SIGNATURE_SETTINGS]).encode())
+    return digest.hexdigest()[:16]
+
+
+def memo_conflict() -> Optional[str]:
+    """적합도 메모를 쓸 수 없는 설정이면 이유, 아니면 None"""
+    if MULTI_AGENT:
+        return "다중 에이전트 모드에서는 차량끼리 영향을 줍니다"
+    return None
+
+
+def end_tick(time_alive: float) -> int:
+    """탈락한 차량이 멈춘 스텝의 틱 (그 스텝까지는 시뮬레이션해야 같은 결과)"""
+    return int(math.floor(time_alive / SIM_DT + 1e-9) * SIM_DT + SIM_DT)
+
+
+class FitnessMemo:
+    """바뀌지 않은 유전체의 세대 결과 LRU (capacity 0 이면 기록 안 함)"""
+
+    def __init__(self, track, capacity: int = FITNESS_MEMO_SIZE):
+        self.signature = context_signature(track)
+        self.capacity = capacity
+        self._entries: 'OrderedDict[tuple, MemoEntry]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def lookup(self, genome: neat.DefaultGenome, start: Tuple[float, float, float],
+               tick_budget: int) -> Optional[MemoEntry]:
+        """
+        이번 세대 틱 예산에서도 그대로 쓸 수 있는 기록
+        - 탈락한 차량: 탈락 스텝까지가 예산 안이면 사용
+        - 끝까지 산 차량: 예산이 같을 때만 사용 (예산이 다르면 적합도와 환산값이 달라짐)
+        """
+        key = (genome_key(genome), tuple(start))
+        entry = self._entries.get(key)
+        if entry is not None:
+            fitness, alive, time_alive, budget = entry
+            if (budget == tick_budget) if alive else (end_tick(time_alive) <= tick_budget):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, genome: neat.DefaultGenome, start: Tuple[float, float, float],
+              fitness: float, alive: bool, time_alive: float, tick_budget: int):
+        """세대 결과 기록 (적합도는 환산 전 값)"""
+        if self.capacity <= 0:
+            return
+        key = (genome_key(genome), tuple(start))
+        self._entries[key] = (float(fitness), bool(alive), float(time_alive), int(tick_budget))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
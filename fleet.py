@@ -0,0 +1,409 @@
+"""
+차량 집단 모듈 (구조체 배열)
+- 모든 차량의 상태를 NumPy 배열로 보관
+- 물리/조작을 집단 전체에 대해 한 번에 계산
+- Car 호환 뷰 (FleetCar) 제공
+"""
+import numpy as np
+from typing import List, Tuple
+
+from config import (
+    CAR_WIDTH, CAR_HEIGHT, CAR_MAX_SPEED, CAR_MIN_SPEED,
+    CAR_ACCELERATION, CAR_FRICTION, CAR_TURN_SPEED,
+    SENSOR_COUNT, SENSOR_MAX_LENGTH, SENSOR_WALL_DISTANCE,
+    SENSOR_ANGLES, FITNESS_MODE, SIM_DT, SIM_SUBSTEPS, COLLISION_BODY,
+    MULTI_AGENT, MULTI_AGENT_GRACE_TICKS,
+    STALL_TICKS, LOOP_SAMPLE_TICKS, LOOP_SAMPLES, LOOP_RADIUS
+)
+from car import Car
+from spatial_hash import SpatialHash
+
+# 차체 반폭/반높이와 외접원 반지름 (Car.get_corners 와 같은 사각형)
+_HALF_W = CAR_WIDTH / 2
+_HALF_H = CAR_HEIGHT / 2
+_CAR_RADIUS = float(np.hypot(_HALF_W, _HALF_H))
+
+
+def _boxes_overlap(xa, ya, aa, xb, yb, ab) -> np.ndarray:
+    """회전된 차체 사각형 쌍의 겹침 여부 (분리축 정리, 두 차체의 축 4개)"""
+    ra = np.radians(aa)
+    rb = np.radians(ab)
+    # 차체 진행 방향 축 (cos, -sin) 과 옆 방향 축 (sin, cos), pygame 좌표계
+    axes_a = ((np.cos(ra), -np.sin(ra)), (np.sin(ra), np.cos(ra)))
+    axes_b = ((np.cos(rb), -np.sin(rb)), (np.sin(rb), np.cos(rb)))
+    dx = xb - xa
+    dy = yb - ya
+
+    overlap = np.ones(np.shape(dx), dtype=bool)
+    for ux, uy in axes_a + axes_b:
+        extent_a = _HALF_W * np.abs(axes_a[0][0] * ux + axes_a[0][1] * uy) + \
+                   _HALF_H * np.abs(axes_a[1][0] * ux + axes_a[1][1] * uy)
+        extent_b = _HALF_W * np.abs(axes_b[0][0] * ux + axes_b[0][1] * uy) + \
+                   _HALF_H * np.abs(axes_b[1][0] * ux + axes_b[1][1] * uy)
+        overlap &= np.abs(dx * ux + dy * uy) <= extent_a + extent_b
+    return overlap
+
+
+def _ray_box_distances(xs, ys, angles, bx, by, bangle) -> np.ndarray:
+    """
+    레이 (xs, ys, angles: 쌍 x 센서) 가 차체 사각형 (쌍마다 1개) 에 처음 닿는 거리
+    닿지 않거나 시작점이 사각형 안이면 inf (슬랩 방식)
+    """
+    rad = np.radians(angles)
+    dx = np.cos(rad)
+    dy = -np.sin(rad)
+
+    # 상대 차량의 차체 좌표계로 변환 (Car.get_corners 회전의 역변환)
+    rb = np.radians(bangle)[:, None]
+    cos_b = np.cos(rb)
+    sin_b = np.sin(rb)
+    rx = (xs - bx)[:, None]
+    ry = (ys - by)[:, None]
+    ox = rx * cos_b - ry * sin_b
+    oy = rx * sin_b + ry * cos_b
+    lx = dx * cos_b - dy * sin_b
+    ly = dx * sin_b + dy * cos_b
+
+    # 축과 나란한 레이는 아주 작은 기울기로 대신 (슬랩 밖이면 빈 구간, 안이면 전 구간이 됨)
+    lx = np.where(lx == 0, 1e-12, lx)
+    ly = np.where(ly == 0, 1e-12, ly)
+    tx1 = (-_HALF_W - ox) / lx
+    tx2 = (_HALF_W - ox) / lx
+    ty1 = (-_HALF_H - oy) / ly
+    ty2 = (_HALF_H - oy) / ly
+
+    enter = np.maximum(np.minimum(tx1, tx2), np.minimum(ty1, ty2))
+    leave = np.minimum(np.maximum(tx1, tx2), np.maximum(ty1, ty2))
+    return np.where((enter <= leave) & (enter >= 0), enter, np.inf)
+
+
+class CarFleet:
+    """
+    차량 집단
+    Car.set_outputs / Car.update 와 같은 규칙을 배열 연산으로 적용
+    """
+
+    def __init__(self, start_positions: List[Tuple[float, float, float]]):
+        count = len(start_positions)
+        positions = np.array(start_positions, dtype=float).reshape(count, 3)
+
+        # 위치 및 방향
+        self.x = positions[:, 0].copy()
+        self.y = positions[:, 1].copy()
+        self.angle = positions[:, 2].copy()  # 도 단위
+
+        # 속도
+        self.speed = np.zeros(count)
+        self.acceleration = np.zeros(count)
+        self.turn_rate = np.zeros(count)  # 도/틱 (set_outputs 에서 설정, update 에서 적분)
+
+        # 상태
+        self.alive = np.ones(count, dtype=bool)
+
+        # 점수
+        self.fitness = np.zeros(count)
+        self.distance_traveled = np.zeros(count)
+        self.last_checkpoint = np.zeros(count, dtype=int)
+        self.checkpoints_passed = np.zeros(count, dtype=int)
+        self.time_alive = np.zeros(count)  # 틱 (부분 스텝이면 소수)
+        self.elapsed = 0.0  # 출발 후 진행한 틱 (다중 에이전트 충돌 유예 판정용)
+        self.solid = np.zeros(count, dtype=bool)  # 다른 차량과 떨어진 적이 있어 충돌 대상인지
+
+        # 트랙 진행도 (중심선 호 길이, 첫 업데이트에서 설정)
+        self.track_progress = np.full(count, np.nan)
+        self.progress = np.zeros(count)  # 누적 전진 거리 (역주행은 차감)
+        self.laps = np.zeros(count, dtype=int)
+
+        # 정체/제자리 돌기 감지 (Car._retire_if_stalled 와 동일)
+        self.best_progress = np.zeros(count)
+        self.best_time = np.zeros(count)  # 최고 진행도가 마지막으로 늘어난 time_alive
+        self.retired = np.zeros(count, dtype=bool)
+        self.loop_x = np.full((count, LOOP_SAMPLES), np.nan)  # 최근 기록 위치 (순환 버퍼)
+        self.loop_y = np.full((count, LOOP_SAMPLES), np.nan)
+        self.loop_best = np.zeros((count, LOOP_SAMPLES))  # 기록 시점의 최고 진행도
+        self.loop_time = np.zeros((count, LOOP_SAMPLES))  # 기록 시점의 time_alive
+        self.loop_slot = np.full(count, -1)  # 마지막으로 기록한 구간 (time_alive // LOOP_SAMPLE_TICKS)
+        self.loop_count = np.zeros(count, dtype=int)  # 기록 횟수 (순환 버퍼 위치)
+
+        # 센서 데이터
+        self.sensor_data = np.zeros((count, SENSOR_COUNT))
+        self.wall_distance = np.zeros(count)  # 가장 가까운 벽까지 거리 (SENSOR_WALL_DISTANCE)
+
+        # 기존 Car API 호환 뷰 (시각화/UI용)
+        self.cars: List[Car] = [FleetCar(self, i) for i in range(count)]
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def alive_count(self) -> int:
+        return int(np.count_nonzero(self.alive))
+
+    def get_inputs(self) -> np.ndarray:
+        """신경망 입력값 반환 (정규화된 센서 데이터 [+ 벽 거리], 차량 x SENSOR_INPUTS)"""
+        inputs = self.sensor_data / SENSOR_MAX_LENGTH
+        if SENSOR_WALL_DISTANCE:
+            inputs = np.column_stack([inputs, self.wall_distance / SENSOR_MAX_LENGTH])
+        return inputs
+
+    def update_sensors(self, track):
+        """살아있는 차량의 센서 데이터 업데이트 (전체 레이를 한 번에 계산)"""
+        distances = track.cast_rays(self.x, self.y, self.angle, mask=self.alive)
+        np.copyto(self.sensor_data, distances, where=self.alive[:, None])
+
+        if SENSOR_WALL_DISTANCE:
+            alive = self.alive
+            self.wall_distance[alive] = track.wall_distances(self.x[alive], self.y[alive])
+
+        if MULTI_AGENT:
+            self._sense_cars()
+
+    def _sense_cars(self):
+        """센서 거리를 센서 범위 안 다른 차량 차체까지의 거리로 줄임 (공간 해시로 근처 쌍만 검사)"""
+        idx = np.flatnonzero(self.alive)
+        if len(idx) < 2:
+            return
+        grid = SpatialHash(self.x[idx], self.y[idx], SENSOR_MAX_LENGTH + _CAR_RADIUS)
+        i, j = grid.pairs()
+        if len(i) == 0:
+            return
+
+        # 쌍마다 양방향 (i 가 j 를 보고, j 가 i 를 봄)
+        viewer = idx[np.concatenate([i, j])]
+        target = idx[np.concatenate([j, i])]
+
+        # 레이가 닿을 수 없는 쌍 제외: 가장 긴 센서 값 (벽까지) 보다 멀거나 차량 뒤쪽
+        dx = self.x[target] - self.x[viewer]
+        dy = self.y[target] - self.y[viewer]
+        rad = np.radians(self.angle[viewer])
+        reach = self.sensor_data[viewer].max(axis=1) + _CAR_RADIUS
+        ahead = dx * np.cos(rad) - dy * np.sin(rad) >= -_CAR_RADIUS
+        visible = ahead & (dx * dx + dy * dy <= reach * reach)
+        viewer = viewer[visible]
+        target = target[visible]
+
+        angles = self.angle[viewer][:, None] + np.asarray(SENSOR_ANGLES, dtype=float)[None, :]
+        hits = _ray_box_distances(self.x[viewer], self.y[viewer], angles,
+                                  self.x[target], self.y[target], self.angle[target])
+
+        rows = np.repeat(viewer, len(SENSOR_ANGLES))
+        cols = np.tile(np.arange(len(SENSOR_ANGLES)), len(viewer))
+        np.minimum.at(self.sensor_data, (rows, cols), hits.ravel())
+
+    def _collide_cars(self, idx: np.ndarray) -> np.ndarray:
+        """
+        idx 차량 중 다른 차량과 차체가 겹친 차량 여부 (공간 해시로 근처 쌍만 검사)
+        출발 위치부터 겹쳐 있던 차량은 한 번 떨어질 때까지 (solid 전까지) 통과
+        """
+        crashed = np.zeros(len(idx), dtype=bool)
+        if len(idx) < 2:
+            self.solid[idx] = True
+            return crashed
+        grid = SpatialHash(self.x[idx], self.y[idx], 2 * _CAR_RADIUS)
+        i, j = grid.pairs()
+        hit = _boxes_overlap(self.x[idx[i]], self.y[idx[i]], self.angle[idx[i]],
+                             self.x[idx[j]], self.y[idx[j]], self.angle[idx[j]])
+        both = hit & self.solid[idx[i]] & self.solid[idx[j]]
+        crashed[i[both]] = True
+        crashed[j[both]] = True
+
+        overlapping = np.zeros(len(idx), dtype=bool)
+        overlapping[i[hit]] = True
+        overlapping[j[hit]] = True
+        self.solid[idx[~overlapping]] = True
+        return crashed
+
+    def set_outputs(self, outputs: np.ndarray):
+        """
+        신경망 출력값 적용 (차량 x 2)
+        outputs[:, 0]: 조향, outputs[:, 1]: 가속
+        """
+        alive = self.alive
+        steering = outputs[alive, 0]
+
+        # 조향 - 데드존 적용 (|값| < 0.1 이면 무시)
+        self.turn_rate[alive] = np.where(np.abs(steering) < 0.1, 0.0, steering * CAR_TURN_SPEED)
+
+        # 가속 - 전진 전용 모드 (-1~1 → 0~1 변환)
+        self.acceleration[alive] = (outputs[alive, 1] + 1) / 2 * CAR_ACCELERATION
+
+    def update(self, track, dt: int = SIM_DT, substeps: int = SIM_SUBSTEPS) -> np.ndarray:
+        """
+        살아있는 모든 차량 상태를 dt 틱만큼 업데이트 (substeps 번으로 나눠 적분)
+        Returns: 생존 여부 배열
+        """
+        h = dt / substeps
+        for _ in range(substeps):
+            idx = np.flatnonzero(self.alive)
+            if len(idx) == 0:
+                break
+            self._substep(track, idx, h)
+            self.elapsed += h
+        self._retire_stalled()
+        return self.alive
+
+    def _retire_stalled(self):
+        """
+        진행 없는 차량 탈락 (제어 스텝마다)
+        - STALL_TICKS 동안 최고 진행도가 늘지 않음
+        - 기록해 둔 위치로 돌아왔는데 그 사이 최고 진행도가 그대로 (제자리 돌기)
+        """
+        idx = np.flatnonzero(self.alive)
+        if len(idx) == 0:
+            return
+        time_alive = self.time_alive[idx]
+        progress = self.progress[idx]
+        improved = progress > self.best_progress[idx]
+        self.best_progress[idx[improved]] = progress[improved]
+        self.best_time[idx[improved]] = time_alive[improved]
+        best = self.best_progress[idx]
+
+        stalled = np.zeros(len(idx), dtype=bool)
+        if STALL_TICKS:
+            stalled |= time_alive - self.best_time[idx] >= STALL_TICKS
+
+        if LOOP_SAMPLE_TICKS:
+            x = self.x[idx]
+            y = self.y[idx]
+            near = np.hypot(self.loop_x[idx] - x[:, None], self.loop_y[idx] - y[:, None]) < LOOP_RADIUS
+            old = time_alive[:, None] - self.loop_time[idx] >= LOOP_SAMPLE_TICKS
+            same_best = self.loop_best[idx] >= best[:, None]
+            stalled |= (near & old & same_best).any(axis=1)
+
+            # LOOP_SAMPLE_TICKS 구간이 바뀔 때마다 현재 위치 기록
+            slot = (time_alive // LOOP_SAMPLE_TICKS).astype(int)
+            due = slot > self.loop_slot[idx]
+            rows = idx[due]
+            cols = self.loop_count[rows] % LOOP_SAMPLES
+            self.loop_x[rows, cols] = x[due]
+            self.loop_y[rows, cols] = y[due]
+            self.loop_best[rows, cols] = best[due]
+            self.loop_time[rows, cols] = time_alive[due]
+            self.loop_slot[rows] = slot[due]
+            self.loop_count[rows] += 1
+
+        self.alive[idx[stalled]] = False
+        self.retired[idx[stalled]] = True
+
+    def _substep(self, track, idx: np.ndarray, h: float):
+        """부분 스텝 1회 (h 틱) - 조향/속도/위치를 적분하고 이동 선분으로 충돌/체크포인트 판정"""
+        # 조향
+        self.angle[idx] += self.turn_rate[idx] * h
+
+        # 마찰력 적용 후 가속도 적용, 속도 제한
+        speed = self.speed[idx]
+        speed -= np.sign(speed) * CAR_FRICTION * h
+        speed += self.acceleration[idx] * h
+        speed = np.clip(speed, CAR_MIN_SPEED, CAR_MAX_SPEED)
+        self.speed[idx] = speed
+
+        # 출발 위치의 진행도
+        unset = idx[np.isnan(self.track_progress[idx])]
+        if len(unset):
+            self.track_progress[unset] = track.progress_at(self.x[unset], self.y[unset])
+
+        # 위치 업데이트
+        rad = np.radians(self.angle[idx])
+        step_x = np.cos(rad) * speed * h
+        step_y = -np.sin(rad) * speed * h  # pygame 좌표계
+        old_x = self.x[idx]
+        old_y = self.y[idx]
+        x = old_x + step_x
+        y = old_y + step_y
+        self.x[idx] = x
+        self.y[idx] = y
+
+        # 이동 거리 업데이트
+        self.distance_traveled[idx] += np.hypot(step_x, step_y)
+
+        # 충돌 감지 (이동 선분 전체)
+        on_track = track.is_motion_on_track(old_x, old_y, x, y)
+        if COLLISION_BODY == 'hull':
+            on_track &= track.is_hull_on_track(x, y, self.angle[idx])
+
+        # 차량 간 충돌 (출발 직후 유예)
+        if MULTI_AGENT and self.elapsed >= MULTI_AGENT_GRACE_TICKS:
+            survivors = np.flatnonzero(on_track)
+            on_track[survivors[self._collide_cars(idx[survivors])]] = False
+
+        self.alive[idx[~on_track]] = False
+        idx = idx[on_track]
+        x = x[on_track]
+        y = y[on_track]
+        old_x = old_x[on_track]
+        old_y = old_y[on_track]
+
+        # 체크포인트 확인 (근접 또는 선분 통과)
+        last = self.last_checkpoint[idx]
+        new = track.get_checkpoint_indices(x, y, last, old_x, old_y)
+        self.last_checkpoint[idx] = new
+        self.checkpoints_passed[idx] += new != last
+
+        # 트랙 진행도 누적 (시작선을 지나면 감아서 계산)
+        progress = track.progress_at(self.x[idx], self.y[idx])
+        self.progress[idx] += track.progress_map.delta(self.track_progress[idx], progress)
+        self.track_progress[idx] = progress
+        self.laps[idx] = np.maximum(self.progress[idx] // track.track_length, 0)
+
+        # 시간 업데이트
+        self.time_alive[idx] += h
+
+        # 적합도 계산 (Car._calculate_fitness 와 동일)
+        if FITNESS_MODE == 'progress':
+            self.fitness[idx] = self.progress[idx]
+        else:
+            self.fitness[idx] = self.checkpoints_passed[idx] * 1000 + self.distance_traveled[idx]
+
+    def step(self, track, outputs: np.ndarray) -> np.ndarray:
+        """신경망 출력 적용 + 물리 업데이트 (SIM_DT 틱)"""
+        self.set_outputs(outputs)
+        return self.update(track)
+
+
+def _field(name: str, cast):
+    """CarFleet 배열의 한 원소를 Car 속성처럼 노출하는 프로퍼티"""
+    def fget(self):
+        return cast(getattr(self.fleet, name)[self.index])
+
+    def fset(self, value):
+        getattr(self.fleet, name)[self.index] = value
+
+    return property(fget, fset)
+
+
+class FleetCar(Car):
+    """
+    CarFleet 배열 위의 Car 뷰
+    상태는 배열에 저장되므로 Visualizer/UIPanel 은 기존 Car 처럼 사용 가능
+    """
+    x = _field('x', float)
+    y = _field('y', float)
+    angle = _field('angle', float)
+    speed = _field('speed', float)
+    acceleration = _field('acceleration', float)
+    turn_rate = _field('turn_rate', float)
+    alive = _field('alive', bool)
+    fitness = _field('fitness', float)
+    distance_traveled = _field('distance_traveled', float)
+    last_checkpoint = _field('last_checkpoint', int)
+    checkpoints_passed = _field('checkpoints_passed', int)
+    time_alive = _field('time_alive', float)
+    track_progress = _field('track_progress', float)
+    progress = _field('progress', float)
+    laps = _field('laps', int)
+    best_progress = _field('best_progress', float)
+    best_time = _field('best_time', float)
+    retired = _field('retired', bool)
+
+    def __init__(self, fleet: CarFleet, index: int):
+        self.fleet = fleet
+        self.index = index
+        super().__init__(fleet.x[index], fleet.y[index], fleet.angle[index], car_id=index)
+
+    @property
+    def sensor_data(self) -> np.ndarray:
+        return self.fleet.sensor_data[self.index]
+
+    @sensor_data.setter
+    def sensor_data(self, value):
+        self.fleet.sensor_data[self.index] = value
@@ -0,0 +1,60 @@
+"""
+차량 밀도 히트맵 모듈
+- 트랙 영역을 격자로 나눠 프레임마다 차량 위치 수를 누적 (오래된 값은 감쇠)
+- NumPy 배열에서 색/알파를 계산해 pygame.surfarray 로 작은 Surface 에 쓴 뒤 확대해 표시
+차량 수와 무관하게 표시 비용은 격자 크기에만 비례
+"""
+import numpy as np
+import pygame
+
+from config import HEATMAP_CELL, HEATMAP_DECAY, PANEL_X, SCREEN_HEIGHT
+
+# 밀도 0 → 1 색상 (투명한 파랑 → 노랑 → 빨강)
+_COLOR_STOPS = np.array([
+    (0.0, 10, 132, 255, 0),
+    (0.3, 10, 132, 255, 90),
+    (0.7, 255, 214, 10, 150),
+    (1.0, 255, 69, 58, 190),
+])
+
+
+class DensityHeatmap:
+    def __init__(self, width: int = PANEL_X, height: int = SCREEN_HEIGHT,
+                 cell: int = HEATMAP_CELL, decay: float = HEATMAP_DECAY):
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.decay = decay
+        self.cols = (width + cell - 1) // cell
+        self.rows = (height + cell - 1) // cell
+        self.counts = np.zeros((self.cols, self.rows), dtype=np.float32)  # surfarray 와 같은 (x, y) 순서
+        self._surface = pygame.Surface((self.cols, self.rows), pygame.SRCALPHA)
+
+    def clear(self):
+        self.counts.fill(0)
+
+    def add(self, xs: np.ndarray, ys: np.ndarray):
+        """차량 위치 누적 (기존 값은 decay 배로 감쇠)"""
+        self.counts *= self.decay
+        cx = (np.asarray(xs) // self.cell).astype(int)
+        cy = (np.asarray(ys) // self.cell).astype(int)
+        inside = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        cells = cx[inside] * self.rows + cy[inside]
+        self.counts += np.bincount(cells, minlength=self.cols * self.rows).reshape(self.cols, self.rows)
+
+    def draw(self, surface: pygame.Surface):
+        """히트맵을 트랙 영역에 반투명하게 그리기 (로그 스케일 정규화)"""
+        peak = float(self.counts.max())
+        if peak <= 0:
+            return
+        level = np.log1p(self.counts) / np.log1p(peak)
+
+        stops = _COLOR_STOPS
+        channels = [np.interp(level, stops[:, 0], stops[:, k]) for k in range(1, 5)]
+        pygame.surfarray.blit_array(self._surface, np.stack(channels[:3], axis=-1).astype(np.uint8))
+        alpha = pygame.surfarray.pixels_alpha(self._surface)
+        alpha[...] = channels[3].astype(np.uint8)
+        del alpha  # Surface 잠금 해제
+
+        scaled = pygame.transform.scale(self._surface, (self.cols * self.cell, self.rows * self.cell))
+        surface.blit(scaled, (0, 0), pygame.Rect(0, 0, self.width, self.height))
@@ -0,0 +1,110 @@
+"""
+집단 신경망 추론 모듈
+- 세대의 모든 신경망을 층별 패딩 행렬로 컴파일
+- 살아있는 차량 전체의 입력을 층마다 한 번의 행렬 연산으로 평가
+"""
+import numpy as np
+import neat
+from neat.activations import tanh_activation
+from neat.aggregations import sum_aggregation
+from typing import List, Optional
+
+
+class PopulationNetwork:
+    """
+    FeedForwardNetwork 묶음의 일괄 추론 엔진
+    tanh 활성화 / sum 집계 노드만 지원 (neat_config.txt 설정)
+
+    값 배열 (차량 x 슬롯) 구성: [입력 | 출력 | 은닉 | 버림 슬롯]
+    층 d 의 노드 값 = tanh(2.5 * (bias + response * W[d] @ 값))
+    """
+
+    def __init__(self, nets: List[neat.nn.FeedForwardNetwork]):
+        if not nets:
+            raise ValueError("컴파일할 신경망이 없습니다")
+
+        self.num_inputs = len(nets[0].input_nodes)
+        self.num_outputs = len(nets[0].output_nodes)
+
+        # 신경망별 노드 → 슬롯 번호, 노드 → 층 깊이
+        slot_maps = []
+        node_layers = []
+        for net in nets:
+            slots = {key: i for i, key in enumerate(net.input_nodes + net.output_nodes)}
+            depth = {key: 0 for key in net.input_nodes}
+            layers: List[list] = []
+
+            # node_evals 는 위상 정렬 순서이므로 앞에서부터 깊이 계산 가능
+            for node, act_func, agg_func, bias, response, links in net.node_evals:
+                if act_func is not tanh_activation or agg_func is not sum_aggregation:
+                    raise ValueError(f"지원하지 않는 노드 함수입니다 (노드 {node}): tanh/sum 만 가능")
+                d = 1 + max((depth[i] for i, _ in links), default=0)
+                depth[node] = d
+                if node not in slots:
+                    slots[node] = len(slots)
+                while len(layers) < d:
+                    layers.append([])
+                layers[d - 1].append((node, bias, response, links))
+
+            slot_maps.append(slots)
+            node_layers.append(layers)
+
+        count = len(nets)
+        self.count = count
+        self.num_slots = max(len(slots) for slots in slot_maps) + 1
+        scratch = self.num_slots - 1  # 패딩 노드 출력이 기록되는 버림 슬롯
+        depth_count = max(len(layers) for layers in node_layers)
+
+        # 층별 패딩 행렬
+        self.weights: List[np.ndarray] = []    # (신경망, 폭, 슬롯)
+        self.biases: List[np.ndarray] = []     # (신경망, 폭)
+        self.responses: List[np.ndarray] = []  # (신경망, 폭)
+        self.targets: List[np.ndarray] = []    # (신경망, 폭) 결과를 기록할 슬롯
+
+        for d in range(depth_count):
+            width = max(len(layers[d]) if d < len(layers) else 0 for layers in node_layers)
+            weights = np.zeros((count, width, self.num_slots))
+            biases = np.zeros((count, width))
+            responses = np.zeros((count, width))
+            targets = np.full((count, width), scratch, dtype=int)
+
+            for g, (slots, layers) in enumerate(zip(slot_maps, node_layers)):
+                if d >= len(layers):
+                    continue
+                for w, (node, bias, response, links) in enumerate(layers[d]):
+                    for i, weight in links:
+                        weights[g, w, slots[i]] += weight
+                    biases[g, w] = bias
+                    responses[g, w] = response
+                    targets[g, w] = slots[node]
+
+            self.weights.append(weights)
+            self.biases.append(biases)
+            self.responses.append(responses)
+            self.targets.append(targets)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def activate(self, inputs: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        여러 신경망을 한 번에 평가
+        inputs: (m, 입력 수), rows: 평가할 신경망 번호 (m,) - None 이면 전체
+        Returns: (m, 출력 수)
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        if rows is None:
+            rows = np.arange(len(inputs))
+
+        values = np.zeros((len(rows), self.num_slots))
+        values[:, :self.num_inputs] = inputs
+
+        for weights, biases, responses, targets in zip(
+                self.weights, self.biases, self.responses, self.targets):
+            s = np.matmul(weights[rows], values[:, :, None])[:, :, 0]
+            z = biases[rows] + responses[rows] * s
+            # neat.activations.tanh_activation 과 동일
+            out = np.tanh(np.clip(2.5 * z, -60.0, 60.0))
+            np.put_along_axis(values, targets[rows], out, axis=1)
+
+        return values[:, self.num_inputs:self.num_inputs + self.num_outputs]
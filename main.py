@@ -4,18 +4,32 @@ NEAT 알고리즘을 사용한 신경망 진화
 """
 import pygame
 import neat
+import numpy as np
+import argparse
 import os
 import sys
 import time
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, TextIO
 
 from config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, FPS,
-    CAR_COUNT, GENERATION_TIME, SPEED_OPTIONS,
-    COLORS, NEAT_CONFIG_PATH, PANEL_X
+    CAR_COUNT, SPEED_OPTIONS, SENSOR_INPUTS, MULTI_AGENT, FITNESS_MEMO,
+    TERMINATION_LAP_CAP, TERMINATION_PLATEAU_TICKS,
+    COLORS, NEAT_CONFIG_PATH, CHECKPOINT_PATH, STATS_LOG_PATH, METRICS_PATH, PANEL_X
 )
 from track import Track
+from polyline_track import load_track
 from car import Car
+from fleet import CarFleet
+from simulation import GenerationRunner
+from termination import StopRule, TerminationPolicy, normalize_fitness
+from parallel import WorkerPool
+from network_cache import NetworkCache
+from fitness_memo import FitnessMemo, memo_conflict, end_tick
+from checkpoint import CheckpointReporter, load_checkpoint
+from stats import StatsReporter
+from metrics import MetricsSink, generation_metrics
+from profiler import Profiler
 from visualizer import Visualizer
 from ui_panel import UIPanel
 
@@ -23,18 +37,81 @@ from ui_panel import UIPanel
 class SelfDrivingSimulation:
     """자율주행 AI 시뮬레이션 클래스"""
     
-    def __init__(self):
-        pygame.init()
-        pygame.display.set_caption("Self-Driving AI")
+    def __init__(self, headless: bool = False, log_file: Optional[TextIO] = None,
+                 workers: int = 1, profiler: Optional[Profiler] = None,
+                 track: Optional[Track] = None,
+                 checkpoint_path: Optional[str] = CHECKPOINT_PATH,
+                 resume_path: Optional[str] = None,
+                 stats_log_path: Optional[str] = STATS_LOG_PATH,
+                 metrics_path: Optional[str] = METRICS_PATH):
+        # 헤드리스 모드: 창/렌더링/FPS 제한 없이 최대 속도로 학습
+        self.headless = headless
+        self.log_file = log_file
         
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.clock = pygame.time.Clock()
+        # 체크포인트 (None 이면 저장 안 함) / 이어서 학습할 체크포인트
+        self.checkpoint_path = checkpoint_path
+        self.resume_path = resume_path
         
-        # 모듈 초기화
-        self.track = Track()
-        self.visualizer = Visualizer(self.screen)
+        # 구간별 성능 측정 (P 키로 켜고 끔)
+        self.profiler = profiler if profiler is not None else Profiler()
+        
+        # 트랙 (기본: 타원 트랙, --track 으로 파일 트랙 지정)
+        self.track = track if track is not None else Track()
+        if self.track.sensor_mode == 'lut':
+            # 학습 시작 전에 생성/로드 (워커는 같은 파일을 메모리 맵으로 공유)
+            self.track.get_sensor_lut()
+        
+        # 병렬 평가: 유전체를 워커 프로세스에 나눠 시뮬레이션
+        # (다중 에이전트 모드는 모든 차량이 같은 트랙에 있어야 하므로 단일 프로세스)
+        if MULTI_AGENT and workers > 1:
+            print("다중 에이전트 모드에서는 병렬 평가를 사용하지 않습니다 (--workers 무시)")
+            workers = 1
+        self.worker_pool = WorkerPool(workers, self.track) if workers > 1 else None
+        
+        # 바퀴 수 상한/정체 종료는 집단 전체의 최고 차량으로 판정하므로 직렬 평가에서만 사용
+        lap_cap, plateau_ticks = TERMINATION_LAP_CAP, TERMINATION_PLATEAU_TICKS
+        if self.worker_pool is not None and (lap_cap or plateau_ticks):
+            print("병렬 평가에서는 바퀴 수 상한/정체 종료를 사용하지 않습니다 (틱 예산과 전멸로만 종료)")
+            lap_cap = plateau_ticks = 0
+        
+        # 적합도 메모: 바뀌지 않은 유전체가 같은 출발 위치면 다시 시뮬레이션하지 않음
+        # (바퀴 수 상한/정체 종료는 세대 길이가 다른 차량에 따라 달라지므로 메모를 쓰면 끔)
+        self.fitness_memo: Optional[FitnessMemo] = None
+        if FITNESS_MEMO:
+            conflict = memo_conflict()
+            if conflict is None and not headless and self.worker_pool is None:
+                conflict = "창 모드 직렬 평가는 모든 차량을 화면에 보여줍니다"
+            if conflict is not None:
+                print(f"적합도 메모를 사용하지 않습니다: {conflict}")
+            else:
+                if lap_cap or plateau_ticks:
+                    print("적합도 메모를 사용하므로 바퀴 수 상한/정체 종료를 끕니다 "
+                          "(세대 길이가 다른 차량에 따라 달라지면 기록을 재사용할 수 없음)")
+                    lap_cap = plateau_ticks = 0
+                self.fitness_memo = FitnessMemo(self.track)
+        
+        if headless:
+            self.screen = None
+            self.clock = None
+            self.visualizer = None
+        else:
+            pygame.init()
+            pygame.display.set_caption("Self-Driving AI")
+            
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.clock = pygame.time.Clock()
+            self.visualizer = Visualizer(self.screen)
+        
+        # 모듈 초기화 (UI 패널은 점수 기록도 담당)
         self.ui_panel = UIPanel()
         
+        # 세대 통계 (메모리에는 요약만, 상세 통계는 파일에 추가 기록)
+        self.stats = StatsReporter(stats_log_path)
+        
+        # 세대별 지표 CSV (학습 스레드는 행만 모으고 기록은 백그라운드 스레드)
+        self.metrics = MetricsSink(metrics_path) if metrics_path else None
+        self.population: Optional[neat.Population] = None
+        
         # 상태 변수
         self.generation = 0
         self.running = True
@@ -44,9 +121,19 @@ class SelfDrivingSimulation:
         self.speed_multiplier = 1
         
         # 현재 세대의 차량들과 신경망
+        self.runner: Optional[GenerationRunner] = None
+        self.fleet: Optional[CarFleet] = None
         self.cars: List[Car] = []
         self.nets: List[neat.nn.FeedForwardNetwork] = []
         self.genomes: List[neat.DefaultGenome] = []
+        self.fleet_slots: List[int] = []  # 차량 집단 번호 → 유전체 번호 (메모로 생략한 유전체 제외)
+        
+        # 컴파일된 신경망 캐시 (바뀌지 않은 엘리트 유전체는 다시 컴파일하지 않음)
+        self.network_cache = NetworkCache()
+        
+        # 세대 조기 종료 정책 (바퀴 수 상한 / 정체 / 적응형 틱 예산)
+        self.termination = TerminationPolicy(lap_cap=lap_cap, plateau_ticks=plateau_ticks)
+        self.stop_rule = StopRule()
         
         # 최고 차량 추적
         self.best_car_id: Optional[int] = None
@@ -60,162 +147,291 @@ class SelfDrivingSimulation:
         """
         self.generation += 1
         
-        # 차량과 신경망 초기화
-        self.cars = []
-        self.nets = []
-        self.genomes = []
-        
-        # 시작 위치 가져오기
-        start_positions = self.track.get_start_positions(len(genomes))
-        
-        for i, (genome_id, genome) in enumerate(genomes):
-            # 신경망 생성
-            net = neat.nn.FeedForwardNetwork.create(genome, config)
-            self.nets.append(net)
-            self.genomes.append(genome)
-            
-            # 차량 생성
-            x, y, angle = start_positions[i]
-            car = Car(x, y, angle, car_id=i)
-            self.cars.append(car)
-            
-            # 적합도 초기화
+        # 유전체 목록 / 적합도 초기화
+        self.genomes = [genome for genome_id, genome in genomes]
+        for genome in self.genomes:
             genome.fitness = 0
         
         # 세대 시뮬레이션 실행
-        self._run_generation()
+        self.stop_rule = self.termination.next_rule()
+        wall_start = time.perf_counter()
         
-        # 적합도 기록
-        best_fitness = 0
-        total_fitness = 0
+        # 신경망 생성 (캐시 적중 수 기록)
+        cache_hits = self.network_cache.hits
+        self.nets = self.network_cache.create_all(self.genomes, config)
+        cached_count = self.network_cache.hits - cache_hits
+        
+        # 출발 위치 + 적합도 메모 조회 (기록을 쓸 수 있는 유전체는 시뮬레이션 생략)
+        count = len(self.genomes)
+        start_positions = self.track.get_start_positions(count)
+        memo = [None] * count
+        if self.fitness_memo is not None:
+            budget = self.stop_rule.tick_budget
+            memo = [self.fitness_memo.lookup(genome, start, budget)
+                    for genome, start in zip(self.genomes, start_positions)]
+        slots = [i for i, entry in enumerate(memo) if entry is None]
+        
+        raw_fitness = np.zeros(count)
+        alive = np.zeros(count, dtype=bool)
+        time_alive = np.zeros(count)
+        ticks = 0
+        if slots:
+            if self.worker_pool is not None:
+                results = self._evaluate_parallel(slots, start_positions)
+            else:
+                results = self._evaluate_serial(slots, start_positions)
+            raw_fitness[slots], alive[slots], time_alive[slots], ticks = results
+        if len(slots) < count:
+            ticks = self._merge_memo(memo, raw_fitness, alive, time_alive, ticks)
+        wall_time = time.perf_counter() - wall_start
+        
+        # 선택용 적합도 (바퀴 수 상한/정체로 잘린 세대는 GENERATION_TICKS 기준으로 환산)
+        fitness = normalize_fitness(raw_fitness, alive, ticks, self.stop_rule)
+        self.termination.record(fitness, time_alive, self.stop_rule.reason)
         
-        for i, genome in enumerate(self.genomes):
-            genome.fitness = self.cars[i].fitness
-            total_fitness += genome.fitness
-            if genome.fitness > best_fitness:
-                best_fitness = genome.fitness
+        if self.fitness_memo is not None:
+            for i in slots:
+                self.fitness_memo.store(self.genomes[i], start_positions[i], raw_fitness[i], alive[i],
+                                        time_alive[i], self.stop_rule.tick_budget)
         
-        avg_fitness = total_fitness / len(self.genomes) if self.genomes else 0
+        # 최고 유전체 (신경망 시각화용) - 차량을 화면에서 추적하지 않은 경우
+        if count and (self.worker_pool is not None or len(slots) < count):
+            best = int(np.argmax(fitness))
+            self.best_genome = self.genomes[best]
+            self.best_net = self.nets[best]
+        
+        # 적합도 기록
+        for genome, genome_fitness in zip(self.genomes, fitness):
+            genome.fitness = float(genome_fitness)
+        
+        best_fitness = float(fitness.max(initial=0))
+        avg_fitness = float(fitness.mean()) if len(fitness) else 0
         
         # 그래프 데이터 업데이트
         self.ui_panel.update_scores(best_fitness, avg_fitness)
+        
+        # 세대 통계 기록
+        self._log_generation(best_fitness, avg_fitness, int(np.count_nonzero(alive)),
+                             len(fitness), ticks, wall_time, cached_count, count - len(slots))
+        if self.metrics is not None:
+            species_count = len(self.population.species.species) if self.population is not None else 0
+            self.metrics.record(generation_metrics(
+                self.generation, fitness, raw_fitness, alive, ticks, self.stop_rule,
+                wall_time, self.genomes, species_count, cached_count, count - len(slots)))
+        self.profiler.end_generation(self.generation)
     
-    def _run_generation(self):
-        """한 세대 시뮬레이션 실행"""
-        start_time = time.time()
-        time_left = GENERATION_TIME
+    def _evaluate_serial(self, slots: List[int], start_positions: List[Tuple[float, float, float]]
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        현재 프로세스에서 세대 시뮬레이션 (slots 번째 유전체만)
+        Returns: (환산 전 적합도, 종료 시 생존 여부, 생존 틱, 시뮬레이션 틱 수) - slots 순서
+        """
+        # 시작 위치에 차량 집단 생성
+        self.fleet_slots = slots
+        self.runner = GenerationRunner(self.track, [start_positions[i] for i in slots],
+                                       [self.nets[i] for i in slots], self.profiler,
+                                       self.stop_rule)
+        self.fleet = self.runner.fleet
+        self.cars = self.fleet.cars
         
-        while True:
-            # 이벤트 처리
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+        if self.headless:
+            self._run_generation_headless()
+        else:
+            self._run_generation()
+        
+        return self.fleet.fitness, self.fleet.alive, self.fleet.time_alive, self.runner.ticks
+    
+    def _evaluate_parallel(self, slots: List[int], start_positions: List[Tuple[float, float, float]]
+                           ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        워커 프로세스에 신경망을 나눠 세대 시뮬레이션 (slots 번째 유전체만)
+        화면에는 진행 상황만 표시 (차량은 워커에서 시뮬레이션)
+        """
+        self.runner = None
+        self.fleet = None
+        self.cars = []
+        self.best_car_id = None
+        
+        on_progress = None if self.headless else self._show_parallel_progress
+        return self.worker_pool.evaluate([self.nets[i] for i in slots],
+                                         [start_positions[i] for i in slots],
+                                         on_progress, self.stop_rule)
+    
+    def _merge_memo(self, memo: list, fitness: np.ndarray, alive: np.ndarray,
+                    time_alive: np.ndarray, ticks: int) -> int:
+        """
+        적합도 메모 기록을 결과 배열에 채우고 세대 틱 수 반환
+        끝까지 산 기록이 있으면 세대는 틱 예산 끝까지, 아니면 가장 늦게 탈락한 스텝까지
+        (메모를 쓰면 바퀴 수 상한/정체 종료가 꺼지므로 종료 이유도 예산 소진/전멸 중 하나)
+        """
+        for i, entry in enumerate(memo):
+            if entry is None:
+                continue
+            fitness[i], alive[i], time_alive[i], _ = entry
+            if not alive[i]:
+                ticks = max(ticks, end_tick(time_alive[i]))
+        if alive.any():
+            ticks = self.stop_rule.tick_budget
+        self.stop_rule.reason = 'budget' if alive.any() else 'extinct'
+        return ticks
+    
+    def _show_parallel_progress(self, ticks: int, alive_count: int):
+        """병렬 평가 중 진행 상황 렌더링"""
+        self._handle_events()
+        self._render(self._time_left(ticks), alive_count, len(self.genomes))
+    
+    def _log_generation(self, best_fitness: float, avg_fitness: float,
+                        alive_count: int, total_count: int, ticks: int, wall_time: float,
+                        cached_count: int = 0, memo_count: int = 0):
+        """세대별 통계를 한 줄로 출력 (헤드리스 모드 또는 로그 파일 지정 시)"""
+        if not self.headless and self.log_file is None:
+            return
+        
+        ticks_per_sec = ticks / wall_time if wall_time > 0 else 0
+        line = (f"gen={self.generation} best={best_fitness:.1f} avg={avg_fitness:.1f} "
+                f"alive={alive_count}/{total_count} ticks={ticks}/{self.stop_rule.tick_budget} "
+                f"time={wall_time:.2f}s tps={ticks_per_sec:.0f} "
+                f"nets_cached={cached_count}/{total_count} cache_hit={self.network_cache.hit_rate:.0%} "
+                f"memo={memo_count}/{total_count}")
+        
+        out = self.log_file if self.log_file is not None else sys.stdout
+        print(line, file=out, flush=True)
+    
+    def _time_left(self, ticks: int) -> float:
+        """남은 시뮬레이션 시간 (초) - 이번 세대 틱 예산 기준"""
+        return max(0, self.stop_rule.tick_budget - ticks) / FPS
+    
+    def _handle_events(self):
+        """이벤트 처리 (종료, 일시정지, 배속 버튼)"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
                     self.running = False
                     pygame.quit()
                     sys.exit()
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        self.running = False
-                        pygame.quit()
-                        sys.exit()
-                    elif event.key == pygame.K_SPACE:
-                        self.paused = not self.paused
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    # 배속 버튼 클릭 처리
-                    self.ui_panel.handle_click(event.pos, self)
+                elif event.key == pygame.K_SPACE:
+                    self.paused = not self.paused
+                elif event.key == pygame.K_p:
+                    self._toggle_profiler()
+                elif event.key == pygame.K_h:
+                    self.visualizer.show_heatmap = not self.visualizer.show_heatmap
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # 배속 버튼 클릭 처리
+                self.ui_panel.handle_click(event.pos, self)
+    
+    def _toggle_profiler(self):
+        """성능 오버레이 켜기/끄기 (파일 기록 중이면 측정은 계속)"""
+        panel = self.ui_panel
+        panel.show_profiler = not panel.show_profiler
+        self.profiler.enabled = panel.show_profiler or self.profiler.export_path is not None
+    
+    def _run_generation(self):
+        """
+        한 세대 시뮬레이션 실행
+        세대 길이는 틱 예산 (최대 GENERATION_TICKS) 과 조기 종료 조건으로 정해지고, 화면은 그 위의 뷰일 뿐
+        (배속/일시정지/기기 부하와 무관하게 같은 틱 수를 시뮬레이션)
+        """
+        runner = self.runner
+        
+        while True:
+            # 이벤트 처리
+            self._handle_events()
             
-            # 일시정지 중이면 렌더링만
+            # 일시정지 중이면 렌더링만 (틱 예산은 소모하지 않음)
             if self.paused:
-                self._render(time_left)
+                self._render(self._time_left(runner.ticks))
                 self.clock.tick(FPS)
                 continue
             
-            # 경과 시간
-            elapsed_time = time.time() - start_time
-            time_left = max(0, GENERATION_TIME - elapsed_time)
-            
-            # 시간 초과 또는 모든 차량 사망 시 세대 종료
-            alive_count = sum(1 for car in self.cars if car.alive)
-            if elapsed_time >= GENERATION_TIME or alive_count == 0:
+            # 틱 예산 소진 또는 모든 차량 사망 시 세대 종료
+            if runner.finished:
                 break
             
             # 배속만큼 시뮬레이션 업데이트 (프레임 스킵)
             for _ in range(self.speed_multiplier):
                 # 차량 업데이트
-                self._update_cars()
+                runner.step()
                 
                 # 최고 차량 찾기
-                self._find_best_car()
+                with self.profiler.section('best_car'):
+                    self._find_best_car()
                 
-                # 모든 차량 사망 체크
-                alive_count = sum(1 for car in self.cars if car.alive)
-                if alive_count == 0:
+                # 틱 예산 소진 / 모든 차량 사망 체크
+                if runner.finished:
                     break
             
             # 렌더링은 1번만 (프레임 스킵)
-            self._render(time_left)
+            self._render(self._time_left(runner.ticks))
             
             # FPS 제한
             self.clock.tick(FPS)
     
-    def _update_cars(self):
-        """모든 차량 상태 업데이트"""
-        for i, car in enumerate(self.cars):
-            if not car.alive:
-                continue
-            
-            # 센서 업데이트
-            car.update_sensors(self.track)
-            
-            # 신경망 입력
-            inputs = car.get_inputs()
-            
-            # 신경망 출력 (조향, 가속)
-            outputs = self.nets[i].activate(inputs)
-            
-            # 차량에 출력 적용
-            car.set_outputs(outputs)
-            
-            # 차량 물리 업데이트
-            car.update(self.track)
+    def _run_generation_headless(self):
+        """
+        한 세대 시뮬레이션 실행 (헤드리스)
+        이벤트/렌더링/FPS 제한 없이 세대 끝까지 최대 속도로 진행
+        """
+        self.runner.run()
+        self._find_best_car()
     
     def _find_best_car(self):
         """현재 가장 높은 적합도의 차량 찾기"""
-        best_fitness = -1
         self.best_car_id = None
         
-        for i, car in enumerate(self.cars):
-            if car.alive and car.fitness > best_fitness:
-                best_fitness = car.fitness
-                self.best_car_id = car.car_id
-                self.best_genome = self.genomes[i]
-                self.best_net = self.nets[i]
+        fleet = self.fleet
+        if fleet.alive_count == 0:
+            return
+        
+        i = int(np.argmax(np.where(fleet.alive, fleet.fitness, -np.inf)))
+        self.best_car_id = self.cars[i].car_id
+        self.best_genome = self.genomes[self.fleet_slots[i]]
+        self.best_net = self.nets[self.fleet_slots[i]]
     
-    def _render(self, time_left: float = 0):
-        """화면 렌더링"""
+    def _render(self, time_left: float = 0,
+                alive_count: Optional[int] = None, total_count: Optional[int] = None):
+        """
+        화면 렌더링
+        alive_count/total_count 미지정 시 현재 차량 집단 기준
+        """
         # 트랙 영역 렌더링
-        self.visualizer.render(
-            self.track,
-            self.cars,
-            self.generation,
-            time_left,
-            self.best_car_id
-        )
+        with self.profiler.section('render'):
+            self.visualizer.render(
+                self.track,
+                self.cars,
+                self.generation,
+                time_left,
+                self.best_car_id,
+                fleet=self.fleet
+            )
         
         # UI 패널 렌더링
-        alive_count = sum(1 for car in self.cars if car.alive)
-        best_fitness = max((car.fitness for car in self.cars), default=0)
-        
-        self.ui_panel.draw(
-            self.screen,
-            self.generation,
-            alive_count,
-            len(self.cars),
-            time_left,
-            best_fitness,
-            self.speed_multiplier,
-            self.best_genome,
-            self.best_net
-        )
+        if self.fleet is not None:
+            alive_count = self.fleet.alive_count if alive_count is None else alive_count
+            total_count = len(self.fleet) if total_count is None else total_count
+            best_fitness = float(self.fleet.fitness.max(initial=0))
+        else:
+            best_fitness = 0
+        
+        with self.profiler.section('panel'):
+            self.ui_panel.draw(
+                self.screen,
+                self.generation,
+                alive_count or 0,
+                total_count or 0,
+                time_left,
+                best_fitness,
+                self.speed_multiplier,
+                self.best_genome,
+                self.best_net
+            )
+        
+        # 성능 오버레이
+        if self.ui_panel.show_profiler:
+            self.ui_panel.draw_profiler_overlay(self.screen, self.profiler)
         
         # 일시정지 표시
         if self.paused:
@@ -256,13 +472,33 @@ class SelfDrivingSimulation:
             config_path
         )
         
-        # NEAT 집단 생성
-        population = neat.Population(config)
+        # 센서 설정에 맞춰 신경망 입력 수 조정 (벽 거리 입력 등)
+        genome_config = config.genome_config
+        if genome_config.num_inputs != SENSOR_INPUTS:
+            print(f"신경망 입력 수를 센서 설정에 맞춥니다: {genome_config.num_inputs} → {SENSOR_INPUTS}")
+            genome_config.num_inputs = SENSOR_INPUTS
+            genome_config.input_keys = [-i - 1 for i in range(SENSOR_INPUTS)]
+        
+        # NEAT 집단 생성 (--resume 이면 체크포인트에서 복원)
+        if self.resume_path is not None:
+            start = time.perf_counter()
+            population = load_checkpoint(self.resume_path, config, self)
+            print(f"체크포인트에서 이어서 학습합니다: {self.resume_path} "
+                  f"(세대 {self.generation}, {(time.perf_counter() - start) * 1000:.0f}ms)")
+        else:
+            population = neat.Population(config)
         
         # 통계 리포터 추가 (콘솔 출력)
         population.add_reporter(neat.StdOutReporter(True))
-        stats = neat.StatisticsReporter()
-        population.add_reporter(stats)
+        population.add_reporter(self.stats)
+        self.stats.population = population
+        self.population = population
+        
+        # 체크포인트 리포터 (스냅샷은 백그라운드 스레드에서 기록)
+        checkpoint = None
+        if self.checkpoint_path:
+            checkpoint = CheckpointReporter(population, self, self.checkpoint_path)
+            population.add_reporter(checkpoint)
         
         # 진화 실행 (무한 세대)
         try:
@@ -273,22 +509,110 @@ class SelfDrivingSimulation:
         except SystemExit:
             pass
         finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            self.stats.close()
+            if self.metrics is not None:
+                self.metrics.close()
+            if self.worker_pool is not None:
+                self.worker_pool.terminate()
             pygame.quit()
+    
+    def checkpoint_state(self) -> dict:
+        """체크포인트에 넣을 시뮬레이션 상태 (세대 번호, 점수/최고 유전체 기록, 조기 종료/메모 상태)"""
+        return {
+            'generation': self.generation,
+            'best_scores': self.ui_panel.best_scores,
+            'avg_scores': self.ui_panel.avg_scores,
+            'stats': self.stats.state(),
+            'termination': self.termination,
+            'fitness_memo': self.fitness_memo,
+        }
+    
+    def restore_checkpoint_state(self, state: dict):
+        """checkpoint_state 로 저장한 상태 복원"""
+        self.generation = state['generation']
+        self.ui_panel.best_scores = state['best_scores']
+        self.ui_panel.avg_scores = state['avg_scores']
+        self.stats.restore(state['stats'])
+        # 적응형 예산 기록만 이어받음 (종료 조건은 이번 실행의 설정/평가 방식 기준)
+        self.termination.best_survival = state['termination'].best_survival
+        
+        # 적합도 메모는 트랙/설정이 같을 때만 이어서 사용
+        memo = state['fitness_memo']
+        if self.fitness_memo is not None and memo is not None:
+            if memo.signature == self.fitness_memo.signature:
+                self.fitness_memo = memo
+            else:
+                print("트랙 또는 설정이 바뀌어 저장된 적합도 메모를 버립니다")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Self-Driving AI Visualization")
+    parser.add_argument('--headless', action='store_true',
+                        help="창 없이 최대 속도로 학습 (서버용)")
+    parser.add_argument('--log', metavar='PATH',
+                        help="세대별 통계를 기록할 파일 (기본: 헤드리스 모드에서 표준 출력)")
+    parser.add_argument('--workers', type=int, default=1, metavar='N',
+                        help="유전체 평가에 사용할 프로세스 수 (기본: 1, 직렬 평가)")
+    parser.add_argument('--profile', action='store_true',
+                        help="구간별 성능 측정 및 오버레이 표시 (P 키로도 전환)")
+    parser.add_argument('--profile-out', metavar='PATH',
+                        help="세대별 구간 측정 결과 파일 (.csv 또는 JSON Lines)")
+    parser.add_argument('--track', metavar='PATH',
+                        help="트랙 파일 (JSON, 예: tracks/circuit.json / 기본: 타원 트랙)")
+    parser.add_argument('--checkpoint', metavar='PATH', default=CHECKPOINT_PATH,
+                        help=f"학습 체크포인트 파일 (기본: {CHECKPOINT_PATH})")
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help="체크포인트를 저장하지 않음")
+    parser.add_argument('--stats-log', metavar='PATH', default=STATS_LOG_PATH,
+                        help=f"세대별 상세 통계 파일 (JSON Lines, 기본: {STATS_LOG_PATH})")
+    parser.add_argument('--metrics', metavar='PATH', default=METRICS_PATH,
+                        help=f"세대별 지표 파일 (CSV, 기본: {METRICS_PATH})")
+    parser.add_argument('--resume', nargs='?', const=True, metavar='PATH',
+                        help="체크포인트에서 이어서 학습 (경로 생략 시 --checkpoint 파일)")
+    return parser.parse_args(argv)
 
 
 def main():
     """메인 함수"""
+    args = parse_args()
+    
     print("=" * 50)
     print("  Self-Driving AI Visualization")
     print("=" * 50)
-    print("\n조작법:")
-    print("  - ESC: 종료")
-    print("  - Space: 일시정지/재개")
-    print("  - 마우스: 배속 버튼 클릭 (x1, x5, x10)")
+    if args.headless:
+        print("\n헤드리스 모드 - Ctrl+C: 종료")
+    else:
+        print("\n조작법:")
+        print("  - ESC: 종료")
+        print("  - Space: 일시정지/재개")
+        print("  - P: 성능 오버레이")
+        print("  - H: 차량 밀도 히트맵")
+        print("  - 마우스: 배속 버튼 클릭 (x1, x5, x10)")
     print("\n학습을 시작합니다...\n")
     
-    simulation = SelfDrivingSimulation()
-    simulation.run()
+    profiler = Profiler(enabled=args.profile or args.profile_out is not None,
+                        export_path=args.profile_out)
+    
+    track = load_track(args.track) if args.track else None
+    
+    log_file = open(args.log, 'a', encoding='utf-8') if args.log else None
+    try:
+        resume_path = args.checkpoint if args.resume is True else args.resume
+        simulation = SelfDrivingSimulation(headless=args.headless, log_file=log_file,
+                                           workers=args.workers, profiler=profiler,
+                                           track=track,
+                                           checkpoint_path=None if args.no_checkpoint else args.checkpoint,
+                                           resume_path=resume_path,
+                                           stats_log_path=args.stats_log or None,
+                                           metrics_path=args.metrics or None)
+        simulation.ui_panel.show_profiler = args.profile
+        simulation.run()
+    finally:
+        if log_file is not None:
+            log_file.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""
+세대별 지표 기록 모듈
+- 세대마다 1행 (적합도 분포, 환산 전 적합도, 종료 이유, 생존 수, 틱/시간/처리량, 종 수, 유전체 크기,
+  캐시/메모 적중) 을 CSV 에 추가
+- 학습 스레드는 행을 모으기만 하고, flush_rows 행마다 백그라운드 스레드가 파일에 기록
+여러 실행의 처리량/수렴을 로그 파싱 없이 오프라인 분석하기 위한 용도
+"""
+import csv
+import os
+import queue
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import METRICS_FLUSH_ROWS
+from termination import StopRule
+
+# CSV 열 (순서 고정)
+METRIC_COLUMNS = [
+    'generation',
+    'best', 'mean', 'stdev', 'p10', 'p50', 'p90',
+    'raw_best', 'raw_mean',
+    'alive', 'total',
+    'ticks', 'tick_budget', 'stop_reason', 'wall_time_s', 'ticks_per_sec', 'car_ticks_per_sec',
+    'species',
+    'nodes_mean', 'nodes_max', 'connections_mean', 'connections_max',
+    'nets_cached', 'memo_hits',
+]
+
+
+def generation_metrics(generation: int, fitness: np.ndarray, raw_fitness: np.ndarray,
+                       alive: np.ndarray, ticks: int, rule: StopRule, wall_time: float,
+                       genomes: list, species_count: int,
+                       nets_cached: int = 0, memo_hits: int = 0) -> Dict[str, float]:
+    """
+    세대 결과로 지표 1행 생성
+    fitness 는 선택용 (바퀴 수 상한/정체로 잘린 세대는 환산), raw_fitness 는 환산 전 차량 적합도
+    설정이 다른 실행끼리 수렴을 비교할 때는 raw_* 와 stop_reason 사용
+    """
+    total = len(fitness)
+    if total:
+        p10, p50, p90 = np.percentile(fitness, [10, 50, 90])
+    else:
+        p10 = p50 = p90 = 0.0
+    nodes = np.array([len(genome.nodes) for genome in genomes])
+    connections = np.array([sum(1 for c in genome.connections.values() if c.enabled)
+                            for genome in genomes])
+    alive_count = int(np.count_nonzero(alive))
+
+    # 메모로 생략한 유전체는 시뮬레이션하지 않았으므로 처리량에서 제외
+    simulated = total - memo_hits
+    return {
+        'generation': generation,
+        'best': float(fitness.max(initial=0)),
+        'mean': float(fitness.mean()) if total else 0.0,
+        'stdev': float(fitness.std()) if total else 0.0,
+        'p10': float(p10),
+        'p50': float(p50),
+        'p90': float(p90),
+        'raw_best': float(raw_fitness.max(initial=0)),
+        'raw_mean': float(raw_fitness.mean()) if total else 0.0,
+        'alive': alive_count,
+        'total': total,
+        'ticks': ticks,
+        'tick_budget': rule.tick_budget,
+        'stop_reason': rule.reason or '',
+        'wall_time_s': round(wall_time, 4),
+        'ticks_per_sec': round(ticks / wall_time, 1) if wall_time > 0 else 0.0,
+        'car_ticks_per_sec': round(ticks * simulated / wall_time, 1) if wall_time > 0 else 0.0,
+        'species': species_count,
+        'nodes_mean': float(nodes.mean()) if len(nodes) else 0.0,
+        'nodes_max': int(nodes.max(initial=0)),
+        'connections_mean': float(connections.mean()) if len(connections) else 0.0,
+        'connections_max': int(connections.max(initial=0)),
+        'nets_cached': nets_cached,
+        'memo_hits': memo_hits,
+    }
+
+
+class MetricsSink:
+    """세대별 지표 CSV 기록기 (버퍼링 + 백그라운드 기록)"""
+
+    def __init__(self, path: str, flush_rows: int = METRICS_FLUSH_ROWS):
+        self.path = path
+        self.flush_rows = max(1, flush_rows)
+        self._rows: List[dict] = []
+        self._queue: "queue.Queue[Optional[List[dict]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='metrics-writer', daemon=True)
+        self._thread.start()
+
+    def record(self, row: dict):
+        self._rows.append(row)
+        if len(self._rows) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """모은 행을 기록 스레드로 넘김 (기록 완료를 기다리지 않음)"""
+        if self._rows:
+            self._queue.put(self._rows)
+            self._rows = []
+
+    def _run(self):
+        while True:
+            rows = self._queue.get()
+            if rows is None:
+                return
+            try:
+                self._write(rows)
+            except OSError as e:
+                print(f"지표 기록 실패: {e}")
+
+    def _write(self, rows: List[dict]):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=METRIC_COLUMNS, extrasaction='ignore')
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def close(self):
+        """남은 행을 모두 기록하고 스레드 종료"""
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,73 @@
+"""
+신경망 컴파일 캐시 모듈
+- 유전체의 노드/연결 내용 키 → 컴파일된 FeedForwardNetwork (LRU)
+- 엘리트처럼 바뀌지 않고 다음 세대로 넘어온 유전체는 다시 컴파일하지 않음
+- 적중/실패/축출 수 기록
+"""
+from collections import OrderedDict
+from typing import List, Tuple
+
+import neat
+
+from config import NETWORK_CACHE_SIZE
+
+
+def genome_key(genome: neat.DefaultGenome) -> Tuple[tuple, tuple]:
+    """
+    유전체 내용 키 (유전체 번호/적합도 제외, 노드와 연결 유전자만)
+    내용이 같은 유전체는 같은 신경망으로 컴파일됨
+    dict 키로 쓰면 해시가 겹쳐도 내용 비교로 구분 (문자열 직렬화보다 수 배 빠름)
+    """
+    nodes = tuple(sorted((key, node.bias, node.response, node.activation, node.aggregation)
+                         for key, node in genome.nodes.items()))
+    connections = tuple(sorted((key, conn.weight, conn.enabled)
+                               for key, conn in genome.connections.items()))
+    return nodes, connections
+
+
+class NetworkCache:
+    """컴파일된 신경망 LRU 캐시 (capacity 0 이면 캐시 안 함)"""
+
+    def __init__(self, capacity: int = NETWORK_CACHE_SIZE):
+        self.capacity = capacity
+        self._nets: 'OrderedDict[tuple, neat.nn.FeedForwardNetwork]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._nets)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, genome: neat.DefaultGenome, config: neat.Config) -> neat.nn.FeedForwardNetwork:
+        """유전체의 신경망 (캐시에 없으면 컴파일 후 저장)"""
+        if self.capacity <= 0:
+            self.misses += 1
+            return neat.nn.FeedForwardNetwork.create(genome, config)
+
+        key = genome_key(genome)
+        net = self._nets.get(key)
+        if net is not None:
+            self._nets.move_to_end(key)
+            self.hits += 1
+            return net
+
+        self.misses += 1
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        self._nets[key] = net
+        if len(self._nets) > self.capacity:
+            self._nets.popitem(last=False)
+            self.evictions += 1
+        return net
+
+    def create_all(self, genomes: List[neat.DefaultGenome],
+                   config: neat.Config) -> List[neat.nn.FeedForwardNetwork]:
+        """유전체 목록의 신경망 (순서 유지)"""
+        return [self.get(genome, config) for genome in genomes]
+
+    def clear(self):
+        self._nets.clear()
@@ -0,0 +1,129 @@
+"""
+병렬 유전체 평가 모듈
+- 한 세대의 신경망을 프로세스 풀에 나눠 헤드리스로 시뮬레이션 (컴파일은 부모의 캐시에서)
+- 차량끼리 상호작용하지 않으므로 결과는 직렬 평가와 동일
+  (바퀴 수 상한/정체 종료는 집단 전체의 최고 차량 기준이라 묶음마다 판정할 수 없어 적용하지 않음,
+   워커는 틱 예산과 전멸만으로 종료)
+- 워커별 진행 상황을 큐로 보고 (UI 표시용)
+"""
+import multiprocessing as mp
+import os
+import queue
+import neat
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import FPS
+from track import Track
+from simulation import GenerationRunner
+from termination import StopRule
+
+# 워커 프로세스 전역 상태
+_track: Optional[Track] = None
+_progress_queue = None
+
+
+def _init_worker(progress_queue, track: Track):
+    """워커 초기화 - 프로세스마다 부모와 같은 트랙 1개"""
+    global _track, _progress_queue
+    _track = track
+    _progress_queue = progress_queue
+
+
+def _evaluate_chunk(task) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    신경망 묶음 1개를 시뮬레이션 (틱 예산 소진 또는 묶음 전멸까지)
+    Returns: (묶음 번호, 환산 전 적합도, 종료 시 생존 여부, 생존 틱, 시뮬레이션 틱 수)
+    """
+    chunk_id, start_positions, nets, rule = task
+    runner = GenerationRunner(_track, start_positions, nets, rule=rule)
+
+    def report(ticks: int, alive_count: int):
+        _progress_queue.put((chunk_id, ticks, alive_count))
+
+    runner.run(report)
+    report(runner.ticks, runner.fleet.alive_count)
+
+    fleet = runner.fleet
+    return chunk_id, fleet.fitness.copy(), fleet.alive.copy(), fleet.time_alive.copy(), runner.ticks
+
+
+class WorkerPool:
+    """신경망 평가용 프로세스 풀"""
+
+    def __init__(self, workers: int, track: Optional[Track] = None):
+        self.workers = workers
+
+        # 워커마다 pygame 안내 문구가 출력되지 않도록
+        os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+        # pygame 창을 가진 부모를 fork 하지 않도록 spawn 사용
+        context = mp.get_context('spawn')
+        self.progress_queue = context.Queue()
+        self.pool = context.Pool(workers, initializer=_init_worker,
+                                 initargs=(self.progress_queue,
+                                           track if track is not None else Track()))
+
+    def evaluate(self, nets: List[neat.nn.FeedForwardNetwork],
+                 start_positions: List[Tuple[float, float, float]],
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 rule: Optional[StopRule] = None
+                 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        신경망 목록을 워커 수만큼 나눠 평가 (start_positions 는 신경망별 출발 위치)
+        on_progress(ticks, alive_count) 는 결과를 기다리는 동안 주기적으로 호출
+        rule 은 틱 예산만 사용하고 (바퀴 수 상한/정체 종료 제외), 세대 종료 이유를 rule.reason 에 기록
+        Returns: (환산 전 적합도, 종료 시 생존 여부, 생존 틱, 시뮬레이션 틱 수) - nets 순서
+        """
+        count = len(nets)
+        rule = rule if rule is not None else StopRule()
+        chunk_rule = StopRule(rule.tick_budget, lap_cap=0, plateau_ticks=0)
+        chunks = [slots for slots in np.array_split(np.arange(count), self.workers) if len(slots)]
+        tasks = [(chunk_id, [start_positions[i] for i in slots], [nets[i] for i in slots], chunk_rule)
+                 for chunk_id, slots in enumerate(chunks)]
+
+        pending = self.pool.map_async(_evaluate_chunk, tasks)
+
+        # 묶음별 최신 진행 상황 (틱, 생존 수)
+        progress: Dict[int, Tuple[int, int]] = {
+            chunk_id: (0, len(slots)) for chunk_id, slots in enumerate(chunks)
+        }
+        while not pending.ready():
+            self._drain_progress(progress)
+            if on_progress is not None:
+                ticks = min(t for t, _ in progress.values())
+                on_progress(ticks, sum(a for _, a in progress.values()))
+            pending.wait(1 / FPS)
+        self._drain_progress(progress)
+
+        fitness = np.zeros(count)
+        alive = np.zeros(count, dtype=bool)
+        time_alive = np.zeros(count)
+        ticks = 0
+        for chunk_id, chunk_fitness, chunk_alive, chunk_time, chunk_ticks in pending.get():
+            fitness[chunks[chunk_id]] = chunk_fitness
+            alive[chunks[chunk_id]] = chunk_alive
+            time_alive[chunks[chunk_id]] = chunk_time
+            ticks = max(ticks, chunk_ticks)
+
+        # 틱 예산과 전멸만 판정하므로 끝까지 산 차량이 있으면 예산 소진 (직렬 평가와 같은 판정)
+        rule.reason = 'budget' if alive.any() else 'extinct'
+
+        return fitness, alive, time_alive, ticks
+
+    def _drain_progress(self, progress: Dict[int, Tuple[int, int]]):
+        """큐에 쌓인 진행 보고를 모두 반영"""
+        while True:
+            try:
+                chunk_id, ticks, alive_count = self.progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            progress[chunk_id] = (ticks, alive_count)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def terminate(self):
+        self.pool.terminate()
+        self.pool.join()
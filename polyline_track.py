@@ -0,0 +1,270 @@
+"""
+파일 기반 트랙 모듈
+- 폴리라인/스플라인 경계 (외곽 + 내부) 를 JSON 파일에서 로드
+- 체크포인트, 시작 위치 지정 (생략 시 자동 생성)
+- 충돌 판정은 부호 거리장 (로드 시 계산, 디스크 캐시) 보간
+- 센서 레이캐스트는 균일 격자 선분 색인 ('analytic') 또는 거리장 스피어 트레이싱 ('sdf')
+"""
+import json
+import math
+import os
+import numpy as np
+import pygame
+from typing import List, Optional, Sequence, Tuple
+
+from config import CAR_WIDTH, TRACK_GRID_CELL, COLORS
+from segment_grid import SegmentGrid
+from track import Track
+
+
+def catmull_rom_loop(points: np.ndarray, samples: int) -> np.ndarray:
+    """닫힌 Catmull-Rom 스플라인 - 제어점 사이마다 samples 개 점 생성"""
+    p0 = np.roll(points, 1, axis=0)
+    p1 = points
+    p2 = np.roll(points, -1, axis=0)
+    p3 = np.roll(points, -2, axis=0)
+
+    t = (np.arange(samples) / samples)[None, :, None]
+    t2 = t * t
+    t3 = t2 * t
+    p0, p1, p2, p3 = (p[:, None, :] for p in (p0, p1, p2, p3))
+    curve = 0.5 * (2 * p1 + (p2 - p0) * t
+                   + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2
+                   + (3 * p1 - p0 - 3 * p2 + p3) * t3)
+    return curve.reshape(-1, 2)
+
+
+def _loop_segments(points: np.ndarray) -> np.ndarray:
+    """닫힌 폴리라인 → 선분 배열 (m, 4)"""
+    return np.hstack([points, np.roll(points, -1, axis=0)])
+
+
+def _resample_loop(points: np.ndarray, count: int) -> np.ndarray:
+    """닫힌 폴리라인을 호 길이 기준 등간격 count 개 점으로 재배치"""
+    closed = np.vstack([points, points[:1]])
+    lengths = np.hypot(*np.diff(closed, axis=0).T)
+    cumulative = np.concatenate(([0], np.cumsum(lengths)))
+    targets = np.arange(count) * cumulative[-1] / count
+    return np.column_stack([
+        np.interp(targets, cumulative, closed[:, 0]),
+        np.interp(targets, cumulative, closed[:, 1]),
+    ])
+
+
+def _nearest_points(points: np.ndarray, polyline: np.ndarray) -> np.ndarray:
+    """각 점에서 닫힌 폴리라인 위의 가장 가까운 점"""
+    seg = _loop_segments(polyline)
+    ax, ay, bx, by = (c[None, :] for c in seg.T)
+    px = points[:, 0:1]
+    py = points[:, 1:2]
+    ex = bx - ax
+    ey = by - ay
+    t = np.clip(((px - ax) * ex + (py - ay) * ey) / np.maximum(ex * ex + ey * ey, 1e-12), 0, 1)
+    qx = ax + t * ex
+    qy = ay + t * ey
+    nearest = np.argmin((px - qx) ** 2 + (py - qy) ** 2, axis=1)
+    rows = np.arange(len(points))
+    return np.column_stack([qx[rows, nearest], qy[rows, nearest]])
+
+
+class PolylineTrack(Track):
+    """
+    임의 형상 트랙
+    Track 과 같은 인터페이스 (충돌, 센서, 체크포인트, 시작 위치, 그리기) 를 제공하며
+    체크포인트 판정 로직은 Track 의 것을 그대로 사용
+    """
+
+    def __init__(self, outer: Sequence[Sequence[float]], inner: Sequence[Sequence[float]],
+                 checkpoints: Optional[Sequence] = None,
+                 start: Optional[Sequence[float]] = None,
+                 name: str = "",
+                 checkpoint_count: int = 12):
+        outer = np.asarray(outer, dtype=float)
+        inner = np.asarray(inner, dtype=float)
+        if len(outer) < 3 or len(inner) < 3:
+            raise ValueError("트랙 경계에는 최소 3개의 점이 필요합니다")
+
+        self.name = name
+        self._init_common()
+
+        # 트랙 경계 (그리기/색인용)
+        self.outer_points: List[Tuple[float, float]] = [tuple(p) for p in outer]
+        self.inner_points: List[Tuple[float, float]] = [tuple(p) for p in inner]
+        self.grid = SegmentGrid(np.vstack([_loop_segments(outer), _loop_segments(inner)]),
+                                TRACK_GRID_CELL)
+        
+        # 부호 거리장 (충돌 판정용, 로드 시 계산)
+        self.get_distance_field()
+
+        # 체크포인트 (주행 순서)
+        if checkpoints is None:
+            cp_outer = _resample_loop(outer, checkpoint_count)
+            cp_inner = _nearest_points(cp_outer, inner)
+            checkpoints = list(zip(cp_outer.tolist(), cp_inner.tolist()))
+        self._set_checkpoints(self._build_checkpoints(checkpoints))
+
+        # 중심선 (외곽 등간격 점과 가장 가까운 내부 점의 중점, 주행 방향)
+        samples = _resample_loop(outer, max(200, len(outer)))
+        self.centerline = (samples + _nearest_points(samples, inner)) / 2
+        if self._centerline_reversed():
+            self.centerline = self.centerline[::-1].copy()
+        self.track_width = float(np.mean(np.hypot(
+            self.checkpoint_lines[:, 0] - self.checkpoint_lines[:, 2],
+            self.checkpoint_lines[:, 1] - self.checkpoint_lines[:, 3],
+        )))
+
+        # 시작 위치/각도 (기본: 첫 체크포인트 중점에서 두 번째 체크포인트 방향)
+        if start is None:
+            (x0, y0), (x1, y1) = (self._checkpoint_mid(0), self._checkpoint_mid(1))
+            start = (x0, y0, math.degrees(math.atan2(-(y1 - y0), x1 - x0)))
+        self.start_x, self.start_y, self.start_angle = (float(v) for v in start)
+
+        # 중심선 진행도 (시작점 = 0)
+        self._build_progress(self.centerline)
+
+    def _build_checkpoints(self, checkpoints: Sequence) -> List[dict]:
+        result = []
+        for i, (outer_pt, inner_pt) in enumerate(checkpoints):
+            ox, oy = outer_pt
+            ix, iy = inner_pt
+            result.append({
+                'index': i,
+                'outer': (float(ox), float(oy)),
+                'inner': (float(ix), float(iy)),
+                'angle': math.degrees(math.atan2(-(iy - oy), ix - ox))
+            })
+        if len(result) < 2:
+            raise ValueError("체크포인트는 최소 2개가 필요합니다")
+        return result
+
+    def _checkpoint_mid(self, index: int) -> Tuple[float, float]:
+        ox, oy, ix, iy = self.checkpoint_lines[index]
+        return (ox + ix) / 2, (oy + iy) / 2
+
+    def _centerline_reversed(self) -> bool:
+        """중심선 진행 방향이 체크포인트 순서 (0 → 1) 와 반대인지"""
+        (x0, y0), (x1, y1) = self._checkpoint_mid(0), self._checkpoint_mid(1)
+        line = self.centerline
+        k = int(np.argmin(np.hypot(line[:, 0] - x0, line[:, 1] - y0)))
+        tx, ty = line[(k + 1) % len(line)] - line[k]
+        return tx * (x1 - x0) + ty * (y1 - y0) < 0
+
+    def _boundary_segments(self) -> np.ndarray:
+        return self.grid.segments
+
+    def is_on_track(self, x: float, y: float) -> bool:
+        """주어진 점이 트랙 위에 있는지 확인"""
+        return bool(self.is_on_track_batch(np.array([x]), np.array([y]))[0])
+
+    def is_on_track_batch(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        여러 점의 트랙 위 여부를 한 번에 판정 (정확)
+        거리장 보간값이 경계에서 충분히 멀면 부호로 바로 판정하고,
+        보간 오차 (격자 간격 x √2) 안쪽의 점만 격자 색인으로 정확히 판정
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        distances = self.distance_field.sample(xs, ys)
+        result = distances >= 0
+        near = np.abs(distances) <= self.distance_field.spacing * math.sqrt(2)
+        if near.any():
+            result[near] = self.grid.inside(xs[near], ys[near])
+        return result
+
+    def _ray_exit_distance(self, x: float, y: float, dx: float, dy: float) -> float:
+        """레이가 트랙 경계를 처음 만나는 거리 (격자 색인)"""
+        return float(self._ray_exit_distances(np.array([x]), np.array([y]),
+                                              np.array([dx]), np.array([dy]))[0])
+
+    def _ray_exit_distances(self, xs: np.ndarray, ys: np.ndarray,
+                            dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+        """_ray_exit_distance 벡터화 버전 - 모든 레이를 격자 DDA 로 동시에 진행"""
+        shape = np.shape(dx)
+        xs = np.broadcast_to(xs, shape).ravel()
+        ys = np.broadcast_to(ys, shape).ravel()
+        on_track = self.is_on_track_batch(xs, ys)
+        dist = self.grid.raycast(xs, ys, np.ravel(dx), np.ravel(dy), self.max_ray_distance)
+        return np.where(on_track, dist, 0.0).reshape(shape)
+
+    def get_start_positions(self, count: int) -> List[Tuple[float, float, float]]:
+        """
+        여러 차량의 시작 위치 반환 (시작점에서 중심선을 따라 뒤로 2대씩 배치)
+        Returns: [(x, y, angle), ...]
+        """
+        line = self.centerline
+        closed = np.vstack([line, line[:1]])
+        lengths = np.hypot(*np.diff(closed, axis=0).T)
+        cumulative = np.concatenate(([0], np.cumsum(lengths)))
+        total = cumulative[-1]
+
+        # 시작점에 가장 가까운 중심선 위치
+        start_index = int(np.argmin(np.hypot(line[:, 0] - self.start_x, line[:, 1] - self.start_y)))
+        start_s = cumulative[start_index]
+
+        positions = []
+        for i in range(count):
+            s = (start_s - (i // 2) * (CAR_WIDTH + 10)) % total
+            k = min(int(np.searchsorted(cumulative, s, side='right')) - 1, len(line) - 1)
+            t = (s - cumulative[k]) / lengths[k] if lengths[k] > 0 else 0
+            (ax, ay), (bx, by) = closed[k], closed[k + 1]
+            tx, ty = (bx - ax) / max(lengths[k], 1e-9), (by - ay) / max(lengths[k], 1e-9)
+
+            # 좌우 오프셋 적용 (진행 방향에 수직으로)
+            side_offset = ((i % 2) * 30 - 15) * 0.3
+            x = ax + (bx - ax) * t - ty * side_offset
+            y = ay + (by - ay) * t + tx * side_offset
+            positions.append((x, y, math.degrees(math.atan2(-ty, tx))))
+
+        return positions
+
+    def draw(self, surface: pygame.Surface):
+        """트랙 그리기"""
+        # 도로 (외곽 다각형) / 잔디 (내부 다각형)
+        pygame.draw.polygon(surface, COLORS['track_road'], self.outer_points)
+        pygame.draw.polygon(surface, COLORS['track_grass'], self.inner_points)
+
+        # 경계선
+        pygame.draw.lines(surface, COLORS['track_border'], True, self.outer_points, 3)
+        pygame.draw.lines(surface, COLORS['track_border'], True, self.inner_points, 3)
+
+        # 중앙선 (점선)
+        line = self.centerline
+        dash = max(1, len(line) // 60)
+        for i in range(0, len(line), dash * 2):
+            x1, y1 = line[i]
+            x2, y2 = line[(i + dash) % len(line)]
+            pygame.draw.line(surface, COLORS['track_center_line'],
+                             (int(x1), int(y1)), (int(x2), int(y2)), 2)
+
+        # 시작/결승선 (첫 체크포인트)
+        start = self.checkpoints[0]
+        pygame.draw.line(surface, (255, 255, 255), start['outer'], start['inner'], 4)
+
+
+def load_track(path: str) -> PolylineTrack:
+    """
+    JSON 트랙 파일 로드
+    {
+      "name": "...",
+      "outer": [[x, y], ...], "inner": [[x, y], ...],   # 닫힌 경계 (주행 방향 순서)
+      "spline": true, "spline_samples": 8,              # 선택: 경계를 Catmull-Rom 제어점으로 사용
+      "checkpoints": [[[ox, oy], [ix, iy]], ...],       # 선택: 주행 순서, 생략 시 자동 생성
+      "start": [x, y, angle]                            # 선택: 생략 시 첫 체크포인트
+    }
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    outer = np.asarray(data['outer'], dtype=float)
+    inner = np.asarray(data['inner'], dtype=float)
+    if data.get('spline', False):
+        samples = int(data.get('spline_samples', 8))
+        outer = catmull_rom_loop(outer, samples)
+        inner = catmull_rom_loop(inner, samples)
+
+    return PolylineTrack(
+        outer, inner,
+        checkpoints=data.get('checkpoints'),
+        start=data.get('start'),
+        name=data.get('name', os.path.splitext(os.path.basename(path))[0]),
+    )
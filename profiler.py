@@ -0,0 +1,117 @@
+"""
+구간별 성능 측정 모듈
+- 핫 패스 구간 (센서, 추론, 물리, 렌더링 등) 타이머
+- 최근 호출의 이동 평균 (화면 오버레이용)
+- 세대별 합계를 CSV / JSON Lines 파일로 기록
+- 비활성화 시 공용 빈 컨텍스트만 반환 (측정 비용 없음)
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, List, Optional
+
+# 측정 구간 (표시 순서)
+PHASES = ['sensors', 'inference', 'physics', 'best_car', 'render', 'panel']
+
+PHASE_LABELS = {
+    'sensors': "센서",
+    'inference': "추론",
+    'physics': "물리",
+    'best_car': "최고 차량 탐색",
+    'render': "트랙/차량 렌더링",
+    'panel': "패널 렌더링",
+}
+
+_NULL_SECTION = nullcontext()
+
+
+class _Section:
+    """with 블록 1회의 소요 시간을 Profiler 에 기록"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False, export_path: Optional[str] = None, window: int = 120):
+        self.enabled = enabled
+        self.export_path = export_path
+        self.window = window
+
+        # 최근 호출 소요 시간 (초) - 이동 평균용
+        self._recent: Dict[str, Deque[float]] = {}
+        # 현재 세대 누적 (초, 호출 수)
+        self._totals: Dict[str, float] = {}
+        self._calls: Dict[str, int] = {}
+
+    def section(self, name: str):
+        """측정 구간 컨텍스트 (비활성화 시 아무것도 하지 않음)"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def record(self, name: str, seconds: float):
+        recent = self._recent.get(name)
+        if recent is None:
+            recent = self._recent[name] = deque(maxlen=self.window)
+        recent.append(seconds)
+        self._totals[name] = self._totals.get(name, 0.0) + seconds
+        self._calls[name] = self._calls.get(name, 0) + 1
+
+    def averages(self) -> Dict[str, float]:
+        """구간별 최근 평균 소요 시간 (ms/호출)"""
+        return {name: sum(recent) / len(recent) * 1000
+                for name, recent in self._recent.items() if recent}
+
+    def end_generation(self, generation: int) -> List[dict]:
+        """
+        세대 합계 반환 후 초기화 (export_path 지정 시 파일에 추가)
+        Returns: [{generation, phase, calls, total_ms, mean_ms}, ...]
+        """
+        rows = []
+        for name in PHASES + sorted(set(self._totals) - set(PHASES)):
+            calls = self._calls.get(name, 0)
+            if calls == 0:
+                continue
+            total_ms = self._totals[name] * 1000
+            rows.append({
+                'generation': generation,
+                'phase': name,
+                'calls': calls,
+                'total_ms': round(total_ms, 3),
+                'mean_ms': round(total_ms / calls, 4),
+            })
+
+        self._totals.clear()
+        self._calls.clear()
+
+        if rows and self.export_path:
+            self._export(rows)
+        return rows
+
+    def _export(self, rows: List[dict]):
+        """확장자에 따라 CSV 또는 JSON Lines 로 추가 기록"""
+        if self.export_path.endswith('.csv'):
+            new_file = not os.path.exists(self.export_path) or os.path.getsize(self.export_path) == 0
+            with open(self.export_path, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(self.export_path, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps(row) + '\n')
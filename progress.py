@@ -0,0 +1,82 @@
+"""
+트랙 진행도 모듈 (중심선 호 길이)
+- 주행 방향 중심선을 호 길이로 매개화 (시작선 = 0)
+- 격자 칸마다 가장 가까운 중심선 선분 후보를 미리 계산해 위치 → 진행도를 O(1) 로 조회
+- 틱 사이 진행도 차이를 한 바퀴 길이로 감아 (wrap) 누적하면 역주행/바퀴 수까지 추적
+"""
+import numpy as np
+
+
+class ProgressMap:
+    def __init__(self, centerline: np.ndarray, bounds, cell_size: float, max_offset: float):
+        """
+        centerline: (n, 2) 닫힌 중심선 (주행 방향, 0번 점이 진행도 0)
+        bounds: (x0, y0, x1, y1) 조회 영역 (트랙 경계 상자)
+        max_offset: 트랙 위 점과 중심선 사이 최대 거리 (이보다 먼 칸은 근사 조회)
+        """
+        points = np.asarray(centerline, dtype=float)
+        ends = np.roll(points, -1, axis=0)
+        self.starts = points
+        self.vectors = ends - points
+        self.lengths = np.hypot(self.vectors[:, 0], self.vectors[:, 1])
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.lengths)[:-1]))
+        self.length = float(self.lengths.sum())
+        self.count = len(points)
+
+        x0, y0, x1, y1 = bounds
+        self.cell_size = float(cell_size)
+        self.origin_x = x0 - cell_size
+        self.origin_y = y0 - cell_size
+        self.cols = int(np.ceil((x1 - self.origin_x) / cell_size)) + 2
+        self.rows = int(np.ceil((y1 - self.origin_y) / cell_size)) + 2
+
+        # 칸마다 후보 선분: 칸 중심의 최단 거리 + 칸 대각선 이내
+        # (칸 안의 어떤 점이든 가장 가까운 선분은 이 안에 있음)
+        gx, gy = np.meshgrid(self.origin_x + (np.arange(self.cols) + 0.5) * cell_size,
+                             self.origin_y + (np.arange(self.rows) + 0.5) * cell_size)
+        centers = np.column_stack([gx.ravel(), gy.ravel()])
+        diagonal = cell_size * np.sqrt(2)
+        candidates = []
+        for start in range(0, len(centers), 1024):
+            chunk = centers[start:start + 1024]
+            _, d2 = self._project(chunk[:, 0:1], chunk[:, 1:2], np.arange(self.count)[None, :])
+            dist = np.sqrt(d2)
+            nearest = dist.min(axis=1, keepdims=True)
+            near = dist <= nearest + diagonal
+            # 트랙에서 먼 칸 (차량이 조회하지 않음) 은 가장 가까운 선분 하나만
+            near[nearest[:, 0] > max_offset + diagonal] = False
+            near[np.arange(len(chunk)), np.argmin(dist, axis=1)] = True
+            candidates.extend(np.flatnonzero(row) for row in near)
+
+        # (칸 수, 최대 후보 수) 배열 - 빈 자리는 첫 후보 반복
+        width = max(len(c) for c in candidates)
+        self.cell_candidates = np.array([np.resize(c, width) for c in candidates])
+
+    def _project(self, xs: np.ndarray, ys: np.ndarray, segments: np.ndarray):
+        """선분 위 투영 매개변수 t (0~1) 와 투영점까지 거리 제곱"""
+        sx = self.starts[segments, 0]
+        sy = self.starts[segments, 1]
+        vx = self.vectors[segments, 0]
+        vy = self.vectors[segments, 1]
+        t = np.clip(((xs - sx) * vx + (ys - sy) * vy) / np.maximum(self.lengths[segments] ** 2, 1e-12), 0, 1)
+        return t, (xs - sx - t * vx) ** 2 + (ys - sy - t * vy) ** 2
+
+    def lookup(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """위치의 진행도 (시작선부터 주행 방향 호 길이, 0 ~ length)"""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        cx = np.clip(((xs - self.origin_x) // self.cell_size).astype(int), 0, self.cols - 1)
+        cy = np.clip(((ys - self.origin_y) // self.cell_size).astype(int), 0, self.rows - 1)
+        candidates = self.cell_candidates[cy * self.cols + cx]
+
+        # 후보 선분 중 가장 가까운 곳에 투영
+        t, d2 = self._project(xs[..., None], ys[..., None], candidates)
+        best = np.argmin(d2, axis=-1)[..., None]
+        segment = np.take_along_axis(candidates, best, axis=-1)[..., 0]
+        t = np.take_along_axis(t, best, axis=-1)[..., 0]
+        return self.cumulative[segment] + t * self.lengths[segment]
+
+    def delta(self, previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """진행도 변화량 (시작선을 지나는 경우 감아서 -length/2 ~ length/2)"""
+        half = self.length / 2
+        return (current - previous + half) % self.length - half
@@ -0,0 +1,233 @@
+"""
+트랙 부호 거리장 모듈
+- 트랙 영역을 일정 간격 격자로 나눠 가장 가까운 경계까지의 거리를 미리 계산 (트랙 위 +, 밖 -)
+- 경계 선분이 같으면 디스크 캐시 (.npz) 를 재사용
+- 충돌 판정은 이중 선형 보간 1회, 센서는 거리만큼 건너뛰는 스피어 트레이싱
+"""
+import hashlib
+import os
+import numpy as np
+from typing import Optional
+
+from segment_grid import SegmentGrid
+
+# 캐시 파일 형식이 바뀌면 증가 (이전 캐시 무시)
+_CACHE_VERSION = 1
+
+
+def _segment_distances(px: np.ndarray, py: np.ndarray, segments: np.ndarray) -> np.ndarray:
+    """각 점에서 가장 가까운 선분까지의 거리 (점 x 선분 전체 비교)"""
+    ax, ay, bx, by = (c[None, :] for c in segments.T)
+    ex = bx - ax
+    ey = by - ay
+    length2 = np.maximum(ex * ex + ey * ey, 1e-12)
+    px = px[:, None]
+    py = py[:, None]
+    t = np.clip(((px - ax) * ex + (py - ay) * ey) / length2, 0, 1)
+    return np.sqrt(np.min((px - ax - t * ex) ** 2 + (py - ay - t * ey) ** 2, axis=1))
+
+
+class DistanceField:
+    def __init__(self, values: np.ndarray, origin_x: float, origin_y: float, spacing: float):
+        """
+        values: (rows, cols) 부호 거리 (트랙 위 양수)
+        (origin_x, origin_y) 가 values[0, 0] 의 위치, spacing 은 격자 간격 (px)
+        """
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        self.origin_x = float(origin_x)
+        self.origin_y = float(origin_y)
+        self.spacing = float(spacing)
+        self.rows, self.cols = self.values.shape
+        self._flat = self.values.astype(float).ravel()
+        self._rows = self.values.astype(float).tolist()  # 단일 점 조회용
+
+        # 스피어 트레이싱 통계 (레이당 평균 단계 수 확인용)
+        self.traced_rays = 0
+        self.trace_steps = 0
+
+    @classmethod
+    def bake(cls, segments: np.ndarray, spacing: float, chunk: int = 2048) -> "DistanceField":
+        """닫힌 경계 선분들로부터 거리장 계산 (짝홀 규칙 내부 = 트랙 위)"""
+        segments = np.asarray(segments, dtype=float)
+        grid = SegmentGrid(segments, max(spacing * 8, 20))
+
+        # 경계 바깥으로 한 칸 여유
+        x1, y1, x2, y2 = segments.T
+        origin_x = min(x1.min(), x2.min()) - spacing
+        origin_y = min(y1.min(), y2.min()) - spacing
+        cols = int(np.ceil((max(x1.max(), x2.max()) - origin_x) / spacing)) + 2
+        rows = int(np.ceil((max(y1.max(), y2.max()) - origin_y) / spacing)) + 2
+
+        gx, gy = np.meshgrid(origin_x + np.arange(cols) * spacing,
+                             origin_y + np.arange(rows) * spacing)
+        px = gx.ravel()
+        py = gy.ravel()
+
+        distances = np.empty(len(px))
+        for start in range(0, len(px), chunk):
+            end = start + chunk
+            distances[start:end] = _segment_distances(px[start:end], py[start:end], segments)
+        signed = np.where(grid.inside(px, py), distances, -distances)
+
+        return cls(signed.reshape(rows, cols), origin_x, origin_y, spacing)
+
+    @classmethod
+    def load_or_bake(cls, segments: np.ndarray, spacing: float,
+                     cache_dir: Optional[str] = None) -> "DistanceField":
+        """캐시에 같은 경계/간격의 거리장이 있으면 불러오고, 없으면 계산 후 저장"""
+        if not cache_dir:
+            return cls.bake(segments, spacing)
+
+        path = os.path.join(cache_dir, f"sdf_{cls.cache_key(segments, spacing)}.npz")
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    origin_x, origin_y, cached_spacing = data['header']
+                    return cls(data['values'], origin_x, origin_y, cached_spacing)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"거리장 캐시를 읽지 못해 다시 계산합니다: {e}")
+
+        field = cls.bake(segments, spacing)
+        field.save(path)
+        return field
+
+    @staticmethod
+    def cache_key(segments: np.ndarray, spacing: float) -> str:
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(segments, dtype=np.float64).tobytes())
+        digest.update(f"{float(spacing)!r}/{_CACHE_VERSION}".encode())
+        return digest.hexdigest()[:16]
+
+    def save(self, path: str):
+        """npz 로 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, 'wb') as f:
+            np.savez(f, values=self.values,
+                     header=np.array([self.origin_x, self.origin_y, self.spacing]))
+        os.replace(temp, path)
+
+    def sample(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """점들의 부호 거리 (이중 선형 보간, 격자 밖은 가장자리 값)"""
+        gx = np.clip((np.asarray(xs, dtype=float) - self.origin_x) / self.spacing, 0, self.cols - 1.001)
+        gy = np.clip((np.asarray(ys, dtype=float) - self.origin_y) / self.spacing, 0, self.rows - 1.001)
+        x0 = gx.astype(int)
+        y0 = gy.astype(int)
+        fx = gx - x0
+        fy = gy - y0
+
+        v = self._flat
+        i = y0 * self.cols + x0
+        top = v.take(i) * (1 - fx) + v.take(i + 1) * fx
+        bottom = v.take(i + self.cols) * (1 - fx) + v.take(i + self.cols + 1) * fx
+        return top * (1 - fy) + bottom * fy
+
+    def sample_one(self, x: float, y: float) -> float:
+        """sample 의 단일 점 버전 (배열 생성 비용 없음)"""
+        gx = min(max((x - self.origin_x) / self.spacing, 0.0), self.cols - 1.001)
+        gy = min(max((y - self.origin_y) / self.spacing, 0.0), self.rows - 1.001)
+        x0 = int(gx)
+        y0 = int(gy)
+        fx = gx - x0
+        fy = gy - y0
+
+        row0 = self._rows[y0]
+        row1 = self._rows[y0 + 1]
+        top = row0[x0] * (1 - fx) + row0[x0 + 1] * fx
+        bottom = row1[x0] * (1 - fx) + row1[x0 + 1] * fx
+        return top * (1 - fy) + bottom * fy
+
+    def contains(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """트랙 위 여부 (부호 거리 >= 0)"""
+        return self.sample(xs, ys) >= 0
+
+    def trace(self, xs: np.ndarray, ys: np.ndarray, dx: np.ndarray, dy: np.ndarray,
+              max_dist: float, epsilon: float = 0.5, max_steps: int = 16) -> np.ndarray:
+        """
+        스피어 트레이싱 - 현재 위치의 거리만큼 전진, 거리가 epsilon 미만이면 경계 후보
+        경계를 스치기만 하는 레이는 후보 지점 바로 앞이 여전히 트랙 위이므로 계속 진행
+        벽과 나란히 가는 레이는 max_steps 이후 남은 구간을 한 번에 촘촘히 검사
+        dx, dy 는 단위 방향 벡터, 시작점이 트랙 밖이면 0
+        """
+        shape = np.shape(dx)
+        xs = np.broadcast_to(xs, shape).ravel()
+        ys = np.broadcast_to(ys, shape).ravel()
+        dx = np.ravel(dx)
+        dy = np.ravel(dy)
+        min_step = 2 * epsilon
+
+        t = np.zeros(len(dx))
+        d = self.sample(xs, ys)
+        result = np.where(d < 0, 0.0, max_dist)
+        active = np.flatnonzero(d >= 0)
+        self.trace_steps += len(dx)
+        steps = 0
+
+        while len(active) and steps < max_steps:
+            # 경계 후보: 한 걸음 앞이 트랙 밖이면 충돌
+            near = active[d[active] < epsilon]
+            if len(near):
+                ahead = t[near] + min_step
+                crossed = self.sample(xs[near] + dx[near] * ahead, ys[near] + dy[near] * ahead) < 0
+                self.trace_steps += len(near)
+                result[near[crossed]] = t[near[crossed]]
+                keep = np.ones(len(dx), dtype=bool)
+                keep[near[crossed]] = False
+                active = active[keep[active]]
+
+            t[active] += np.maximum(d[active], min_step)
+            far = t[active] >= max_dist
+            active = active[~far]
+
+            d[active] = self.sample(xs[active] + dx[active] * t[active],
+                                    ys[active] + dy[active] * t[active])
+            self.trace_steps += len(active)
+            steps += 1
+
+        if len(active):
+            result[active] = self._march(xs[active], ys[active], dx[active], dy[active],
+                                         t[active], max_dist, min_step)
+        self.traced_rays += len(dx)
+        return np.minimum(result, max_dist).reshape(shape)
+
+    def trace_one(self, x: float, y: float, dx: float, dy: float,
+                  max_dist: float, epsilon: float = 0.5, max_steps: int = 64) -> float:
+        """trace 의 단일 레이 버전 (순수 파이썬, 차량별 센서 업데이트용)"""
+        min_step = 2 * epsilon
+        d = self.sample_one(x, y)
+        if d < 0:
+            return 0.0
+
+        t = 0.0
+        for _ in range(max_steps):
+            if d < epsilon:
+                ahead = t + min_step
+                if self.sample_one(x + dx * ahead, y + dy * ahead) < 0:
+                    return t
+            t += max(d, min_step)
+            if t >= max_dist:
+                return max_dist
+            d = self.sample_one(x + dx * t, y + dy * t)
+
+        # 벽과 나란히 가는 레이: 남은 구간을 촘촘히 검사
+        while t < max_dist:
+            if self.sample_one(x + dx * t, y + dy * t) < 0:
+                return max(t - min_step, 0.0)
+            t += min_step
+        return max_dist
+
+    def _march(self, xs: np.ndarray, ys: np.ndarray, dx: np.ndarray, dy: np.ndarray,
+               start: np.ndarray, max_dist: float, step: float) -> np.ndarray:
+        """start 부터 max_dist 까지 step 간격으로 검사해 트랙을 벗어나기 직전 거리 반환"""
+        t = start[:, None] + np.arange(0, max_dist, step)[None, :]
+        in_range = t < max_dist
+        # 사거리 밖 칸은 벽으로 보지 않음 (벽이 없으면 정확히 max_dist)
+        off = (self.sample(xs[:, None] + dx[:, None] * t, ys[:, None] + dy[:, None] * t) < 0) & in_range
+        first = np.argmax(off, axis=1)
+        hit = off[np.arange(len(first)), first]
+        self.trace_steps += int(np.sum(np.where(hit, first + 1, in_range.sum(axis=1))))
+        return np.where(hit, t[np.arange(len(first)), np.maximum(first - 1, 0)], max_dist)
+
+    def steps_per_ray(self) -> float:
+        """누적 레이당 평균 샘플 수"""
+        return self.trace_steps / self.traced_rays if self.traced_rays else 0.0
@@ -0,0 +1,190 @@
+"""
+선분 공간 색인 모듈 (균일 격자)
+- 경계 선분을 격자 칸에 등록 (CSR 배열)
+- 칸 중심의 내부/외부 판정을 미리 계산해 점 판정은 칸 안의 선분만 검사
+- 레이캐스트는 모든 레이를 동시에 격자 DDA 로 진행
+경계 선분이 수천 개여도 질의 비용은 칸당 선분 수에만 비례
+"""
+import numpy as np
+from typing import Tuple
+
+
+def _cross(ax, ay, bx, by):
+    return ax * by - ay * bx
+
+
+class SegmentGrid:
+    def __init__(self, segments: np.ndarray, cell_size: float):
+        """
+        segments: (m, 4) 선분 배열 [(x1, y1, x2, y2), ...]
+        닫힌 경계들의 선분이면 짝홀 규칙으로 내부를 판정 (구멍 포함)
+        """
+        self.segments = np.asarray(segments, dtype=float)
+        self.cell_size = float(cell_size)
+
+        x1, y1, x2, y2 = self.segments.T
+        self.origin_x = min(x1.min(), x2.min()) - self.cell_size
+        self.origin_y = min(y1.min(), y2.min()) - self.cell_size
+        self.cols = int((max(x1.max(), x2.max()) - self.origin_x) // self.cell_size) + 2
+        self.rows = int((max(y1.max(), y2.max()) - self.origin_y) // self.cell_size) + 2
+
+        self._build_cells()
+        self.cell_inside = self._classify_cell_centers()
+
+    def _build_cells(self):
+        """선분이 걸친 칸 (선분 경계 상자 기준) 에 선분 번호 등록"""
+        x1, y1, x2, y2 = self.segments.T
+        cs = self.cell_size
+        cx0 = ((np.minimum(x1, x2) - self.origin_x) // cs).astype(int)
+        cx1 = ((np.maximum(x1, x2) - self.origin_x) // cs).astype(int)
+        cy0 = ((np.minimum(y1, y2) - self.origin_y) // cs).astype(int)
+        cy1 = ((np.maximum(y1, y2) - self.origin_y) // cs).astype(int)
+
+        cells = []
+        owners = []
+        for i in range(len(self.segments)):
+            for cy in range(cy0[i], cy1[i] + 1):
+                for cx in range(cx0[i], cx1[i] + 1):
+                    cells.append(cy * self.cols + cx)
+                    owners.append(i)
+
+        cells = np.array(cells, dtype=int)
+        owners = np.array(owners, dtype=int)
+        order = np.argsort(cells, kind='stable')
+
+        self.cell_segments = owners[order]
+        counts = np.bincount(cells, minlength=self.rows * self.cols)
+        self.cell_start = np.concatenate(([0], np.cumsum(counts)))
+
+    def _classify_cell_centers(self) -> np.ndarray:
+        """칸 중심마다 짝홀 규칙 내부 여부 (행 단위 스캔라인)"""
+        x1, y1, x2, y2 = self.segments.T
+        centers_x = self.origin_x + (np.arange(self.cols) + 0.5) * self.cell_size
+        inside = np.zeros(self.rows * self.cols, dtype=bool)
+
+        for row in range(self.rows):
+            yc = self.origin_y + (row + 0.5) * self.cell_size
+            spans = (y1 <= yc) != (y2 <= yc)
+            crossings = np.sort(x1[spans] + (yc - y1[spans]) * (x2[spans] - x1[spans]) / (y2[spans] - y1[spans]))
+            # 중심 오른쪽 교차 수가 홀수면 내부
+            right = len(crossings) - np.searchsorted(crossings, centers_x, side='right')
+            inside[row * self.cols:(row + 1) * self.cols] = right % 2 == 1
+
+        return inside
+
+    def cell_of(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """점이 속한 칸 (열, 행, 칸 번호, 격자 내부 여부)"""
+        cx = np.floor((xs - self.origin_x) / self.cell_size).astype(int)
+        cy = np.floor((ys - self.origin_y) / self.cell_size).astype(int)
+        valid = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        return cx, cy, np.where(valid, cy * self.cols + cx, 0), valid
+
+    def _gather(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """칸 목록의 등록 선분 펼치기 → (질의 번호, 선분 번호)"""
+        starts = self.cell_start[cells]
+        counts = self.cell_start[cells + 1] - starts
+        queries = np.repeat(np.arange(len(cells)), counts)
+        offsets = np.arange(len(queries)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return queries, self.cell_segments[np.repeat(starts, counts) + offsets]
+
+    def inside(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        점들의 내부 여부
+        칸 중심 → 점 선분이 칸 안의 경계와 교차하는 횟수로 중심의 판정을 뒤집음
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        shape = xs.shape
+        xs = xs.ravel()
+        ys = ys.ravel()
+
+        cx, cy, cells, valid = self.cell_of(xs, ys)
+        result = self.cell_inside[cells] & valid
+
+        queries, segs = self._gather(cells[valid])
+        if len(queries):
+            points = np.flatnonzero(valid)[queries]
+            ax = self.origin_x + (cx[points] + 0.5) * self.cell_size
+            ay = self.origin_y + (cy[points] + 0.5) * self.cell_size
+            bx = xs[points] - ax
+            by = ys[points] - ay
+            sx1, sy1, sx2, sy2 = self.segments[segs].T
+            ex = sx2 - sx1
+            ey = sy2 - sy1
+            wx = sx1 - ax
+            wy = sy1 - ay
+
+            denom = _cross(bx, by, ex, ey)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                t = _cross(wx, wy, ex, ey) / denom
+                u = _cross(wx, wy, bx, by) / denom
+            # 선분 끝점은 반열린 구간 [0, 1) 로 한 번만 셈
+            hits = (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u < 1)
+            flips = np.bincount(points[hits], minlength=len(xs)) % 2 == 1
+            result ^= flips
+
+        return result.reshape(shape)
+
+    def raycast(self, xs: np.ndarray, ys: np.ndarray, dx: np.ndarray, dy: np.ndarray,
+                max_dist: float) -> np.ndarray:
+        """
+        레이들이 처음 만나는 경계까지의 거리 (없으면 max_dist)
+        dx, dy 는 단위 방향 벡터, 모든 레이를 칸 단위로 동시에 진행
+        """
+        xs = np.asarray(xs, dtype=float).ravel()
+        ys = np.asarray(ys, dtype=float).ravel()
+        dx = np.asarray(dx, dtype=float).ravel()
+        dy = np.asarray(dy, dtype=float).ravel()
+        cs = self.cell_size
+
+        cx, cy, _, active = self.cell_of(xs, ys)
+        best = np.full(len(xs), float(max_dist))
+
+        # DDA 초기값: 다음 칸 경계까지의 거리와 칸 하나를 지나는 거리
+        step_x = np.sign(dx).astype(int)
+        step_y = np.sign(dy).astype(int)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            next_x = self.origin_x + (cx + (dx > 0)) * cs
+            next_y = self.origin_y + (cy + (dy > 0)) * cs
+            t_max_x = np.where(dx != 0, (next_x - xs) / dx, np.inf)
+            t_max_y = np.where(dy != 0, (next_y - ys) / dy, np.inf)
+            t_delta_x = np.where(dx != 0, cs / np.abs(dx), np.inf)
+            t_delta_y = np.where(dy != 0, cs / np.abs(dy), np.inf)
+
+        while active.any():
+            rays = np.flatnonzero(active)
+            queries, segs = self._gather(cy[rays] * self.cols + cx[rays])
+
+            if len(queries):
+                r = rays[queries]
+                sx1, sy1, sx2, sy2 = self.segments[segs].T
+                ex = sx2 - sx1
+                ey = sy2 - sy1
+                wx = sx1 - xs[r]
+                wy = sy1 - ys[r]
+                denom = _cross(dx[r], dy[r], ex, ey)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    t = _cross(wx, wy, ex, ey) / denom
+                    u = _cross(wx, wy, dx[r], dy[r]) / denom
+                hit = (denom != 0) & (t >= 0) & (u >= 0) & (u <= 1)
+                np.minimum.at(best, r[hit], t[hit])
+
+            # 현재 칸 안에서 교점을 찾았거나 최대 거리를 넘으면 종료
+            t_exit = np.minimum(t_max_x[rays], t_max_y[rays])
+            done = (best[rays] <= t_exit) | (t_exit >= max_dist)
+
+            # 다음 칸으로 이동
+            move = rays[~done]
+            along_x = t_max_x[move] < t_max_y[move]
+            mx = move[along_x]
+            my = move[~along_x]
+            cx[mx] += step_x[mx]
+            t_max_x[mx] += t_delta_x[mx]
+            cy[my] += step_y[my]
+            t_max_y[my] += t_delta_y[my]
+
+            active[rays[done]] = False
+            inside_grid = (cx[move] >= 0) & (cx[move] < self.cols) & (cy[move] >= 0) & (cy[move] < self.rows)
+            active[move[~inside_grid]] = False
+
+        return best
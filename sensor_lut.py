@@ -0,0 +1,318 @@
+"""
+센서 룩업 테이블 모듈
+- 정적 트랙에서 센서 값은 위치와 레이 방향에만 의존
+- (y, x, 레이 방향) 격자마다 SENSOR_MAX_LENGTH 로 제한한 거리를 정수로 양자화해 저장
+- 센서 오프셋 (-90 ~ 90도) 은 모두 같은 절대 방향 테이블을 공유
+- 프로세스 풀로 한 번 생성 → .npy 로 저장 → 메모리 맵으로 읽고 삼선형 보간
+
+사용법: python sensor_lut.py [--track PATH] [--validate N]
+"""
+import argparse
+import hashlib
+import math
+import multiprocessing as mp
+import os
+import time
+import numpy as np
+from typing import Optional, Tuple
+
+from config import (
+    SENSOR_MAX_LENGTH, SENSOR_LUT_SPACING, SENSOR_LUT_ANGLES, SENSOR_LUT_DTYPE
+)
+
+# 테이블 형식이 바뀌면 증가 (이전 파일 무시)
+_LUT_VERSION = 1
+
+# 워커 프로세스 전역 상태
+_track = None
+
+
+def _init_worker(track):
+    global _track
+    _track = track
+
+
+def _build_angles(task) -> Tuple[int, np.ndarray]:
+    """방향 묶음 1개의 테이블 조각 계산 → (시작 방향 번호, (rows, cols, k) 양자화 값)"""
+    start, directions, xs, ys, max_length, levels, dtype = task
+    shape = (xs.size, len(directions))
+    rad = np.radians(directions)
+    dx = np.broadcast_to(np.cos(rad)[None, :], shape)
+    dy = np.broadcast_to(-np.sin(rad)[None, :], shape)  # pygame 좌표계
+    px = np.broadcast_to(xs.ravel()[:, None], shape)
+    py = np.broadcast_to(ys.ravel()[:, None], shape)
+
+    dist = np.minimum(_track._ray_exit_distances(px, py, dx, dy), max_length)
+    dist = _fill_off_track(dist.reshape(*xs.shape, len(directions)),
+                           _track.is_on_track_batch(xs, ys))
+    return start, np.rint(dist / max_length * levels).astype(dtype)
+
+
+def _fill_off_track(dist: np.ndarray, on_track: np.ndarray, passes: int = 2) -> np.ndarray:
+    """
+    트랙 밖 격자점 (거리 0) 을 이웃한 트랙 위 격자점 값으로 채움
+    경계 근처 보간이 0 쪽으로 끌려가지 않도록 - 실제 조회는 트랙 위에서만 일어남
+    """
+    dist = dist.copy()
+    filled = on_track.copy()
+    for _ in range(passes):
+        total = np.zeros_like(dist)
+        count = np.zeros(filled.shape)
+        for shift_y, shift_x in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+            src = np.roll(filled, (shift_y, shift_x), axis=(0, 1))
+            total += np.roll(dist, (shift_y, shift_x), axis=(0, 1)) * src[..., None]
+            count += src
+        grow = ~filled & (count > 0)
+        dist[grow] = total[grow] / count[grow, None]
+        filled |= grow
+    return dist
+
+
+class SensorLUT:
+    def __init__(self, table: np.ndarray, origin_x: float, origin_y: float, spacing: float,
+                 max_length: float = SENSOR_MAX_LENGTH, path: Optional[str] = None):
+        """
+        table: (rows, cols, angles) 양자화된 거리 (0 ~ dtype 최댓값 = 0 ~ max_length)
+        (origin_x, origin_y) 가 table[0, 0] 의 위치, 방향 k 는 k * 360 / angles 도
+        """
+        self.table = table
+        self.origin_x = float(origin_x)
+        self.origin_y = float(origin_y)
+        self.spacing = float(spacing)
+        self.max_length = float(max_length)
+        self.path = path
+
+        self.rows, self.cols, self.angles = table.shape
+        # 조회용 일반 배열 뷰 (메모리 맵 서브클래스 오버헤드 없이 같은 버퍼 사용)
+        self._flat = np.asarray(table).reshape(-1)
+        self.angle_step = 360.0 / self.angles
+        self.scale = self.max_length / np.iinfo(table.dtype).max
+
+    # --- 생성 / 저장 ---
+
+    @staticmethod
+    def layout(track, spacing: float) -> Tuple[float, float, int, int]:
+        """트랙 경계를 덮는 격자 (origin_x, origin_y, rows, cols)"""
+        x1, y1, x2, y2 = track._boundary_segments().T
+        origin_x = math.floor(min(x1.min(), x2.min())) - spacing
+        origin_y = math.floor(min(y1.min(), y2.min())) - spacing
+        cols = int(math.ceil((max(x1.max(), x2.max()) - origin_x) / spacing)) + 2
+        rows = int(math.ceil((max(y1.max(), y2.max()) - origin_y) / spacing)) + 2
+        return origin_x, origin_y, rows, cols
+
+    @staticmethod
+    def cache_key(track, spacing: float, angles: int, dtype: str, max_length: float) -> str:
+        digest = hashlib.sha1()
+        digest.update(np.ascontiguousarray(track._boundary_segments(), dtype=np.float64).tobytes())
+        digest.update(f"{type(track).__name__}/{float(spacing)!r}/{angles}/{dtype}/"
+                      f"{float(max_length)!r}/{_LUT_VERSION}".encode())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def build(cls, track, spacing: float = SENSOR_LUT_SPACING, angles: int = SENSOR_LUT_ANGLES,
+              dtype: str = SENSOR_LUT_DTYPE, max_length: float = SENSOR_MAX_LENGTH,
+              path: Optional[str] = None, workers: Optional[int] = None) -> "SensorLUT":
+        """
+        트랙의 정확한 레이캐스트 (_ray_exit_distances) 로 테이블 생성
+        path 가 있으면 .npy 파일에 직접 기록 (임시 파일에 쓴 뒤 교체) 후 메모리 맵으로 반환
+        """
+        origin_x, origin_y, rows, cols = cls.layout(track, spacing)
+        gx, gy = np.meshgrid(origin_x + np.arange(cols) * spacing,
+                             origin_y + np.arange(rows) * spacing)
+        directions = np.arange(angles) * 360.0 / angles
+        levels = np.iinfo(dtype).max
+
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            temp = f"{path}.{os.getpid()}.tmp.npy"
+            table = np.lib.format.open_memmap(temp, mode='w+', dtype=dtype, shape=(rows, cols, angles))
+        else:
+            table = np.empty((rows, cols, angles), dtype=dtype)
+
+        # 방향 묶음 단위로 나눠 계산
+        workers = workers or os.cpu_count() or 1
+        chunk = max(1, angles // (workers * 4))
+        tasks = [(start, directions[start:start + chunk], gx, gy, max_length, levels, dtype)
+                 for start in range(0, angles, chunk)]
+
+        if workers > 1 and len(tasks) > 1:
+            os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+            context = mp.get_context('spawn')
+            with context.Pool(workers, initializer=_init_worker, initargs=(track,)) as pool:
+                for start, values in pool.imap_unordered(_build_angles, tasks):
+                    table[:, :, start:start + values.shape[2]] = values
+        else:
+            _init_worker(track)
+            for task in tasks:
+                start, values = _build_angles(task)
+                table[:, :, start:start + values.shape[2]] = values
+
+        if not path:
+            return cls(table, origin_x, origin_y, spacing, max_length)
+
+        table.flush()
+        del table
+        os.replace(temp, path)
+        return cls.open(path, track, spacing, max_length)
+
+    @classmethod
+    def open(cls, path: str, track, spacing: float,
+             max_length: float = SENSOR_MAX_LENGTH) -> "SensorLUT":
+        """저장된 테이블을 메모리 맵으로 열기 (격자 위치는 트랙에서 다시 계산)"""
+        origin_x, origin_y, rows, cols = cls.layout(track, spacing)
+        table = np.load(path, mmap_mode='r')
+        if table.shape[:2] != (rows, cols):
+            raise ValueError(f"센서 룩업 테이블 크기가 트랙과 맞지 않습니다: {path}")
+        return cls(table, origin_x, origin_y, spacing, max_length, path)
+
+    @classmethod
+    def load_or_build(cls, track, cache_dir: Optional[str],
+                      spacing: float = SENSOR_LUT_SPACING, angles: int = SENSOR_LUT_ANGLES,
+                      dtype: str = SENSOR_LUT_DTYPE, max_length: float = SENSOR_MAX_LENGTH,
+                      workers: Optional[int] = None) -> "SensorLUT":
+        """캐시 폴더에 같은 트랙/설정의 테이블이 있으면 열고, 없으면 생성"""
+        if not cache_dir:
+            return cls.build(track, spacing, angles, dtype, max_length, workers=workers)
+
+        key = cls.cache_key(track, spacing, angles, dtype, max_length)
+        path = os.path.join(cache_dir, f"lut_{key}.npy")
+        if os.path.exists(path):
+            try:
+                return cls.open(path, track, spacing, max_length)
+            except (OSError, ValueError) as e:
+                print(f"센서 룩업 테이블을 읽지 못해 다시 생성합니다: {e}")
+
+        print(f"센서 룩업 테이블 생성 중... ({path})")
+        start = time.perf_counter()
+        lut = cls.build(track, spacing, angles, dtype, max_length, path=path, workers=workers)
+        print(f"센서 룩업 테이블 생성 완료: {lut.nbytes / 1e6:.1f}MB, "
+              f"{time.perf_counter() - start:.1f}초")
+        return lut
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    # 메모리 맵 테이블은 경로만 넘기고 워커에서 다시 연다 (페이지 캐시 공유)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.path:
+            state['table'] = None
+            state['_flat'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.table is None:
+            self.table = np.load(self.path, mmap_mode='r')
+            self._flat = np.asarray(self.table).reshape(-1)
+
+    # --- 조회 ---
+
+    def lookup(self, xs: np.ndarray, ys: np.ndarray, directions: np.ndarray) -> np.ndarray:
+        """위치 (xs, ys) 에서 절대 방향 directions (도) 의 센서 거리 (삼선형 보간)"""
+        gx = np.clip((np.asarray(xs, dtype=float) - self.origin_x) / self.spacing, 0, self.cols - 1.001)
+        gy = np.clip((np.asarray(ys, dtype=float) - self.origin_y) / self.spacing, 0, self.rows - 1.001)
+        ga = np.mod(directions, 360.0) / self.angle_step
+        x0 = gx.astype(int)
+        y0 = gy.astype(int)
+        a0 = ga.astype(int) % self.angles
+        a1 = (a0 + 1) % self.angles
+        fx = gx - x0
+        fy = gy - y0
+        fa = ga - np.floor(ga)
+
+        flat = self._flat
+        row = self.cols * self.angles
+        base = y0 * row + x0 * self.angles
+        result = 0.0
+        for offset, weight in ((0, (1 - fy) * (1 - fx)), (self.angles, (1 - fy) * fx),
+                               (row, fy * (1 - fx)), (row + self.angles, fy * fx)):
+            cell = base + offset
+            result = result + weight * (flat.take(cell + a0) * (1 - fa) + flat.take(cell + a1) * fa)
+        return result * self.scale
+
+    def lookup_one(self, x: float, y: float, direction: float) -> float:
+        """lookup 의 단일 레이 버전 (차량별 센서 업데이트용)"""
+        gx = min(max((x - self.origin_x) / self.spacing, 0.0), self.cols - 1.001)
+        gy = min(max((y - self.origin_y) / self.spacing, 0.0), self.rows - 1.001)
+        ga = (direction % 360.0) / self.angle_step
+        x0 = int(gx)
+        y0 = int(gy)
+        a0 = int(ga) % self.angles
+        a1 = (a0 + 1) % self.angles
+        fx = gx - x0
+        fy = gy - y0
+        fa = ga - math.floor(ga)
+
+        item = self._flat.item
+        row = self.cols * self.angles
+        base = y0 * row + x0 * self.angles
+        result = 0.0
+        for offset, weight in ((0, (1 - fy) * (1 - fx)), (self.angles, (1 - fy) * fx),
+                               (row, fy * (1 - fx)), (row + self.angles, fy * fx)):
+            cell = base + offset
+            result += weight * (item(cell + a0) * (1 - fa) + item(cell + a1) * fa)
+        return result * self.scale
+
+    # --- 검증 ---
+
+    def validate(self, track, samples: int = 100000, seed: int = 0) -> dict:
+        """
+        트랙 위 임의 위치/방향에서 정확한 레이캐스트와 비교
+        Returns: {samples, max, mean, p99} 오차 (px)
+        """
+        rng = np.random.default_rng(seed)
+        xs = np.empty(0)
+        ys = np.empty(0)
+        x_max = self.origin_x + (self.cols - 1) * self.spacing
+        y_max = self.origin_y + (self.rows - 1) * self.spacing
+        while len(xs) < samples:
+            px = rng.uniform(self.origin_x, x_max, samples)
+            py = rng.uniform(self.origin_y, y_max, samples)
+            on_track = track.is_on_track_batch(px, py)
+            xs = np.concatenate([xs, px[on_track]])
+            ys = np.concatenate([ys, py[on_track]])
+        xs = xs[:samples]
+        ys = ys[:samples]
+        directions = rng.uniform(0, 360, samples)
+
+        rad = np.radians(directions)
+        exact = np.minimum(track._ray_exit_distances(xs, ys, np.cos(rad), -np.sin(rad)), self.max_length)
+        error = np.abs(self.lookup(xs, ys, directions) - exact)
+        return {
+            'samples': samples,
+            'max': float(error.max()),
+            'mean': float(error.mean()),
+            'p99': float(np.percentile(error, 99)),
+        }
+
+
+def main():
+    from track import Track, _cache_dir
+    from polyline_track import load_track
+
+    parser = argparse.ArgumentParser(description="센서 룩업 테이블 생성/검증")
+    parser.add_argument('--track', metavar='PATH', help="트랙 파일 (기본: 타원 트랙)")
+    parser.add_argument('--spacing', type=float, default=SENSOR_LUT_SPACING, help="위치 격자 간격 (px)")
+    parser.add_argument('--angles', type=int, default=SENSOR_LUT_ANGLES, help="방향 격자 수 (360도 분할)")
+    parser.add_argument('--dtype', default=SENSOR_LUT_DTYPE, choices=['uint8', 'uint16'],
+                        help="거리 양자화 자료형")
+    parser.add_argument('--workers', type=int, default=None, metavar='N', help="생성 프로세스 수")
+    parser.add_argument('--validate', type=int, default=0, metavar='N',
+                        help="정확한 레이캐스트와 N개 표본 비교")
+    args = parser.parse_args()
+
+    track = load_track(args.track) if args.track else Track()
+    lut = SensorLUT.load_or_build(track, _cache_dir(), args.spacing, args.angles, args.dtype,
+                                  workers=args.workers)
+    print(f"테이블 {lut.rows}x{lut.cols}x{lut.angles} ({lut.table.dtype}), {lut.nbytes / 1e6:.1f}MB")
+
+    if args.validate:
+        report = lut.validate(track, args.validate)
+        print(f"검증 {report['samples']}개: 최대 오차 {report['max']:.3f}px  "
+              f"평균 {report['mean']:.3f}px  99% {report['p99']:.3f}px")
+
+
+if __name__ == "__main__":
+    main()
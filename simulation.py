@@ -0,0 +1,77 @@
+"""
+세대 시뮬레이션 모듈 (렌더링 없음)
+- 센서 → 신경망 → 물리 순서로 집단 전체를 1스텝 (SIM_DT 틱) 진행
+- 메인 루프와 병렬 평가 워커가 함께 사용
+"""
+import neat
+import numpy as np
+from typing import Callable, List, Optional, Tuple
+
+from config import SIM_DT
+from fleet import CarFleet
+from inference import PopulationNetwork
+from profiler import Profiler
+from termination import StopRule
+
+
+class GenerationRunner:
+    """한 세대의 차량 집단과 신경망을 틱 단위로 진행"""
+
+    def __init__(self, track, start_positions: List[Tuple[float, float, float]],
+                 nets: List[neat.nn.FeedForwardNetwork],
+                 profiler: Optional[Profiler] = None,
+                 rule: Optional[StopRule] = None):
+        self.track = track
+        self.fleet = CarFleet(start_positions)
+        self.nets = nets
+        self.ticks = 0
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.rule = rule if rule is not None else StopRule()
+
+        # 일괄 추론용 컴파일 (지원하지 않는 노드 함수면 개별 추론)
+        try:
+            self.population_net: Optional[PopulationNetwork] = PopulationNetwork(nets)
+        except ValueError as e:
+            print(f"일괄 추론 비활성화: {e}")
+            self.population_net = None
+
+    @property
+    def finished(self) -> bool:
+        """틱 예산 소진, 모든 차량 사망 또는 조기 종료 조건 (StopRule.reason)"""
+        return self.rule.update(self.fleet, self.ticks)
+
+    def step(self):
+        """모든 차량 상태 업데이트 (1스텝 = SIM_DT 틱)"""
+        fleet = self.fleet
+        profiler = self.profiler
+
+        # 센서 업데이트
+        with profiler.section('sensors'):
+            fleet.update_sensors(self.track)
+
+        # 신경망 출력 (조향, 가속) - 살아있는 차량만
+        with profiler.section('inference'):
+            inputs = fleet.get_inputs()
+            outputs = np.zeros((len(fleet), 2))
+            alive = np.flatnonzero(fleet.alive)
+            if self.population_net is not None:
+                outputs[alive] = self.population_net.activate(inputs[alive], alive)
+            else:
+                for i in alive:
+                    outputs[i] = self.nets[i].activate(inputs[i])
+
+        # 출력 적용 + 물리 업데이트
+        with profiler.section('physics'):
+            fleet.step(self.track, outputs)
+        self.ticks += SIM_DT
+
+    def run(self, progress: Optional[Callable[[int, int], None]] = None, interval: int = 60):
+        """
+        세대 끝까지 최대 속도로 진행
+        progress(ticks, alive_count) 는 interval 틱마다 호출
+        """
+        while not self.finished:
+            reported = self.ticks // interval
+            self.step()
+            if progress is not None and self.ticks // interval != reported:
+                progress(self.ticks, self.fleet.alive_count)
@@ -0,0 +1,64 @@
+"""
+점 공간 해시 모듈 (균일 격자)
+- 점들을 칸 키로 정렬해 칸별 구간 (CSR) 으로 보관, 매 틱 다시 생성
+- 칸 크기를 질의 반경으로 잡으면 이웃 후보는 주변 3x3 칸에만 있음
+점이 트랙 위에 퍼져 있으면 후보 쌍 수는 점 수에 비례 (전체 쌍 O(n²) 비교 없음)
+"""
+import numpy as np
+from typing import Tuple
+
+# 칸 좌표 (cx, cy) → 정수 키 (cx * _KEY_STRIDE + cy), 좌표 범위 ±_KEY_STRIDE/2 칸
+_KEY_STRIDE = 1 << 20
+
+
+class SpatialHash:
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, cell_size: float):
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.cell_size = float(cell_size)
+
+        cx = np.floor(self.xs / self.cell_size).astype(np.int64)
+        cy = np.floor(self.ys / self.cell_size).astype(np.int64)
+        self.keys = cx * _KEY_STRIDE + cy
+
+        # 칸 키 순으로 정렬한 점 번호와 칸별 시작/끝 위치
+        self.order = np.argsort(self.keys, kind='stable')
+        sorted_keys = self.keys[self.order]
+        self.cell_keys, self.cell_start, counts = np.unique(sorted_keys, return_index=True,
+                                                            return_counts=True)
+        self.cell_end = self.cell_start + counts
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def candidate_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """같은 칸 또는 이웃 8칸에 있는 점 쌍 (i < j)"""
+        firsts = []
+        seconds = []
+        for ox in (-1, 0, 1):
+            for oy in (-1, 0, 1):
+                neighbor = self.keys + ox * _KEY_STRIDE + oy
+                slot = np.searchsorted(self.cell_keys, neighbor)
+                slot = np.minimum(slot, len(self.cell_keys) - 1)
+                found = self.cell_keys[slot] == neighbor
+                points = np.flatnonzero(found)
+                start = self.cell_start[slot[found]]
+                count = self.cell_end[slot[found]] - start
+
+                # 점마다 이웃 칸의 구간 [start, start + count) 를 펼침
+                owner = np.repeat(points, count)
+                offset = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+                other = self.order[np.repeat(start, count) + offset]
+                keep = owner < other
+                firsts.append(owner[keep])
+                seconds.append(other[keep])
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def pairs(self, radius: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """거리가 radius (기본 칸 크기) 이하인 점 쌍 (i < j), radius 는 칸 크기 이하"""
+        radius = self.cell_size if radius is None else radius
+        if radius > self.cell_size:
+            raise ValueError(f"질의 반경 {radius} 이 칸 크기 {self.cell_size} 보다 큽니다")
+        i, j = self.candidate_pairs()
+        near = np.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j]) <= radius
+        return i[near], j[near]
@@ -0,0 +1,79 @@
+"""
+차량 스프라이트 캐시 모듈
+- 상태 (생존/탈락/1위) x 양자화된 각도별로 회전된 차량 이미지를 보관
+- 처음 요청될 때 생성, 최대 개수를 넘으면 가장 오래 쓰지 않은 것부터 제거
+"""
+import pygame
+from collections import OrderedDict
+from typing import Tuple
+
+from config import (
+    CAR_WIDTH, CAR_HEIGHT,
+    SPRITE_ANGLE_STEP, SPRITE_CACHE_SIZE,
+    COLORS
+)
+
+# 상태별 스타일: (색상, 알파, 테두리/전면 표시 여부) - Car.draw 와 동일
+SPRITE_STYLES = {
+    'alive': (COLORS['car_alive'], 255, True),
+    'best': (COLORS['car_best'], 255, True),
+    'dead': (COLORS['car_dead'], 100, False),
+}
+
+
+class CarSpriteCache:
+    def __init__(self, width: int = CAR_WIDTH, height: int = CAR_HEIGHT,
+                 angle_step: int = SPRITE_ANGLE_STEP, max_size: int = SPRITE_CACHE_SIZE):
+        self.width = width
+        self.height = height
+        self.angle_step = angle_step
+        self.max_size = max_size
+
+        self._sprites: "OrderedDict[Tuple[str, int], pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._sprites)
+
+    def get(self, state: str, angle: float) -> pygame.Surface:
+        """상태('alive' | 'best' | 'dead')와 각도(도)에 맞는 회전된 스프라이트 반환"""
+        key = (state, int(round(angle / self.angle_step)) * self.angle_step % 360)
+
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self._render(state, key[1])
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_size:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def blit(self, surface: pygame.Surface, state: str, x: float, y: float, angle: float):
+        """차량 중심 (x, y) 에 스프라이트 그리기"""
+        sprite = self.get(state, angle)
+        surface.blit(sprite, sprite.get_rect(center=(x, y)))
+
+    def _render(self, state: str, angle: int) -> pygame.Surface:
+        """회전 전 차량 이미지를 그린 뒤 반시계 방향으로 회전"""
+        color, alpha, outlined = SPRITE_STYLES[state]
+
+        pad = 5
+        base = pygame.Surface((self.width + pad * 2, self.height + pad * 2), pygame.SRCALPHA)
+        body = pygame.Rect(pad, pad, self.width, self.height)
+        pygame.draw.rect(base, (*color, alpha), body)
+
+        if outlined:
+            pygame.draw.rect(base, (255, 255, 255), body, 1)
+            # 차량 전면 표시 (방향)
+            front = (pad + int(self.width * 0.9), pad + self.height // 2)
+            pygame.draw.circle(base, (255, 255, 255), front, 3)
+
+        sprite = pygame.transform.rotate(base, angle)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        return sprite
@@ -0,0 +1,195 @@
+"""
+스트리밍 세대 통계 모듈 (세대 수와 무관하게 메모리 고정)
+- RingBuffer: 최근 값 고정 크기 버퍼
+- DecimatedSeries: 다중 해상도 요약 (레벨 k 의 한 칸 = 세대 factor**k 개의 최소/최대/평균)
+  전체 기록을 일정한 점 수로 표시 (점수 그래프)
+- StatsReporter: neat.StatisticsReporter 대체 - 메모리에는 요약과 최근 최고 유전체만,
+  세대별 상세 통계 (종별 적합도 등) 는 JSON Lines 파일에 추가 기록
+- trim_population: NEAT 내부에서 세대마다 늘어나는 기록 (부모 정보, 종별 적합도 기록) 정리
+"""
+import copy
+import json
+import os
+from collections import deque
+from typing import Optional, TextIO, Tuple
+
+import numpy as np
+from neat.reporting import BaseReporter
+
+from config import STATS_HISTORY_POINTS, STATS_DECIMATION, STATS_LEVELS, STATS_RECENT_GENOMES
+
+
+class RingBuffer:
+    """고정 크기 float 버퍼 (가득 차면 가장 오래된 값부터 덮어씀)"""
+
+    def __init__(self, capacity: int):
+        self.data = np.zeros(capacity)
+        self.count = 0  # 지금까지 추가된 값 수
+
+    def __len__(self) -> int:
+        return min(self.count, len(self.data))
+
+    def append(self, value: float):
+        self.data[self.count % len(self.data)] = value
+        self.count += 1
+
+    def values(self) -> np.ndarray:
+        """보관 중인 값 (오래된 순)"""
+        capacity = len(self.data)
+        if self.count <= capacity:
+            return self.data[:self.count].copy()
+        head = self.count % capacity
+        return np.concatenate((self.data[head:], self.data[:head]))
+
+
+class DecimatedSeries:
+    """
+    다중 해상도 시계열
+    레벨마다 최근 capacity 칸 (최소/최대/평균) 을 링 버퍼로 보관하고, 칸을 채우는 중인 값도 따로 누적
+    capacity * factor**(levels-1) 세대까지 전체 기록을 capacity 칸 이하로 표시
+    """
+
+    def __init__(self, capacity: int = STATS_HISTORY_POINTS, factor: int = STATS_DECIMATION,
+                 levels: int = STATS_LEVELS):
+        self.capacity = capacity
+        self.factor = factor
+        self.count = 0
+        self.levels = [(RingBuffer(capacity), RingBuffer(capacity), RingBuffer(capacity))
+                       for _ in range(levels)]
+        # 레벨별 채우는 중인 칸 [최소, 최대, 합, 개수]
+        self.partial = [[np.inf, -np.inf, 0.0, 0] for _ in range(levels)]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, value: float):
+        self.count += 1
+        for level, (mins, maxs, means) in enumerate(self.levels):
+            acc = self.partial[level]
+            acc[0] = min(acc[0], value)
+            acc[1] = max(acc[1], value)
+            acc[2] += value
+            acc[3] += 1
+            if acc[3] == self.factor ** level:
+                mins.append(acc[0])
+                maxs.append(acc[1])
+                means.append(acc[2] / acc[3])
+                self.partial[level] = [np.inf, -np.inf, 0.0, 0]
+
+    def series(self, points: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        전체 기록을 points 칸 이하로 요약한 (최소, 최대, 평균) - 오래된 순
+        가장 거친 레벨로도 다 담지 못하면 그 레벨에 남은 최근 기록만
+        """
+        points = min(points or self.capacity, self.capacity)
+        for level in range(len(self.levels)):
+            size = self.factor ** level
+            if -(-self.count // size) <= points:
+                break
+
+        mins, maxs, means = (buffer.values() for buffer in self.levels[level])
+        acc = self.partial[level]
+        if acc[3]:
+            mins = np.append(mins, acc[0])
+            maxs = np.append(maxs, acc[1])
+            means = np.append(means, acc[2] / acc[3])
+        return mins[-points:], maxs[-points:], means[-points:]
+
+
+def trim_population(population):
+    """
+    neat.Population 이 세대마다 쌓는 기록을 현재 필요한 만큼만 남김
+    - reproduction.ancestors: 지금까지 만든 모든 유전체의 부모 → 현재 집단만
+    - species.fitness_history: 정체 판정은 최댓값만 사용 → [최댓값]
+    """
+    reproduction = population.reproduction
+    reproduction.ancestors = {key: reproduction.ancestors[key] for key in population.population
+                              if key in reproduction.ancestors}
+    for s in population.species.species.values():
+        if len(s.fitness_history) > 1:
+            s.fitness_history = [max(s.fitness_history)]
+
+
+class StatsReporter(BaseReporter):
+    """
+    세대 통계 NEAT 리포터 (neat.StatisticsReporter 대체)
+    - 최고/평균 적합도는 DecimatedSeries, 최고 유전체는 최근 recent_genomes 개만 메모리에 보관
+    - log_path 를 주면 세대마다 상세 통계 1줄을 JSON Lines 로 추가
+    - population 을 지정하면 세대가 끝날 때마다 trim_population
+    """
+
+    def __init__(self, log_path: Optional[str] = None, recent_genomes: int = STATS_RECENT_GENOMES):
+        self.best = DecimatedSeries()
+        self.mean = DecimatedSeries()
+        self.stdev = DecimatedSeries()
+        self.recent_best = deque(maxlen=recent_genomes)  # (세대, 유전체 복사본)
+        self.generation = 0
+        self.population = None
+
+        self.log_path = log_path
+        self.log_file: Optional[TextIO] = None
+        if log_path is not None:
+            folder = os.path.dirname(log_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.log_file = open(log_path, 'a', encoding='utf-8')
+
+    def start_generation(self, generation):
+        self.generation = generation + 1  # 화면/세대 로그와 같은 1부터 시작하는 번호
+
+    def post_evaluate(self, config, population, species, best_genome):
+        fitness = np.array([genome.fitness for genome in population.values()], dtype=float)
+        self.best.append(float(fitness.max()))
+        self.mean.append(float(fitness.mean()))
+        self.stdev.append(float(fitness.std()))
+        self.recent_best.append((self.generation, copy.deepcopy(best_genome)))
+
+        if self.log_file is None:
+            return
+        species_stats = {}
+        for sid, s in species.species.items():
+            members = np.array([m.fitness for m in s.members.values()], dtype=float)
+            species_stats[str(sid)] = {
+                'size': len(members),
+                'best': float(members.max()),
+                'mean': float(members.mean()),
+                'created': s.created,
+                'last_improved': s.last_improved,
+            }
+        record = {
+            'generation': self.generation,
+            'best': float(fitness.max()),
+            'mean': float(fitness.mean()),
+            'stdev': float(fitness.std()),
+            'median': float(np.median(fitness)),
+            'best_genome': {
+                'key': best_genome.key,
+                'fitness': best_genome.fitness,
+                'nodes': len(best_genome.nodes),
+                'connections': sum(1 for c in best_genome.connections.values() if c.enabled),
+            },
+            'species': species_stats,
+        }
+        self.log_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.log_file.flush()
+
+    def end_generation(self, config, population, species_set):
+        if self.population is not None:
+            trim_population(self.population)
+
+    def state(self) -> dict:
+        """체크포인트용 상태 (로그 파일 제외)"""
+        return {'best': self.best, 'mean': self.mean, 'stdev': self.stdev,
+                'recent_best': list(self.recent_best)}
+
+    def restore(self, state: dict):
+        self.best = state['best']
+        self.mean = state['mean']
+        self.stdev = state['stdev']
+        self.recent_best.clear()
+        self.recent_best.extend(state['recent_best'])
+
+    def close(self):
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
@@ -0,0 +1,107 @@
+"""
+세대 조기 종료 정책 모듈
+- 바퀴 수 상한: 최고 차량이 K 바퀴를 돌면 종료
+- 정체: 최고 적합도가 일정 틱 동안 늘지 않으면 종료
+- 적응형 틱 예산: 최근 세대 최고 차량의 생존 틱에 맞춰 다음 세대 예산 조정
+- 바퀴 수 상한/정체로 잘린 세대는 살아있던 차량의 적합도를 GENERATION_TICKS 기준으로 환산 (세대 간 비교 가능)
+"""
+import math
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from config import (
+    GENERATION_TICKS,
+    TERMINATION_LAP_CAP, TERMINATION_PLATEAU_TICKS,
+    TERMINATION_ADAPTIVE, TERMINATION_MARGIN, TERMINATION_MIN_TICKS, TERMINATION_HISTORY
+)
+
+
+class StopRule:
+    """
+    한 세대의 종료 조건 (워커 프로세스로 복사 가능)
+    GenerationRunner 가 스텝마다 update 를 호출하고, 조건을 만족하면 reason 설정
+    """
+
+    def __init__(self, tick_budget: int = GENERATION_TICKS,
+                 lap_cap: int = TERMINATION_LAP_CAP,
+                 plateau_ticks: int = TERMINATION_PLATEAU_TICKS):
+        self.tick_budget = int(tick_budget)
+        self.lap_cap = lap_cap
+        self.plateau_ticks = plateau_ticks
+
+        # 정체 판정 상태
+        self.best_fitness = -math.inf
+        self.best_tick = 0
+
+        # 종료 이유 ('budget' | 'laps' | 'plateau' | 'extinct', 진행 중이면 None)
+        self.reason: Optional[str] = None
+
+    def update(self, fleet, ticks: int) -> bool:
+        """스텝 후 종료 여부 판정"""
+        if self.reason is not None:
+            return True
+
+        if fleet.alive_count == 0:
+            self.reason = 'extinct'
+        elif ticks >= self.tick_budget:
+            self.reason = 'budget'
+        elif self.lap_cap and fleet.laps.max(initial=0) >= self.lap_cap:
+            self.reason = 'laps'
+        elif self.plateau_ticks:
+            best = float(fleet.fitness.max(initial=0))
+            if best > self.best_fitness:
+                self.best_fitness = best
+                self.best_tick = ticks
+            elif ticks - self.best_tick >= self.plateau_ticks:
+                self.reason = 'plateau'
+
+        return self.reason is not None
+
+
+def normalize_fitness(fitness: np.ndarray, alive: np.ndarray, ticks: int, rule: StopRule) -> np.ndarray:
+    """
+    바퀴 수 상한/정체 종료로 잘린 세대만, 살아있던 차량의 적합도를 같은 속도로 GENERATION_TICKS 까지 달렸을 때로 환산
+    - 기준은 고정 (세대마다 바뀌는 적응형 예산 기준이면 같은 유전체의 점수가 세대마다 달라져
+      최고 유전체/종 정체 판정/점수 기록을 세대 간에 비교할 수 없음)
+    - 틱 예산 소진/전멸: 그대로 (모든 차량이 같은 시간을 받았으므로 환산하면 느린 생존 차량만 유리)
+    - 이미 탈락한 차량: 그대로 (끝까지 진행했어도 같은 값)
+    - 음수 적합도 (후진/역주행): 그대로 (환산하면 벌점만 커짐)
+    """
+    if rule.reason not in ('laps', 'plateau') or ticks <= 0 or ticks >= GENERATION_TICKS:
+        return fitness
+    return np.where(alive & (fitness > 0), fitness * (GENERATION_TICKS / ticks), fitness)
+
+
+class TerminationPolicy:
+    """세대 간 상태 (최근 최고 차량 생존 틱) 를 보관하고 세대마다 StopRule 생성"""
+
+    def __init__(self, adaptive: bool = TERMINATION_ADAPTIVE, margin: float = TERMINATION_MARGIN,
+                 min_ticks: int = TERMINATION_MIN_TICKS, history: int = TERMINATION_HISTORY,
+                 lap_cap: int = TERMINATION_LAP_CAP, plateau_ticks: int = TERMINATION_PLATEAU_TICKS):
+        self.adaptive = adaptive
+        self.margin = margin
+        self.min_ticks = min_ticks
+        self.best_survival = deque(maxlen=history)
+        self.lap_cap = lap_cap
+        self.plateau_ticks = plateau_ticks
+
+    def tick_budget(self) -> int:
+        """다음 세대 틱 예산 (최근 최고 차량 생존 틱 x margin, 예산을 다 쓰면 다음 세대에 늘어남)"""
+        if not self.adaptive or not self.best_survival:
+            return GENERATION_TICKS
+        budget = math.ceil(max(self.best_survival) * self.margin)
+        return int(min(max(budget, self.min_ticks), GENERATION_TICKS))
+
+    def next_rule(self) -> StopRule:
+        return StopRule(self.tick_budget(), self.lap_cap, self.plateau_ticks)
+
+    def record(self, fitness: np.ndarray, time_alive: np.ndarray, reason: Optional[str]):
+        """
+        세대 결과 기록 - 최고 적합도 차량의 생존 틱
+        예산 소진/전멸로 끝난 세대만 (바퀴 수 상한/정체로 잘린 세대의 생존 틱은 종료 시점일 뿐이라,
+        기록하면 예산이 종료 시점 x margin 으로 줄고 다시 늘지 않음)
+        """
+        if reason in ('budget', 'extinct') and len(fitness):
+            self.best_survival.append(float(time_alive[int(np.argmax(fitness))]))
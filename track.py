@@ -6,13 +6,39 @@
 """
 import pygame
 import math
-from typing import List, Tuple, Optional
+import os
+import numpy as np
+from typing import List, Tuple, Optional, Sequence
 
 from config import (
     TRACK_CENTER_X, TRACK_CENTER_Y,
-    TRACK_WIDTH, TRACK_OUTER_A, TRACK_OUTER_B,
-    COLORS
+    TRACK_WIDTH, TRACK_OUTER_A, TRACK_OUTER_B, CAR_WIDTH, CAR_HEIGHT,
+    TRACK_SDF_SPACING, TRACK_CACHE_DIR, PROGRESS_GRID_CELL,
+    SENSOR_MODE, SENSOR_MAX_LENGTH, SENSOR_ANGLES, COLORS
 )
+from progress import ProgressMap
+from sdf import DistanceField
+from sensor_lut import SensorLUT
+
+
+def _cache_dir() -> Optional[str]:
+    """거리장 캐시 폴더 (프로젝트 폴더 기준)"""
+    if not TRACK_CACHE_DIR:
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), TRACK_CACHE_DIR)
+
+
+def _segments_cross(px, py, qx, qy, ax, ay, bx, by):
+    """선분 p→q 와 선분 a→b 가 교차하는지 (스칼라/배열 모두 가능, 끝점 접촉 포함)"""
+    rx, ry = qx - px, qy - py
+    sx, sy = bx - ax, by - ay
+    denom = rx * sy - ry * sx
+    wx, wy = ax - px, ay - py
+    # 평행한 경우 (denom = 0) 는 교차하지 않는 것으로 처리
+    safe = np.where(denom == 0, 1.0, denom)
+    t = (wx * sy - wy * sx) / safe
+    u = (wx * ry - wy * rx) / safe
+    return (denom != 0) & (t >= 0) & (t <= 1) & (u >= 0) & (u <= 1)
 
 
 class Track:
@@ -25,8 +51,10 @@ class Track:
         self.inner_b = TRACK_OUTER_B - TRACK_WIDTH  # 내부 타원 단축
         self.track_width = TRACK_WIDTH
         
+        self._init_common()
+        
         # 체크포인트 (트랙을 따라 배치)
-        self.checkpoints = self._create_checkpoints(12)
+        self._set_checkpoints(self._create_checkpoints(12))
         
         # 시작 위치/각도
         self.start_x = self.center_x + self.outer_a - self.track_width // 2
@@ -36,6 +64,29 @@ class Track:
         # 트랙 경계 포인트 (충돌 감지용)
         self.outer_points = self._generate_ellipse_points(self.outer_a, self.outer_b, 100)
         self.inner_points = self._generate_ellipse_points(self.inner_a, self.inner_b, 100)
+        
+        # 중심선 진행도 (주행 방향 = 매개변수 각도가 줄어드는 방향)
+        center_line = self._generate_ellipse_points((self.outer_a + self.inner_a) / 2,
+                                                    (self.outer_b + self.inner_b) / 2, 360)
+        self._build_progress(np.array(center_line[::-1]))
+    
+    def _init_common(self):
+        """형상과 무관한 공통 상태 (PolylineTrack 도 호출)"""
+        # 센서 레이캐스팅 방식 ('analytic' | 'sdf' | 'lut' | 'raymarch')
+        self.sensor_mode = SENSOR_MODE
+        self.max_ray_distance = 300
+        
+        # 부호 거리장 ('sdf' 센서/벽 거리 입력에 처음 필요할 때 생성)
+        self.distance_field: Optional[DistanceField] = None
+        # 센서 룩업 테이블 ('lut' 센서에 처음 필요할 때 생성)
+        self.sensor_lut: Optional[SensorLUT] = None
+    
+    def _set_checkpoints(self, checkpoints: List[dict]):
+        """체크포인트와 벡터화 판정용 선분 배열 [(ox, oy, ix, iy), ...] 설정"""
+        self.checkpoints = checkpoints
+        self.checkpoint_lines = np.array(
+            [(*cp['outer'], *cp['inner']) for cp in checkpoints], dtype=float
+        )
     
     def _generate_ellipse_points(self, a: float, b: float, num_points: int) -> List[Tuple[float, float]]:
         """타원 위의 점들 생성"""
@@ -47,6 +98,47 @@ class Track:
             points.append((x, y))
         return points
     
+    def _boundary_segments(self) -> np.ndarray:
+        """외곽/내부 경계 폴리라인의 선분 배열 (m, 4)"""
+        segments = []
+        for points in (self.outer_points, self.inner_points):
+            loop = np.asarray(points, dtype=float)
+            segments.append(np.hstack([loop, np.roll(loop, -1, axis=0)]))
+        return np.vstack(segments)
+    
+    def _build_progress(self, centerline: np.ndarray):
+        """시작점이 진행도 0 이 되도록 중심선을 돌린 뒤 진행도 색인 생성"""
+        start = int(np.argmin(np.hypot(centerline[:, 0] - self.start_x, centerline[:, 1] - self.start_y)))
+        self.centerline = np.roll(centerline, -start, axis=0)
+        
+        x1, y1, x2, y2 = self._boundary_segments().T
+        bounds = (min(x1.min(), x2.min()), min(y1.min(), y2.min()),
+                  max(x1.max(), x2.max()), max(y1.max(), y2.max()))
+        self.progress_map = ProgressMap(self.centerline, bounds, PROGRESS_GRID_CELL, self.track_width / 2)
+        self.track_length = self.progress_map.length
+    
+    def progress_at(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """위치의 트랙 진행도 (시작선부터 중심선 호 길이, 0 ~ track_length)"""
+        return self.progress_map.lookup(xs, ys)
+    
+    def get_distance_field(self) -> DistanceField:
+        """트랙 부호 거리장 (처음 호출 시 디스크 캐시에서 불러오거나 계산)"""
+        if self.distance_field is None:
+            self.distance_field = DistanceField.load_or_bake(
+                self._boundary_segments(), TRACK_SDF_SPACING, _cache_dir()
+            )
+        return self.distance_field
+    
+    def get_sensor_lut(self) -> SensorLUT:
+        """센서 룩업 테이블 (처음 호출 시 디스크 캐시에서 열거나 병렬 생성)"""
+        if self.sensor_lut is None:
+            self.sensor_lut = SensorLUT.load_or_build(self, _cache_dir())
+        return self.sensor_lut
+    
+    def wall_distances(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """가장 가까운 트랙 경계까지의 거리 (트랙 밖은 0)"""
+        return np.maximum(self.get_distance_field().sample(xs, ys), 0.0)
+    
     def _create_checkpoints(self, count: int) -> List[dict]:
         """체크포인트 생성"""
         checkpoints = []
@@ -84,6 +176,18 @@ class Track:
         
         return outer_val <= 1.0 and inner_val >= 1.0
     
+    def is_on_track_batch(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """여러 점의 트랙 위 여부를 한 번에 판정 (is_on_track 벡터화 버전)"""
+        dx = xs - self.center_x
+        dy = ys - self.center_y
+        dx2 = dx * dx
+        dy2 = dy * dy
+        
+        outer_val = dx2 / (self.outer_a * self.outer_a) + dy2 / (self.outer_b * self.outer_b)
+        inner_val = dx2 / (self.inner_a * self.inner_a) + dy2 / (self.inner_b * self.inner_b)
+        
+        return (outer_val <= 1.0) & (inner_val >= 1.0)
+    
     def get_distance_to_edge(self, x: float, y: float, angle: float) -> float:
         """주어진 점에서 특정 방향으로 트랙 경계까지의 거리"""
         # 라디안 변환
@@ -91,8 +195,15 @@ class Track:
         dx = math.cos(rad)
         dy = -math.sin(rad)  # pygame 좌표계 (y가 아래로 증가)
         
+        if self.sensor_mode == 'analytic':
+            return self._ray_exit_distance(x, y, dx, dy)
+        if self.sensor_mode == 'sdf':
+            return self.get_distance_field().trace_one(x, y, dx, dy, self.max_ray_distance)
+        if self.sensor_mode == 'lut':
+            return self.get_sensor_lut().lookup_one(x, y, angle)
+        
         # 레이캐스팅
-        max_dist = 300
+        max_dist = self.max_ray_distance
         step = 2
         
         for dist in range(0, max_dist, step):
@@ -104,8 +215,180 @@ class Track:
         
         return max_dist
     
-    def get_checkpoint_index(self, x: float, y: float, last_checkpoint: int) -> int:
-        """현재 위치에서 통과한 체크포인트 인덱스 반환"""
+    def _ray_exit_distance(self, x: float, y: float, dx: float, dy: float) -> float:
+        """
+        레이와 외곽/내부 타원의 교점을 직접 계산해 트랙을 벗어나는 거리 반환
+        레이 p + t·d 를 타원 방정식에 대입하면 t에 대한 2차 방정식이 된다:
+            A·t² + B·t + C = 0
+        """
+        if not self.is_on_track(x, y):
+            return 0
+        
+        max_dist = self.max_ray_distance
+        u = x - self.center_x
+        v = y - self.center_y
+        
+        # 외곽 타원: 시작점이 내부(C <= 0)이므로 큰 근이 빠져나가는 지점
+        a2 = self.outer_a * self.outer_a
+        b2 = self.outer_b * self.outer_b
+        A = dx * dx / a2 + dy * dy / b2
+        B = 2 * (u * dx / a2 + v * dy / b2)
+        C = u * u / a2 + v * v / b2 - 1
+        disc = max(0.0, B * B - 4 * A * C)
+        dist = (-B + math.sqrt(disc)) / (2 * A)
+        
+        # 내부 타원: 시작점이 외부(C >= 0)이므로 작은 양의 근이 진입 지점
+        a2 = self.inner_a * self.inner_a
+        b2 = self.inner_b * self.inner_b
+        A = dx * dx / a2 + dy * dy / b2
+        B = 2 * (u * dx / a2 + v * dy / b2)
+        C = u * u / a2 + v * v / b2 - 1
+        disc = B * B - 4 * A * C
+        if disc > 0:
+            t = (-B - math.sqrt(disc)) / (2 * A)
+            if 0 <= t < dist:
+                dist = t
+        
+        return min(dist, max_dist)
+    
+    def cast_rays(self, xs: np.ndarray, ys: np.ndarray, angles: np.ndarray,
+                  mask: Optional[np.ndarray] = None,
+                  offsets: Sequence[float] = SENSOR_ANGLES,
+                  max_length: float = SENSOR_MAX_LENGTH) -> np.ndarray:
+        """
+        여러 차량의 모든 센서 레이를 한 번에 계산
+        xs, ys, angles: 차량 위치/방향 (n,)
+        mask: 계산할 차량 (None 이면 전체), 제외된 차량의 거리는 0
+        Returns: (n, len(offsets)) 거리 배열 (max_length 로 제한)
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        angles = np.asarray(angles, dtype=float)
+        
+        distances = np.zeros((len(xs), len(offsets)))
+        rows = np.arange(len(xs)) if mask is None else np.flatnonzero(mask)
+        if len(rows) == 0:
+            return distances
+        
+        directions = angles[rows, None] + np.asarray(offsets, dtype=float)
+        if self.sensor_mode == 'lut':
+            distances[rows] = np.minimum(self.get_sensor_lut().lookup(
+                np.broadcast_to(xs[rows, None], directions.shape),
+                np.broadcast_to(ys[rows, None], directions.shape),
+                directions), max_length)
+            return distances
+        
+        rad = np.radians(directions)
+        dx = np.cos(rad)
+        dy = -np.sin(rad)  # pygame 좌표계
+        px = np.broadcast_to(xs[rows, None], dx.shape)
+        py = np.broadcast_to(ys[rows, None], dx.shape)
+        
+        if self.sensor_mode == 'analytic':
+            hit = self._ray_exit_distances(px, py, dx, dy)
+        elif self.sensor_mode == 'sdf':
+            hit = self.get_distance_field().trace(px, py, dx, dy, self.max_ray_distance)
+        else:
+            hit = self._march_rays(px, py, dx, dy)
+        
+        distances[rows] = np.minimum(hit, max_length)
+        return distances
+    
+    def _ray_exit_distances(self, xs: np.ndarray, ys: np.ndarray,
+                            dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+        """_ray_exit_distance 벡터화 버전"""
+        u = xs - self.center_x
+        v = ys - self.center_y
+        
+        # 외곽 타원: 큰 근
+        a2 = self.outer_a * self.outer_a
+        b2 = self.outer_b * self.outer_b
+        A = dx * dx / a2 + dy * dy / b2
+        B = 2 * (u * dx / a2 + v * dy / b2)
+        C = u * u / a2 + v * v / b2 - 1
+        on_track = C <= 0
+        dist = (-B + np.sqrt(np.maximum(B * B - 4 * A * C, 0))) / (2 * A)
+        
+        # 내부 타원: 작은 양의 근 (교차하는 레이만)
+        a2 = self.inner_a * self.inner_a
+        b2 = self.inner_b * self.inner_b
+        A = dx * dx / a2 + dy * dy / b2
+        B = 2 * (u * dx / a2 + v * dy / b2)
+        C = u * u / a2 + v * v / b2 - 1
+        on_track &= C >= 0
+        disc = B * B - 4 * A * C
+        t = (-B - np.sqrt(np.maximum(disc, 0))) / (2 * A)
+        dist = np.where((disc > 0) & (t >= 0) & (t < dist), t, dist)
+        
+        dist = np.minimum(dist, self.max_ray_distance)
+        return np.where(on_track, dist, 0.0)
+    
+    def _march_rays(self, xs: np.ndarray, ys: np.ndarray,
+                    dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+        """get_distance_to_edge 레이마칭 방식의 벡터화 버전 (2px 단위)"""
+        steps = np.arange(0, self.max_ray_distance, 2, dtype=float)
+        on_track = self.is_on_track_batch(xs[..., None] + dx[..., None] * steps,
+                                          ys[..., None] + dy[..., None] * steps)
+        
+        # 처음으로 트랙을 벗어난 지점 (끝까지 트랙 위면 최대 거리)
+        off = ~on_track
+        first = np.argmax(off, axis=-1)
+        return np.where(off.any(axis=-1), steps[first], self.max_ray_distance)
+    
+    def is_motion_on_track(self, x0: np.ndarray, y0: np.ndarray,
+                           x1: np.ndarray, y1: np.ndarray) -> np.ndarray:
+        """
+        이동 선분 (x0, y0) → (x1, y1) 전체가 트랙 위인지 판정 (연속 충돌 감지)
+        끝점만 보면 빠른 차량이 좁은 잔디/경계 모서리를 건너뛸 수 있으므로
+        시작점에서 이동 방향으로 쏜 레이가 이동 거리 안에서 경계를 만나면 충돌
+        """
+        x0 = np.asarray(x0, dtype=float)
+        y0 = np.asarray(y0, dtype=float)
+        dx = x1 - x0
+        dy = y1 - y0
+        length = np.hypot(dx, dy)
+        result = np.array(self.is_on_track_batch(x1, y1))
+        
+        # 거리장이 있으면 벽까지 여유가 이동 거리보다 큰 차량은 레이 생략
+        check = result.copy()
+        if self.distance_field is not None:
+            check &= self.distance_field.sample(x0, y0) < length + 1.0
+        if not check.any():
+            return result
+        
+        scale = 1.0 / np.maximum(length[check], 1e-9)
+        exit_distance = self._ray_exit_distances(x0[check], y0[check], dx[check] * scale, dy[check] * scale)
+        result[check] = exit_distance >= np.minimum(length[check], self.max_ray_distance)
+        return result
+    
+    def is_hull_on_track(self, xs: np.ndarray, ys: np.ndarray, angles: np.ndarray) -> np.ndarray:
+        """
+        회전된 차체 사각형 (CAR_WIDTH x CAR_HEIGHT) 의 네 모서리가 모두 트랙 위인지 판정
+        모서리 계산은 Car.get_corners 와 동일, 벽까지 여유가 차체 외접원보다 큰 차량은 거리장 1회 조회로 통과
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        result = np.ones(np.shape(xs), dtype=bool)
+        check = self.get_distance_field().sample(xs, ys) < np.hypot(CAR_WIDTH, CAR_HEIGHT) / 2 + 1.0
+        if not check.any():
+            return result
+        
+        rad = np.radians(np.asarray(angles, dtype=float)[check])[..., None]
+        cos_a = np.cos(rad)
+        sin_a = np.sin(rad)
+        lx = np.array([-1, 1, 1, -1]) * (CAR_WIDTH / 2)
+        ly = np.array([-1, -1, 1, 1]) * (CAR_HEIGHT / 2)
+        cx = xs[check][..., None] + lx * cos_a + ly * sin_a
+        cy = ys[check][..., None] - lx * sin_a + ly * cos_a
+        result[check] = self.is_on_track_batch(cx, cy).all(axis=-1)
+        return result
+    
+    def get_checkpoint_index(self, x: float, y: float, last_checkpoint: int,
+                             prev_x: Optional[float] = None, prev_y: Optional[float] = None) -> int:
+        """
+        현재 위치에서 통과한 체크포인트 인덱스 반환
+        prev_x, prev_y 를 주면 이번 이동 선분이 체크포인트 선분을 가로지른 경우도 통과
+        """
         next_checkpoint = (last_checkpoint + 1) % len(self.checkpoints)
         cp = self.checkpoints[next_checkpoint]
         
@@ -120,8 +403,34 @@ class Track:
         if dist < 25:
             return next_checkpoint
         
+        # 이동 선분이 체크포인트 선분을 가로지르면 통과
+        if prev_x is not None and _segments_cross(prev_x, prev_y, x, y, ox, oy, ix, iy):
+            return next_checkpoint
+        
         return last_checkpoint
     
+    def get_checkpoint_indices(self, xs: np.ndarray, ys: np.ndarray,
+                               last_checkpoints: np.ndarray,
+                               prev_xs: Optional[np.ndarray] = None,
+                               prev_ys: Optional[np.ndarray] = None) -> np.ndarray:
+        """get_checkpoint_index 벡터화 버전 (차량 여러 대를 한 번에 판정)"""
+        next_checkpoints = (last_checkpoints + 1) % len(self.checkpoints)
+        lines = self.checkpoint_lines[next_checkpoints]
+        x1, y1, x2, y2 = lines[:, 0], lines[:, 1], lines[:, 2], lines[:, 3]
+        
+        # 점과 선분 사이의 거리 (체크포인트 선분은 길이가 0이 아님)
+        ex = x2 - x1
+        ey = y2 - y1
+        t = np.clip(((xs - x1) * ex + (ys - y1) * ey) / (ex * ex + ey * ey), 0, 1)
+        dist = np.hypot(xs - (x1 + t * ex), ys - (y1 + t * ey))
+        passed = dist < 25
+        
+        # 이동 선분이 체크포인트 선분을 가로지른 경우
+        if prev_xs is not None:
+            passed |= _segments_cross(prev_xs, prev_ys, xs, ys, x1, y1, x2, y2)
+        
+        return np.where(passed, next_checkpoints, last_checkpoints)
+    
     def _point_to_line_distance(self, px: float, py: float, 
                                  x1: float, y1: float, x2: float, y2: float) -> float:
         """점에서 선분까지의 거리"""
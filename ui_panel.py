@@ -5,16 +5,20 @@ UI 패널 모듈 - iOS 스타일 디자인
 - 세대별 점수 그래프
 - 배속 조절
 - 실시간 해설
+- 성능 측정 오버레이
 """
+import numpy as np
 import pygame
 from typing import List, Optional, Dict, Any, Tuple
 
 from config import (
     COLORS, PANEL_X, PANEL_WIDTH, PANEL_PADDING,
-    SCREEN_HEIGHT, GENERATION_TIME, SPEED_OPTIONS,
+    SCREEN_HEIGHT, GENERATION_TIME, SPEED_OPTIONS, SENSOR_WALL_DISTANCE,
     CARD_RADIUS, CARD_PADDING, CARD_SPACING,
     FONT_TITLE, FONT_LARGE, FONT_MEDIUM, FONT_SMALL, FONT_CAPTION
 )
+from profiler import PHASES, PHASE_LABELS
+from stats import DecimatedSeries
 
 
 class UIPanel:
@@ -32,15 +36,18 @@ class UIPanel:
         self.font_small = pygame.font.SysFont('malgungothic', FONT_SMALL)
         self.font_caption = pygame.font.SysFont('malgungothic', FONT_CAPTION)
         
-        # 그래프 데이터
-        self.best_scores: List[float] = []
-        self.avg_scores: List[float] = []
+        # 그래프 데이터 (세대 수와 무관하게 고정 크기, 전체 기록을 구간별로 요약)
+        self.best_scores = DecimatedSeries()
+        self.avg_scores = DecimatedSeries()
         
         # 배속 버튼 영역 저장 (클릭 감지용)
         self.speed_buttons: List[Tuple[pygame.Rect, int]] = []
         
         # 현재 배속
         self.current_speed = 1
+        
+        # 성능 오버레이 표시 여부
+        self.show_profiler = False
     
     def update_scores(self, best: float, avg: float):
         """점수 데이터 추가"""
@@ -290,12 +297,14 @@ class UIPanel:
         input_x = rect.x + padding_x
         output_x = rect.x + rect.width - padding_x
         
-        # 입력 노드 (5개)
+        # 입력 노드 (센서 5개 + 벽 거리)
         input_nodes = []
         input_labels = ["전방", "좌45", "우45", "좌90", "우90"]
-        node_spacing = (rect.height - padding_y * 2) / 4
+        if SENSOR_WALL_DISTANCE:
+            input_labels.append("벽")
+        node_spacing = (rect.height - padding_y * 2) / (len(input_labels) - 1)
         
-        for i in range(5):
+        for i in range(len(input_labels)):
             node_y = rect.y + padding_y + i * node_spacing
             input_nodes.append((input_x, node_y))
         
@@ -329,7 +338,10 @@ class UIPanel:
     
     def _draw_graph(self, surface: pygame.Surface, rect: pygame.Rect):
         """점수 그래프 그리기"""
-        if len(self.best_scores) < 2:
+        # 전체 기록 요약 - 구간별 최고 점수의 최댓값 / 평균 점수의 평균
+        _, best, _ = self.best_scores.series()
+        _, _, avg = self.avg_scores.series()
+        if len(best) < 2:
             no_data = self.font_small.render("데이터 수집 중...", True, COLORS['text_tertiary'])
             surface.blit(no_data, (rect.centerx - no_data.get_width()//2, 
                                    rect.centery - no_data.get_height()//2))
@@ -339,7 +351,7 @@ class UIPanel:
         graph_width = rect.width - padding * 2
         graph_height = rect.height - padding * 2
         
-        max_score = max(max(self.best_scores), max(self.avg_scores)) if self.best_scores else 1
+        max_score = max(float(best.max()), float(avg.max()))
         min_score = 0
         score_range = max(max_score - min_score, 1)
         
@@ -349,27 +361,11 @@ class UIPanel:
             pygame.draw.line(surface, COLORS['graph_grid'], 
                            (rect.x + padding, y), (rect.x + rect.width - padding, y), 1)
         
-        # 최고 점수 라인
-        if len(self.best_scores) >= 2:
-            points = []
-            for i, score in enumerate(self.best_scores[-50:]):  # 최근 50개만
-                x = rect.x + padding + (i / max(len(self.best_scores[-50:]) - 1, 1)) * graph_width
-                y = rect.y + padding + graph_height - ((score - min_score) / score_range) * graph_height
-                points.append((x, y))
-            
-            if len(points) >= 2:
-                pygame.draw.lines(surface, COLORS['graph_line_best'], False, points, 2)
-        
-        # 평균 점수 라인
-        if len(self.avg_scores) >= 2:
-            points = []
-            for i, score in enumerate(self.avg_scores[-50:]):  # 최근 50개만
-                x = rect.x + padding + (i / max(len(self.avg_scores[-50:]) - 1, 1)) * graph_width
-                y = rect.y + padding + graph_height - ((score - min_score) / score_range) * graph_height
-                points.append((x, y))
-            
-            if len(points) >= 2:
-                pygame.draw.lines(surface, COLORS['graph_line_avg'], False, points, 2)
+        # 최고 / 평균 점수 라인
+        for scores, color in ((best, COLORS['graph_line_best']), (avg, COLORS['graph_line_avg'])):
+            xs = rect.x + padding + np.linspace(0, graph_width, len(scores))
+            ys = rect.y + padding + graph_height - ((scores - min_score) / score_range) * graph_height
+            pygame.draw.lines(surface, color, False, np.column_stack((xs, ys)).tolist(), 2)
         
         # 범례 (우상단)
         legend_x = rect.x + rect.width - 80
@@ -384,3 +380,30 @@ class UIPanel:
                         (legend_x, legend_y + 20), (legend_x + 15, legend_y + 20), 2)
         avg_label = self.font_caption.render("평균", True, COLORS['text_tertiary'])
         surface.blit(avg_label, (legend_x + 20, legend_y + 15))
+    
+    def draw_profiler_overlay(self, surface: pygame.Surface, profiler):
+        """구간별 최근 평균 소요 시간 오버레이 (트랙 영역 좌상단)"""
+        averages = profiler.averages()
+        rows = [(PHASE_LABELS.get(name, name), averages[name])
+                for name in PHASES + sorted(set(averages) - set(PHASES)) if name in averages]
+        
+        line_height = 20
+        width = 240
+        height = CARD_PADDING * 2 + line_height * (len(rows) + 1)
+        
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(overlay, (*COLORS['bg_secondary'], 220), overlay.get_rect(),
+                         border_radius=CARD_RADIUS)
+        surface.blit(overlay, (PANEL_PADDING, PANEL_PADDING))
+        
+        x = PANEL_PADDING + CARD_PADDING
+        y = PANEL_PADDING + CARD_PADDING
+        title = self.font_small.render("성능 (ms, 최근 평균)", True, COLORS['text_secondary'])
+        surface.blit(title, (x, y))
+        
+        for label, ms in rows:
+            y += line_height
+            name = self.font_caption.render(label, True, COLORS['text_primary'])
+            surface.blit(name, (x, y))
+            value = self.font_caption.render(f"{ms:.3f}", True, COLORS['accent_teal'])
+            surface.blit(value, (x + width - CARD_PADDING * 2 - value.get_width(), y))
@@ -1,21 +1,69 @@
 """
 시각화 모듈
-- 트랙 렌더링
-- 차량 렌더링 (순위별 색상)
+- 트랙 렌더링 (정적 레이어 캐시)
+- 차량 렌더링 (순위별 색상, 스프라이트 캐시, 상위 차량만 스프라이트 / 나머지는 점)
+- 차량 밀도 히트맵 (H 키)
 - 전체 화면 관리
 """
+import numpy as np
 import pygame
 from typing import List, Optional
 
-from config import COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, PANEL_X
+from config import (
+    COLORS, SCREEN_WIDTH, SCREEN_HEIGHT, PANEL_X,
+    RENDER_SPRITE_CARS, RENDER_DOT_SIZE
+)
 from track import Track
 from car import Car
+from sprite_cache import CarSpriteCache
+from heatmap import DensityHeatmap
 
 
 class Visualizer:
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
         
+        # 배경 + 트랙 정적 레이어 (다른 트랙 객체를 그릴 때만 다시 그림)
+        self._track_layer: Optional[pygame.Surface] = None
+        self._track_layer_track: Optional[Track] = None
+        
+        # 상태 x 각도별 회전된 차량 스프라이트
+        self.sprites = CarSpriteCache()
+        
+        # 차량 밀도 히트맵 (항상 누적, show_heatmap 일 때만 표시)
+        self.heatmap = DensityHeatmap()
+        self.show_heatmap = False
+    
+    def invalidate_track_cache(self):
+        """정적 트랙 레이어 강제 무효화"""
+        self._track_layer = None
+        self._track_layer_track = None
+    
+    def _get_track_layer(self, track: Track) -> pygame.Surface:
+        """
+        배경 + 트랙을 미리 그린 Surface 반환 (같은 트랙 객체면 재사용)
+        트랙 형상/색은 생성 후 바뀌지 않음 - 바꾸는 경우 invalidate_track_cache 호출
+        """
+        if self._track_layer is not None and self._track_layer_track is track:
+            return self._track_layer
+        
+        # 화면 대신 레이어에 한 번만 그리기
+        screen = self.screen
+        layer = pygame.Surface(screen.get_size())
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        
+        self.screen = layer
+        try:
+            self.draw_background()
+            self.draw_track(track)
+        finally:
+            self.screen = screen
+        
+        self._track_layer = layer
+        self._track_layer_track = track
+        return layer
+
     def draw_background(self):
         """배경 그리기 - iOS 다크 테마"""
         # 전체 배경
@@ -30,26 +78,73 @@ class Visualizer:
         track.draw(self.screen)
     
     def draw_cars(self, cars: List[Car], best_car_id: Optional[int] = None):
+        """모든 차량 그리기 (Car 목록 - 한 번 훑어 배열로 모은 뒤 draw_population)"""
+        count = len(cars)
+        xs = np.fromiter((car.x for car in cars), float, count)
+        ys = np.fromiter((car.y for car in cars), float, count)
+        angles = np.fromiter((car.angle for car in cars), float, count)
+        alive = np.fromiter((car.alive for car in cars), bool, count)
+        fitness = np.fromiter((car.fitness for car in cars), float, count)
+        
+        best = None
+        for i, car in enumerate(cars):
+            if car.alive and car.car_id == best_car_id:
+                best = i
+                break
+        self.draw_population(xs, ys, angles, alive, fitness, best,
+                             cars[best] if best is not None else None)
+    
+    def draw_population(self, xs: np.ndarray, ys: np.ndarray, angles: np.ndarray,
+                        alive: np.ndarray, fitness: np.ndarray,
+                        best: Optional[int] = None, best_car: Optional[Car] = None):
         """
-        모든 차량 그리기
-        - 죽은 차량 먼저 (뒤에)
-        - 살아있는 차량 나중에 (앞에)
-        - 최고 차량은 센서 표시
+        차량 집단 그리기 (차량 수와 무관하게 스프라이트 수 제한)
+        - RENDER_SPRITE_CARS 대 이하면 모두 스프라이트
+        - 그보다 많으면 살아있는 차량 중 적합도 상위만 스프라이트, 나머지는 점
+        - 탈락 → 생존 → 최고 차량 (센서 표시) 순서로 위에 그림
         """
-        # 죽은 차량 먼저
-        for car in cars:
-            if not car.alive:
-                car.draw(self.screen, is_best=False, show_sensors=False)
+        count = len(xs)
+        if count <= RENDER_SPRITE_CARS:
+            sprite = np.ones(count, dtype=bool)
+        else:
+            sprite = np.zeros(count, dtype=bool)
+            candidates = np.flatnonzero(alive)
+            if len(candidates) > RENDER_SPRITE_CARS:
+                top = np.argpartition(-fitness[candidates], RENDER_SPRITE_CARS - 1)[:RENDER_SPRITE_CARS]
+                candidates = candidates[top]
+            sprite[candidates] = True
+            if best is not None:
+                sprite[best] = True
+            
+            # 점 (탈락 먼저)
+            dots = ~sprite
+            self._draw_dots(xs[dots & ~alive], ys[dots & ~alive], COLORS['car_dead'])
+            self._draw_dots(xs[dots & alive], ys[dots & alive], COLORS['car_alive'])
         
-        # 살아있는 차량 (최고 차량 제외)
-        for car in cars:
-            if car.alive and car.car_id != best_car_id:
-                car.draw(self.screen, is_best=False, show_sensors=False)
-        
-        # 최고 차량 (센서 표시)
-        for car in cars:
-            if car.alive and car.car_id == best_car_id:
-                car.draw(self.screen, is_best=True, show_sensors=True)
+        sprites = self.sprites
+        for i in np.flatnonzero(sprite & ~alive):
+            sprites.blit(self.screen, 'dead', xs[i], ys[i], angles[i])
+        for i in np.flatnonzero(sprite & alive):
+            if i != best:
+                sprites.blit(self.screen, 'alive', xs[i], ys[i], angles[i])
+        if best is not None:
+            sprites.blit(self.screen, 'best', xs[best], ys[best], angles[best])
+            if best_car is not None:
+                best_car._draw_sensors(self.screen)
+    
+    def _draw_dots(self, xs: np.ndarray, ys: np.ndarray, color):
+        """차량 위치에 RENDER_DOT_SIZE 크기 사각 점 찍기 (화면 픽셀 배열에 한 번에 기록)"""
+        if len(xs) == 0:
+            return
+        half = RENDER_DOT_SIZE // 2
+        px = np.clip(xs.astype(int) - half, 0, PANEL_X - RENDER_DOT_SIZE)
+        py = np.clip(ys.astype(int) - half, 0, SCREEN_HEIGHT - RENDER_DOT_SIZE)
+        mapped = self.screen.map_rgb(color)
+        pixels = pygame.surfarray.pixels2d(self.screen)
+        for dx in range(RENDER_DOT_SIZE):
+            for dy in range(RENDER_DOT_SIZE):
+                pixels[px + dx, py + dy] = mapped
+        del pixels  # Surface 잠금 해제
     
     def draw_generation_info(self, generation: int, alive_count: int, total_count: int, 
                              time_left: float, best_fitness: float):
@@ -74,15 +169,29 @@ class Visualizer:
     
     def render(self, track: Track, cars: List[Car], 
                generation: int, time_left: float,
-               best_car_id: Optional[int] = None):
-        """전체 렌더링"""
-        # 배경
-        self.draw_background()
-        
-        # 트랙
-        self.draw_track(track)
+               best_car_id: Optional[int] = None, fleet=None):
+        """
+        전체 렌더링
+        fleet (CarFleet) 을 주면 차량 속성을 배열에서 바로 읽음 (차량 수천 대용)
+        """
+        # 배경 + 트랙 (캐시된 정적 레이어)
+        self.screen.blit(self._get_track_layer(track), (0, 0))
         
-        # 차량들
-        self.draw_cars(cars, best_car_id)
+        # 차량들 (+ 밀도 히트맵)
+        if fleet is not None:
+            alive = fleet.alive
+            self.heatmap.add(fleet.x[alive], fleet.y[alive])
+            if self.show_heatmap:
+                self.heatmap.draw(self.screen)
+            best = best_car_id if best_car_id is not None and alive[best_car_id] else None
+            self.draw_population(fleet.x, fleet.y, fleet.angle, alive, fleet.fitness, best,
+                                 cars[best] if best is not None else None)
+        else:
+            alive_cars = [car for car in cars if car.alive]
+            self.heatmap.add(np.array([car.x for car in alive_cars]),
+                             np.array([car.y for car in alive_cars]))
+            if self.show_heatmap:
+                self.heatmap.draw(self.screen)
+            self.draw_cars(cars, best_car_id)
         
         # UI 패널에서 정보 표시하므로 좌상단 정보는 생략